@@ -0,0 +1,251 @@
+"""
+배경음악(BGM) / 효과음(SFX) 관리
+- 맵 번호 -> 곡: 레벨 메타데이터의 "bgm" (assets/bgm 안의 파일 이름), 없으면 기본 곡
+- 같은 곡이 이미 재생 중이면 다시 불러오지 않고 그대로 이어서 재생
+- 파일 읽기(팩/낱개 파일) + 디코딩은 작업 스레드에서 (레벨 로드 시간에 오디오 입출력/디코딩이 들어가지 않음)
+- 준비가 끝나면 BGM 전용 채널 두 개를 번갈아 쓰며 이전 곡과 크로스페이드
+- 디코딩한 곡은 최근 BGM_CACHE개만 메모리에 보관 (다음 레벨 곡은 프리페치가 미리 준비)
+- 효과음은 믹서 초기화 직후 모두 Sound로 만들어 두고, 고정된 채널 풀에서 재생
+  (재생할 때 파일 읽기/디코딩/할당 없음, 빈 채널이 없으면 가장 오래전에 시작한 소리를 끊고 재생)
+- 효과음 파일(assets/sfx/이벤트.wav)이 없으면 짧은 음을 직접 합성해서 사용
+"""
+
+import io
+import os
+import math
+import array
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from pack import get_store
+
+# 상수
+BGM_DIR = os.path.join(os.path.dirname(__file__), "assets", "bgm")
+BGM_FILE = '경쾌한 BGM.mp3'
+BGM_VOLUME = 0.5
+CROSSFADE_MS = 1200
+BGM_CACHE = 2          # 디코딩한 곡 보관 개수 (현재 곡 + 다음 곡)
+BGM_CHANNELS = (0, 1)  # BGM 전용으로 예약하는 믹서 채널 (효과음이 가져가지 않음)
+
+SFX_DIR = os.path.join(os.path.dirname(__file__), "assets", "sfx")
+SFX_CHANNELS = 6       # 효과음 채널 풀 크기 (BGM 채널 다음 번호부터)
+SFX_VOLUME = 0.6
+# 이벤트 -> 합성음 (주파수들을 차례로, 전체 길이 초) - 효과음 파일이 없을 때 사용
+SFX_TONES = {
+    "place": ((660,), 0.06),                   # 도구 배치
+    "rotate": ((990,), 0.03),                  # 도구 회전
+    "hit": ((784, 1047), 0.14),                # 빛이 목표에 닿음
+    "complete": ((523, 659, 784, 1047), 0.6),  # 퍼즐 완료
+}
+
+
+def reserve_channels():
+    """BGM + 효과음 채널을 예약 (find_channel/Sound.play가 가져가지 않음)"""
+    total = len(BGM_CHANNELS) + SFX_CHANNELS
+    if pygame.mixer.get_num_channels() < total:
+        pygame.mixer.set_num_channels(total)
+    pygame.mixer.set_reserved(total)
+
+
+def synth_tone(freqs, duration):
+    """
+    짧은 합성음 (믹서 형식에 맞춘 16비트 PCM)
+
+    Parameters:
+        freqs: 차례로 낼 주파수들 (Hz)
+        duration: 전체 길이 (초)
+    """
+    rate, _size, channels = pygame.mixer.get_init()
+    samples = array.array("h")
+    note_len = max(1, int(rate * duration / len(freqs)))
+    attack = max(1, rate // 200)  # 5ms: 딸깍 소리 방지
+    for freq in freqs:
+        step = 2 * math.pi * freq / rate
+        for i in range(note_len):
+            envelope = min(1.0, i / attack) * (1.0 - i / note_len)
+            value = int(32767 * 0.5 * envelope * math.sin(step * i))
+            samples.extend([value] * channels)
+    return pygame.mixer.Sound(buffer=samples.tobytes())
+
+
+def track_path(map_index, meta=None):
+    """맵 번호에 해당하는 BGM 경로 (레벨 메타데이터에 "bgm"이 있으면 그 곡, 없으면 기본 곡)"""
+    name = (meta or {}).get("bgm") or BGM_FILE
+    return os.path.join(BGM_DIR, name)
+
+
+class BgmPlayer:
+    """
+    BGM 재생기 (메인 스레드에서 play/stop 호출, 준비가 끝나면 작업 스레드 콜백에서 재생 시작)
+    """
+
+    def __init__(self, volume=BGM_VOLUME, fade_ms=CROSSFADE_MS, cache_size=BGM_CACHE):
+        self.volume = volume
+        self.fade_ms = fade_ms
+        self.cache_size = cache_size
+        self.sounds = OrderedDict()  # 경로 -> 디코딩한 Sound (최근 사용 순)
+        self.jobs = {}               # 경로 -> 준비 중인 Future
+        self.current = None          # 재생할 곡 경로 (준비 중이어도 설정됨)
+        self.playing = None          # 실제로 채널에서 재생 중인 곡 경로
+        self.channel = None          # 현재 곡 채널
+        self.slot = 1                # 현재 곡 채널의 BGM_CHANNELS 위치 (다음 곡은 다른 쪽)
+        self.executor = None
+        self.lock = threading.RLock()
+
+    # --- 메인 스레드 ---
+    def prepare(self, path):
+        """곡을 작업 스레드에서 미리 읽고 디코딩 (이미 준비했거나 준비 중이면 아무것도 안 함)"""
+        with self.lock:
+            if path in self.sounds or path in self.jobs or not pygame.mixer.get_init():
+                return
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bgm")
+            job = self.executor.submit(self._decode, path)
+            self.jobs[path] = job
+        job.add_done_callback(lambda done: self._on_ready(path, done))
+
+    def play(self, path):
+        """
+        곡 재생 요청 (바로 반환, 준비가 끝나면 이전 곡과 크로스페이드)
+
+        Returns:
+            새로 재생을 요청했으면 True (같은 곡이 이미 재생 중/준비 중이면 False)
+        """
+        with self.lock:
+            if path == self.current:
+                return False
+            self.current = path
+            if path in self.sounds:
+                self._start(path)
+            else:
+                self.prepare(path)
+            return True
+
+    def stop(self, fade=True):
+        """재생 중인 곡 멈춤 (fade=True: 서서히)"""
+        with self.lock:
+            self.current = None
+            self.playing = None
+            if self.channel is not None:
+                if fade:
+                    self.channel.fadeout(self.fade_ms)
+                else:
+                    self.channel.stop()
+                self.channel = None
+
+    def shutdown(self):
+        """믹서를 닫기 전에 호출 (디코딩 중인 작업이 끝날 때까지 기다림)"""
+        try:
+            self.stop(fade=False)
+        except pygame.error:
+            pass
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+        self.sounds.clear()
+        self.jobs.clear()
+
+    # --- 작업 스레드 ---
+    def _decode(self, path):
+        data = get_store().read_bytes(path)
+        sound = pygame.mixer.Sound(file=io.BytesIO(data))
+        sound.set_volume(self.volume)
+        return sound
+
+    def _on_ready(self, path, job):
+        with self.lock:
+            self.jobs.pop(path, None)
+            if job.cancelled():
+                return
+            error = job.exception()
+            if error is not None:
+                print(f"❌ BGM 준비 실패: {path} ({error})")
+                if self.current == path:
+                    self.current = None
+                return
+            self.sounds[path] = job.result()
+            if self.current == path and self.playing != path:
+                self._start(path)
+            self._evict()
+
+    # --- 공통 (lock 안에서 호출) ---
+    def _start(self, path):
+        """다른 BGM 채널에서 새 곡을 페이드 인, 이전 곡은 페이드 아웃"""
+        sound = self.sounds[path]
+        self.sounds.move_to_end(path)
+        reserve_channels()
+        self.slot = 1 - self.slot
+        new = pygame.mixer.Channel(BGM_CHANNELS[self.slot])
+        new.play(sound, loops=-1, fade_ms=self.fade_ms)
+        if self.channel is not None:
+            self.channel.fadeout(self.fade_ms)
+        self.channel = new
+        self.playing = path
+        print(f"♬ BGM 재생: {os.path.basename(path)}")
+
+    def _evict(self):
+        """보관 개수를 넘으면 오래된 곡부터 버림 (재생 중인 곡은 유지)"""
+        for path in list(self.sounds):
+            if len(self.sounds) <= self.cache_size:
+                break
+            if path not in (self.current, self.playing):
+                del self.sounds[path]
+
+
+class SfxPool:
+    """효과음 재생 (load()에서 모두 준비, play()는 채널에 넣기만 함)"""
+
+    def __init__(self, channels=SFX_CHANNELS, volume=SFX_VOLUME):
+        self.channel_count = channels
+        self.volume = volume
+        self.sounds = {}    # 이벤트 이름 -> Sound
+        self.channels = []  # 효과음 전용 채널
+        self.started = []   # 채널별 마지막 재생 순번 (가장 작은 채널을 뺏음)
+        self.counter = 0
+
+    def load(self):
+        """믹서 초기화 후 한 번 호출: 채널 확보 + 효과음 준비 (파일이 있으면 파일, 없으면 합성)"""
+        if self.sounds or not pygame.mixer.get_init():
+            return
+        reserve_channels()
+        first = len(BGM_CHANNELS)
+        self.channels = [pygame.mixer.Channel(i) for i in range(first, first + self.channel_count)]
+        self.started = [0] * len(self.channels)
+        store = get_store()
+        for name, (freqs, duration) in SFX_TONES.items():
+            path = os.path.join(SFX_DIR, f"{name}.wav")
+            try:
+                if store.exists(path):
+                    sound = pygame.mixer.Sound(file=io.BytesIO(store.read_bytes(path)))
+                else:
+                    sound = synth_tone(freqs, duration)
+            except Exception as e:
+                print(f"❌ 효과음 준비 실패: {name} ({e})")
+                continue
+            sound.set_volume(self.volume)
+            self.sounds[name] = sound
+
+    def play(self, name):
+        """효과음 재생 (빈 채널, 없으면 가장 오래전에 시작한 채널을 끊고 재생)"""
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        index = -1
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                index = i
+                break
+        if index < 0:
+            index = self.started.index(min(self.started))
+        self.counter += 1
+        self.started[index] = self.counter
+        self.channels[index].play(sound)
+
+    def unload(self):
+        """믹서를 닫기 전에 호출"""
+        self.sounds.clear()
+        self.channels = []
+        self.started = []
@@ -0,0 +1,317 @@
+"""
+맵 에디터 자동 저장
+- 편집할 때마다 바뀐 부분만 저널 파일(__autosave__/level_N.journal)에 한 줄씩 추가 (fsync)
+- 편집이 AUTOSAVE_DELAY초 동안 멈추면 저널을 레벨 파일에 합쳐서 다시 씀 (임시 파일 -> 교체)
+- 파일 쓰기는 모두 백그라운드 스레드 하나가 순서대로 처리 (프레임을 막지 않음)
+- 비정상 종료 후 다시 불러올 때 남은 저널을 레벨 파일에 합쳐서 복구 (마지막 편집까지)
+- 저널 첫 줄에 기준 레벨 파일의 내용 해시를 기록: 이미 합쳐진 저널은 다시 적용하지 않음
+- 맵 번호가 없는 작업은 __autosave__/untitled.json 에 저장
+
+저널 한 줄 형식 (JSON):
+    {"base": 내용 해시}                                    첫 줄
+    ["splice", 리스트 이름, 위치, 지운 개수, [레코드, ...]]  오브젝트 배치/삭제/클리어
+        (넣은 오브젝트에 움직임 설정이 있으면 뒤에 [[넣은 항목 안의 위치, 종류, 파라미터], ...] 추가)
+    ["attr", 리스트 이름, 위치, 필드 이름, 새 값]             회전
+    ["batch", [항목, ...]]                                 여러 항목을 한 번에 (한 줄이라 반쯤 쓰이지 않음)
+"""
+
+import os
+import json
+import time
+import queue
+import threading
+
+from level_cache import content_hash
+from level_format import decode_level, encode_level, dumps_level, splice_behaviours
+
+# 상수
+AUTOSAVE_DIR = "__autosave__"
+AUTOSAVE_DELAY = 2.0  # 마지막 편집 후 이 시간(초)이 지나면 레벨 파일에 합침
+UNTITLED = "untitled"
+
+# 리스트 이름 -> 레코드 필드 (level_format.decode_level의 씬 튜플과 같은 순서)
+RECORD_FIELDS = {
+    "emitters": ("x", "y", "color", "angle"),
+    "targets": ("x", "y", "color"),
+    "mirrors": ("x", "y", "angle"),
+    "lenses": ("x", "y", "angle"),
+    "portals_a": ("x", "y"),
+    "portals_b": ("x", "y"),
+    "blackholes": ("x", "y"),
+}
+
+
+def to_record(name, obj):
+    """오브젝트 -> 레코드 리스트"""
+    return [getattr(obj, field) for field in RECORD_FIELDS[name]]
+
+
+def journal_entry(op, lists, positions=None):
+    """
+    history 기록 -> 저널 항목
+
+    Parameters:
+        op: history.py 기록 튜플 (이미 적용된 방향)
+        lists: {리스트 이름: 오브젝트 리스트}
+        positions: {id(오브젝트): (리스트 이름, 위치)} (없으면 리스트를 직접 찾음)
+
+    Returns:
+        저널 항목 (오브젝트 리스트 편집이 아니면 None)
+    """
+    kind = op[0]
+    if kind == "splice":
+        _, lst, index, removed, added = op
+        for name, target in lists.items():
+            if target is lst:
+                entry = ["splice", name, index, len(removed), [to_record(name, obj) for obj in added]]
+                carried = [[offset, *obj.behaviour] for offset, obj in enumerate(added)
+                           if getattr(obj, "behaviour", None)]
+                if carried:
+                    entry.append(carried)
+                return entry
+        return None
+    if kind == "attr":
+        _, obj, attr, _old, new = op
+        if positions is not None:
+            found = positions.get(id(obj))
+            return None if found is None else ["attr", found[0], found[1], attr, new]
+        for name, lst in lists.items():
+            for index, item in enumerate(lst):
+                if item is obj:
+                    return ["attr", name, index, attr, new]
+        return None
+    if kind == "batch":
+        if positions is None and sum(sub[0] == "attr" for sub in op[1]) > 1:
+            # 여러 오브젝트 이동: 오브젝트마다 리스트를 훑지 않도록 위치표를 한 번만 만듦
+            positions = {id(obj): (name, index) for name, lst in lists.items() for index, obj in enumerate(lst)}
+        entries = [journal_entry(sub, lists, positions) for sub in op[1]]
+        if any(entry is None for entry in entries):
+            return None
+        return ["batch", entries]
+    return None
+
+
+def apply_entry(scene, entry, behaviours=None):
+    """
+    저널 항목 하나를 레코드 씬 {이름: [레코드]}에 적용
+
+    Parameters:
+        behaviours: 움직임 목록 [(리스트 이름, 위치, 종류, 파라미터)] (주면 splice에 맞춰 그 자리에서 조정)
+    """
+    kind = entry[0]
+    if kind == "splice":
+        name, index, removed, added = entry[1:5]
+        scene[name][index:index + removed] = added
+        if behaviours is not None:
+            carried = entry[5] if len(entry) > 5 else ()
+            behaviours[:] = splice_behaviours(behaviours, name, index, removed, len(added), carried)
+    elif kind == "attr":
+        _, name, index, attr, value = entry
+        scene[name][index][RECORD_FIELDS[name].index(attr)] = value
+    elif kind == "batch":
+        for sub in entry[1]:
+            apply_entry(scene, sub, behaviours)
+
+
+def _atomic_write(path, text):
+    """임시 파일에 쓰고 fsync 후 교체 (쓰는 도중 종료돼도 원본이 깨지지 않음)"""
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_file(path):
+    """낱개 파일 내용 (없으면 None) - 팩/캐시를 거치지 않고 디스크의 파일 그대로"""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _file_hash(path):
+    raw = _read_file(path)
+    return "" if raw is None else content_hash(raw)
+
+
+class AutoSaver:
+    """
+    저널 + 디바운스 자동 저장
+    - 메인 스레드: record/tick/switch/write_scene/flush (바로 반환)
+    - 쓰기 스레드: 저널 추가, 레벨 파일 합치기/쓰기
+    """
+
+    def __init__(self, grid, delay=AUTOSAVE_DELAY, folder=AUTOSAVE_DIR):
+        self.grid = grid
+        self.delay = delay
+        self.folder = folder
+        self.target = None      # 현재 맵 번호 (None: 이름 없는 작업)
+        self.dirty = False      # 레벨 파일에 아직 합치지 않은 편집이 있음
+        self.last_edit = 0.0
+        self.queue = queue.Queue()
+        self.thread = None
+
+    # --- 경로 ---
+    def level_path(self, target):
+        if target is None:
+            return os.path.join(self.folder, f"{UNTITLED}.json")
+        return f"level_{target}.json"
+
+    def journal_path(self, target):
+        name = UNTITLED if target is None else f"level_{target}"
+        return os.path.join(self.folder, f"{name}.journal")
+
+    # --- 메인 스레드 ---
+    def record(self, entry):
+        """편집 하나를 저널에 추가 요청"""
+        self._put(self._append, self.target, entry)
+        self.dirty = True
+        self.last_edit = time.monotonic()
+
+    def tick(self):
+        """프레임마다 호출: 편집이 멈춘 지 delay초가 지났으면 레벨 파일에 합치기 요청"""
+        if self.dirty and time.monotonic() - self.last_edit >= self.delay:
+            self.flush()
+
+    def flush(self):
+        """기다리지 않고 바로 합치기 요청"""
+        if self.dirty:
+            self._put(self._compact, self.target)
+            self.dirty = False
+
+    def switch(self, target):
+        """저장 대상 맵 변경 (이전 맵의 남은 편집은 합치기 요청)"""
+        if target != self.target:
+            self.flush()
+            self.target = target
+
+    def write_scene(self, target, scene, extras, announce=False):
+        """
+        씬 전체를 레벨 파일로 쓰기 요청 (맵 저장, 같은 맵 다시 불러오기 등)
+
+        Parameters:
+            scene: {리스트 이름: [레코드]}
+            extras: {"limits", "meta", "grid_cells", "behaviours"}
+        """
+        self.switch(target)
+        self.dirty = False  # 씬 전체를 쓰므로 저널은 필요 없음
+        self._put(self._write, target, scene, extras, announce)
+
+    def recover(self, target):
+        """
+        남은 저널을 레벨 파일에 합침 (비정상 종료 후 불러오기 전에 호출, 쓰기 스레드가 끝날 때까지 기다림)
+
+        Returns:
+            복구한 편집 수
+        """
+        if target == self.target:
+            self.flush()
+        self.sync()
+        return self._compact(target)
+
+    def sync(self):
+        """요청한 쓰기가 모두 끝날 때까지 기다림"""
+        if self.thread is not None:
+            self.queue.join()
+
+    def close(self):
+        self.flush()
+        self.sync()
+
+    # --- 쓰기 스레드 ---
+    def _put(self, fn, *args):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+            self.thread.start()
+        self.queue.put((fn, args))
+
+    def _run(self):
+        while True:
+            fn, args = self.queue.get()
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"[자동 저장] 실패: {e}")
+            finally:
+                self.queue.task_done()
+
+    def _append(self, target, entry):
+        path = self.journal_path(target)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        lines = []
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            lines.append(json.dumps({"base": _file_hash(self.level_path(target))}))
+        lines.append(json.dumps(entry, ensure_ascii=False))
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read_journal(self, path):
+        """(기준 해시, [항목]) - 마지막 줄이 반쯤 쓰였으면 그 줄은 버림"""
+        base, entries = None, []
+        with open(path, encoding="utf-8") as f:
+            for i, line in enumerate(f):
+                try:
+                    value = json.loads(line)
+                except ValueError:
+                    break
+                if i == 0:
+                    base = value.get("base") if isinstance(value, dict) else None
+                else:
+                    entries.append(value)
+        return base, entries
+
+    def _load_records(self, raw):
+        """
+        레벨 파일 내용 -> (레코드 씬, extras) (None이면 빈 씬)
+        저널의 기준 해시를 확인한 바로 그 바이트에서 읽음 (팩/캐시의 다른 사본에 저널을 적용하지 않도록)
+        """
+        if raw is None:
+            return {name: [] for name in RECORD_FIELDS}, {"limits": None, "meta": {}, "grid_cells": None,
+                                                          "behaviours": []}
+        scene = decode_level(json.loads(raw.decode("utf-8")), self.grid, snap=False)
+        records = {name: [list(item) for item in scene[name]] for name in RECORD_FIELDS}
+        return records, {"limits": scene["limits"], "meta": scene["meta"], "grid_cells": scene["grid_cells"],
+                         "behaviours": scene["behaviours"]}
+
+    def _compact(self, target):
+        """저널을 레벨 파일에 합치고 저널 삭제 (합친 편집 수 반환)"""
+        path = self.journal_path(target)
+        if not os.path.exists(path):
+            return 0
+        base, entries = self._read_journal(path)
+        raw = _read_file(self.level_path(target))
+        if base != ("" if raw is None else content_hash(raw)):
+            # 기준 파일이 저널과 다름 (합친 뒤 저널을 지우기 전에 종료된 경우 등) -> 합치지 않음
+            os.remove(path)
+            return 0
+        if entries:
+            records, extras = self._load_records(raw)
+            behaviours = list(extras["behaviours"])
+            for entry in entries:
+                apply_entry(records, entry, behaviours)
+            extras["behaviours"] = behaviours
+            self._write_level(target, records, extras)
+        os.remove(path)
+        return len(entries)
+
+    def _write_level(self, target, records, extras):
+        data = encode_level(records, self.grid, target or 0,
+                            extras["limits"], extras["meta"], extras["grid_cells"], extras.get("behaviours") or ())
+        _atomic_write(self.level_path(target), dumps_level(data))
+
+    def _write(self, target, records, extras, announce):
+        self._write_level(target, records, extras)
+        try:
+            os.remove(self.journal_path(target))
+        except FileNotFoundError:
+            pass
+        if announce:
+            print(f"맵 저장 완료: {self.level_path(target)}")
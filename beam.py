@@ -0,0 +1,119 @@
+"""
+맵 에디터 빛 경로 계산 + 백그라운드 미리보기
+- 계산은 레벨 플레이와 같은 추적기를 끝까지 실행 (beam_front.render_beam, 에디터 미리보기와 실제 플레이가 항상 같은 경로)
+- BeamPreview: 편집할 때마다 별도 프로세스에서 계산하고, 끝날 때까지는 마지막 결과를 계속 그림
+  (계산이 파이썬 루프라서 스레드로 돌리면 GIL 때문에 화면이 같이 느려지므로 프로세스 사용)
+- 편집이 계산보다 빠르면 이전 작업은 취소 (대기 중이면 바로, 실행 중이면 다음 확인 시점에)
+"""
+
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+
+import pygame
+
+from beam_front import render_beam
+
+
+# --- 미리보기 워커 프로세스 ---
+_latest_version = None  # 메인 프로세스가 마지막으로 요청한 장면 버전 (공유 메모리)
+
+
+def _init_worker(latest_version):
+    global _latest_version
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    _latest_version = latest_version
+    # 화면을 그리는 메인 프로세스가 CPU를 먼저 쓰도록 우선순위를 낮춤 (지원하는 OS만)
+    try:
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+
+
+def _render_job(scene, version):
+    """워커 작업: 빛 경로 계산 후 투명 레이어를 BGRA 바이트로 반환 (더 새 요청이 오면 None)
+    BGRA는 SRCALPHA Surface와 같은 배치라서 메인에서 변환 없이 빠르게 blit됨
+    """
+    result = render_beam(scene, cancelled=lambda: _latest_version.value != version)
+    if result is None:
+        return None
+    overlay, hits = result
+    return version, scene.size, pygame.image.tobytes(overlay, "BGRA"), hits
+
+
+class BeamPreview:
+    """빛 경로 미리보기 (별도 프로세스에서 계산, 메인 스레드는 결과 blit만)"""
+
+    def __init__(self):
+        self.executor = None
+        self.latest = None
+        self.job = None
+        self.job_version = None  # 요청한 장면 버전
+        self.overlay = None      # 마지막으로 끝난 결과 (투명 Surface)
+        self.hits = set()        # 마지막 결과에서 빛을 받은 목표 인덱스
+
+    def _start(self):
+        # spawn: 부모 프로세스의 pygame/디스플레이 상태를 물려받지 않도록 새 인터프리터로 시작
+        ctx = multiprocessing.get_context("spawn")
+        self.latest = ctx.Value("q", -1, lock=False)
+        self.executor = ProcessPoolExecutor(max_workers=1, mp_context=ctx,
+                                            initializer=_init_worker, initargs=(self.latest,))
+
+    def update(self, version, snapshot):
+        """
+        장면 버전이 바뀌었으면 새 계산 요청 (이전 작업 취소)
+
+        Parameters:
+            version: 편집할 때마다 바뀌는 값 (history.version)
+            snapshot: 장면을 만드는 함수 (버전이 바뀌었을 때만 호출)
+        """
+        if version == self.job_version:
+            return
+        if self.executor is None:
+            self._start()
+        if self.job is not None:
+            self.job.cancel()
+        self.latest.value = version
+        self.job = self.executor.submit(_render_job, snapshot(), version)
+        self.job_version = version
+
+    def poll(self, wait=False):
+        """
+        끝난 계산 결과로 교체 (wait=True: 끝날 때까지 기다림, 헤드리스 스냅샷용)
+
+        Returns:
+            새 결과로 바뀌었으면 True
+        """
+        if self.job is None or not (wait or self.job.done()):
+            return False
+        job, self.job = self.job, None
+        try:
+            result = job.result()
+        except CancelledError:
+            return False
+        except Exception as e:
+            print(f"[빛 미리보기] 계산 실패: {e}")
+            return False
+        if result is None or result[0] != self.job_version:
+            return False
+        _, size, data, self.hits = result
+        surf = pygame.image.frombuffer(data, size, "BGRA")
+        try:
+            surf = surf.convert_alpha()
+        except pygame.error:
+            pass  # 디스플레이가 없으면 변환 없이 사용
+        self.overlay = surf
+        return True
+
+    def draw(self, surface):
+        if self.overlay is not None:
+            surface.blit(self.overlay, (0, 0))
+
+    def shutdown(self):
+        """실행 중인 계산 취소 후 워커 정리 (다음 update에서 다시 만듦)"""
+        if self.executor is not None:
+            self.latest.value = -1
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = None
+        self.job = None
+        self.job_version = None
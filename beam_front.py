@@ -0,0 +1,367 @@
+"""
+진행형 빛 추적 (레벨 플레이)
+- 빛 전체를 한 프레임에 계산하지 않고, 광선마다 상태(위치/각도/지나온 렌즈/반사 횟수)를 저장해 두고
+  매 프레임 정해진 만큼만 이어서 진행 (광선당 BEAM_SPEED 스텝, 프레임 전체 BEAM_BUDGET_MS 이내)
+- 지나간 점은 잔상 레이어에 한 번만 그리고 매 프레임 blit만 하므로, 장면이 아무리 커도 프레임 시간에 상한이 있음
+- 진행 중인 광선 끝(빛의 앞부분)을 밝게 그려서 발사장치에서 빛이 뻗어 나가는 애니메이션으로 보임
+- advance()에 제한을 주지 않으면 한 번에 끝까지 계산 (render_beam: 썸네일/헤드리스 스냅샷, 맵 에디터 미리보기 워커)
+- 움직이는 오브젝트(behaviours.py)가 바뀌면 invalidate: 광선마다 CHECKPOINT_STEPS 스텝 구간의 시작 상태와
+  지나간 범위를 기록해 두었다가, 바뀐 오브젝트 근처를 처음 지나는 구간부터만 다시 계산
+  (그 앞까지는 경로가 같음이 보장되므로 그대로 둠)
+"""
+
+import math
+import time
+
+import pygame
+
+from objects import COLORS, RADIUS
+from utils import near, angle_wrap, advance
+from scene_store import EMITTER, TARGET, MIRROR, LENS, PORTAL_A, BLACKHOLE
+
+# 상수
+MAX_STEPS = 20000  # 광선 하나의 최대 이동 스텝
+MAX_BOUNCES = 64
+NUDGE = 2.0
+BEAM_SPEED = 32        # 프레임마다 광선 하나가 나아가는 스텝(픽셀) 수
+BEAM_BUDGET_MS = 4.0   # 프레임마다 빛 계산에 쓰는 최대 시간
+TIME_CHECK = 4         # 이 스텝마다 시간 예산 확인
+CANCEL_CHECK = 256     # 이 스텝마다 취소 여부 확인 (에디터 미리보기 워커)
+HIT_COLOR = (255, 255, 0)
+FRONT_RADIUS = 5       # 빛 앞부분 표시 크기
+CHECKPOINT_STEPS = 64  # 다시 계산을 시작할 수 있는 지점 간격 (스텝)
+AFFECT_RANGE = 2 * RADIUS + 4  # 오브젝트가 광선에 영향을 주는 거리 (렌즈를 벗어나는 판정 거리 + 여유)
+
+
+class Ray:
+    """광선 하나의 상태 (프레임 사이에 보관) + 다시 계산용 기록"""
+
+    __slots__ = ("x", "y", "angle", "color", "inside_lenses", "bounces", "steps", "done", "hit",
+                 "points", "checkpoints")
+
+    def __init__(self, x, y, angle, color):
+        self.x, self.y, self.angle, self.color = x, y, angle, color
+        self.inside_lenses = set()  # 지나가는 중인 렌즈 순번
+        self.bounces = 0
+        self.steps = 0
+        self.done = False
+        self.hit = None    # 광선이 닿아서 끝난 목표 인덱스
+        self.points = []   # 그린 점 [(x, y)]
+        # 구간 시작 상태 [스텝, x, y, 각도, 지나가는 렌즈, 반사 횟수, 점 개수, 범위(구간이 끝나면 채움)]
+        self.checkpoints = []
+        self.checkpoint(0, x, y, angle, self.inside_lenses, 0)
+
+    def checkpoint(self, steps, x, y, angle, inside_lenses, bounces):
+        """새 구간 시작 (이전 구간의 범위 확정)"""
+        if self.checkpoints:
+            last = self.checkpoints[-1]
+            last[7] = self._bounds(last, len(self.points))
+        self.checkpoints.append([steps, x, y, angle, tuple(inside_lenses), bounces, len(self.points), None])
+
+    def _bounds(self, cp, end, extra=None):
+        """구간이 지나간 범위 (min_x, min_y, max_x, max_y)"""
+        xs = [cp[1]] + [p[0] for p in self.points[cp[6]:end]]
+        ys = [cp[2]] + [p[1] for p in self.points[cp[6]:end]]
+        if extra is not None:
+            xs.append(extra[0])
+            ys.append(extra[1])
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def first_affected(self, positions, margin):
+        """positions 중 하나의 margin 안을 처음 지나는 구간 번호 (없으면 None)"""
+        last = len(self.checkpoints) - 1
+        for k, cp in enumerate(self.checkpoints):
+            if k == last:
+                bounds = self._bounds(cp, len(self.points), (self.x, self.y))
+            else:
+                bounds = cp[7]
+            min_x, min_y, max_x, max_y = bounds
+            for px, py in positions:
+                if min_x - margin <= px <= max_x + margin and min_y - margin <= py <= max_y + margin:
+                    return k
+        return None
+
+    def rewind(self, k):
+        """구간 k의 시작 상태로 되돌림 (그 뒤의 점/목표 적중은 버림)"""
+        cp = self.checkpoints[k]
+        self.steps, self.x, self.y, self.angle = cp[0], cp[1], cp[2], cp[3]
+        self.inside_lenses = set(cp[4])
+        self.bounces = cp[5]
+        del self.points[cp[6]:]
+        del self.checkpoints[k + 1:]
+        cp[7] = None
+        self.done = False
+        self.hit = None
+
+
+class BeamFront:
+    """진행형 빛 추적기 (start로 장면을 받고, advance로 조금씩 진행)"""
+
+    def __init__(self):
+        self.scene = None
+        self.rays = []       # 발사장치마다 광선 하나 (끝난 광선도 다시 계산할 수 있도록 보관)
+        self.hits = set()    # 지금까지 빛을 받은 목표 인덱스 (목표 중 몇 번째인지)
+        self.layer = None    # 지나간 점을 쌓아 두는 투명 레이어
+        self.version = None  # 추적 중인 장면 버전
+        self.settled = False # 처음부터 끝까지 한 번 다 그렸는지 (그 뒤의 다시 계산은 애니메이션 없이)
+        self.dirty = False   # 다시 계산하느라 버린 점이 있어서 레이어를 새로 그려야 하는지
+        self.mirrors = self.lenses = self.portals_a = self.blackholes = self.targets = ()
+
+    @property
+    def done(self):
+        return self.scene is not None and all(ray.done for ray in self.rays)
+
+    def reset(self):
+        """추적 중단 (다음 start까지 아무것도 그리지 않음)"""
+        self.scene = None
+        self.rays = []
+        self.hits = set()
+        self.version = None
+
+    def start(self, scene, version=None):
+        """
+        새 장면으로 처음부터 다시 추적
+
+        Parameters:
+            scene: SceneStore (발사장치/목표/거울/렌즈/포탈/블랙홀)
+            version: 장면이 바뀔 때마다 바뀌는 값 (같은 값이면 다시 시작하지 않도록 호출하는 쪽에서 비교)
+        """
+        self.scene = scene
+        self.version = version
+        self.hits = set()
+        self.settled = False
+        self.dirty = False
+        self._refresh()
+        xs, ys = scene.x, scene.y
+        self.rays = [Ray(xs[i], ys[i], scene.angle[i], scene.color_name(i)) for i in scene.indices(EMITTER)]
+        if self.layer is None or self.layer.get_size() != scene.size:
+            self.layer = pygame.Surface(scene.size, pygame.SRCALPHA)
+        else:
+            self.layer.fill((0, 0, 0, 0))
+
+    def _refresh(self):
+        """저장소에서 종류별 좌표 목록을 다시 읽음 (켜진 포탈 A만)"""
+        scene = self.scene
+        xs, ys, active = scene.x, scene.y, scene.active
+        self.mirrors = scene.points_angle(MIRROR)
+        self.lenses = scene.points(LENS)
+        self.portals_a = [(xs[i], ys[i], scene.pair[i]) for i in scene.indices(PORTAL_A) if active[i]]
+        self.blackholes = scene.points(BLACKHOLE)
+        self.targets = scene.points(TARGET)
+
+    def invalidate(self, positions):
+        """
+        저장소의 오브젝트가 바뀐 뒤 호출: positions(바뀌기 전/후 위치) 근처를 지나는 광선만 그 구간부터 다시 계산
+
+        Returns:
+            다시 계산하게 된 광선 수
+        """
+        if self.scene is None:
+            return 0
+        self._refresh()
+        rewound = 0
+        for ray in self.rays:
+            k = ray.first_affected(positions, AFFECT_RANGE)
+            if k is not None:
+                ray.rewind(k)
+                rewound += 1
+        if rewound:
+            self.dirty = True
+            self.hits = {ray.hit for ray in self.rays if ray.hit is not None}
+        return rewound
+
+    def _redraw(self):
+        """레이어를 기록된 점으로 새로 그림 (다시 계산하느라 뒷부분을 버렸을 때)"""
+        self.layer.fill((0, 0, 0, 0))
+        circle = pygame.draw.circle
+        for ray in self.rays:
+            color = COLORS[ray.color]
+            for point in ray.points:
+                circle(self.layer, color, point, 2)
+            if ray.hit is not None:
+                tx, ty = self.targets[ray.hit]
+                circle(self.layer, HIT_COLOR, (int(tx), int(ty)), RADIUS + 6, 3)
+        self.dirty = False
+
+    def advance(self, surface=None, steps=None, budget_ms=None, cancelled=None):
+        """
+        광선들을 조금씩 진행하면서 지나간 점을 그림
+
+        Parameters:
+            surface: 점을 그릴 Surface (None이면 잔상 레이어)
+            steps: 광선마다 이번에 진행할 최대 스텝 (None이면 끝까지)
+            budget_ms: 이번 호출에 쓸 최대 시간 (None이면 제한 없음)
+            cancelled: 호출해서 True면 그 자리에서 멈춤 (CANCEL_CHECK 스텝마다 확인, 멈췄는지는 done으로)
+
+        Returns:
+            새로 빛을 받은 목표 인덱스 set
+        """
+        if surface is None:
+            surface = self.layer
+            if self.dirty:
+                self._redraw()
+        deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+        new_hits = set()
+        for ray in self.rays:
+            if ray.done:
+                continue
+            ray.done = self._run(ray, surface, steps, deadline, cancelled)
+            if ray.hit is not None and ray.hit not in self.hits:
+                new_hits.add(ray.hit)
+                self.hits.add(ray.hit)
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if not ray.done and cancelled is not None and cancelled():
+                break
+        if self.done:
+            self.settled = True
+        return new_hits
+
+    def _run(self, ray, surface, limit, deadline, cancelled=None):
+        """광선 하나를 limit 스텝까지 진행 (광선이 끝났으면 True)"""
+        width, height = self.scene.size
+        xs, ys = self.scene.x, self.scene.y
+        mirrors, lenses, portals_a = self.mirrors, self.lenses, self.portals_a
+        blackholes, targets = self.blackholes, self.targets
+        x, y, angle, color_name = ray.x, ray.y, ray.angle, ray.color
+        inside_lenses, bounces, steps = ray.inside_lenses, ray.bounces, ray.steps
+        color = COLORS[color_name]
+        points = ray.points
+        end = MAX_STEPS if limit is None else min(MAX_STEPS, steps + limit)
+        finished = True
+
+        while True:
+            if steps >= end:
+                finished = steps >= MAX_STEPS
+                break
+            if steps % CHECKPOINT_STEPS == 0 and ray.checkpoints[-1][0] != steps:
+                ray.checkpoint(steps, x, y, angle, inside_lenses, bounces)
+            if deadline is not None and steps % TIME_CHECK == 0 and time.perf_counter() >= deadline:
+                finished = False
+                break
+            if cancelled is not None and steps % CANCEL_CHECK == 0 and steps and cancelled():
+                finished = False
+                break
+            steps += 1
+            x += math.cos(math.radians(angle))
+            y += math.sin(math.radians(angle))
+
+            if not (0 <= x < width and 0 <= y < height):
+                break
+
+            # 거울 반사
+            reflected = False
+            for mx, my, mangle in mirrors:
+                if near(x, y, mx, my):
+                    angle = angle_wrap(2 * mangle - angle)
+                    x, y = advance(x, y, angle, NUDGE)
+                    bounces += 1
+                    reflected = True
+                    break
+            if reflected:
+                if bounces > MAX_BOUNCES: break
+                point = (int(x), int(y))
+                points.append(point)
+                pygame.draw.circle(surface, color, point, 2)
+
+            if not (0 <= x < width and 0 <= y < height):
+                break
+
+            # 렌즈: 45도 꺾기
+            bent = False
+            for lid, (lx, ly) in enumerate(lenses):
+                dist = math.sqrt((x - lx)**2 + (y - ly)**2)
+                if dist < 3 and lid not in inside_lenses:
+                    angle = angle_wrap(angle + 45)
+                    inside_lenses.add(lid)
+                    x, y = advance(x, y, angle, NUDGE)
+                    bounces += 1
+                    bent = True
+                    break
+            if bent:
+                if bounces > MAX_BOUNCES: break
+                point = (int(x), int(y))
+                points.append(point)
+                pygame.draw.circle(surface, color, point, 2)
+
+            for lid in list(inside_lenses):
+                lx, ly = lenses[lid]
+                dist = math.sqrt((x - lx)**2 + (y - ly)**2)
+                if dist > RADIUS * 2:
+                    inside_lenses.remove(lid)
+
+            # 포탈 (짝인 B로 이동)
+            teleported = False
+            for pax, pay, pb in portals_a:
+                if near(x, y, pax, pay):
+                    if pb >= 0:
+                        x, y = xs[pb], ys[pb]
+                        x, y = advance(x, y, angle, NUDGE * 2)
+                        teleported = True
+                        break
+            if teleported:
+                point = (int(x), int(y))
+                points.append(point)
+                pygame.draw.circle(surface, color, point, 2)
+                continue
+
+            # 블랙홀
+            absorbed = False
+            for bx, by in blackholes:
+                if near(x, y, bx, by):
+                    absorbed = True
+                    break
+            if absorbed:
+                break
+
+            # 목표 체크 (흰색 빛만 흰색 목표에 닿음)
+            for tid, (tx, ty) in enumerate(targets):
+                if near(x, y, tx, ty):
+                    if color_name == 'white':
+                        ray.hit = tid
+                        pygame.draw.circle(surface, HIT_COLOR, (int(tx), int(ty)), RADIUS + 6, 3)
+                        break
+            else:
+                point = (int(x), int(y))
+                points.append(point)
+                pygame.draw.circle(surface, color, point, 2)
+                if bounces > MAX_BOUNCES:
+                    break
+                continue
+            break
+
+        ray.x, ray.y, ray.angle = x, y, angle
+        ray.bounces, ray.steps = bounces, steps
+        return finished
+
+    def draw(self, surface):
+        """잔상 레이어 + 진행 중인 광선 앞부분"""
+        if self.scene is None:
+            return
+        surface.blit(self.layer, (0, 0))
+        for ray in self.rays:
+            if ray.done:
+                continue
+            pos = (int(ray.x), int(ray.y))
+            pygame.draw.circle(surface, COLORS[ray.color], pos, FRONT_RADIUS)
+            pygame.draw.circle(surface, HIT_COLOR, pos, FRONT_RADIUS + 2, 1)
+
+
+def render_beam(scene, surface=None, cancelled=None):
+    """
+    빛 경로를 한 번에 끝까지 계산해서 그림 (썸네일, 헤드리스 스냅샷, 맵 에디터 미리보기 워커)
+
+    Parameters:
+        scene: SceneStore
+        surface: 그릴 Surface (None이면 장면 크기의 투명 레이어)
+        cancelled: 호출해서 True면 계산을 중단하고 None 반환
+
+    Returns:
+        (그린 Surface, 빛을 받은 목표 인덱스 set) 또는 None
+    """
+    front = BeamFront()
+    front.start(scene)
+    front.advance(surface, cancelled=cancelled)
+    if not front.done:
+        return None
+    return (front.layer if surface is None else surface), front.hits
@@ -0,0 +1,115 @@
+"""
+시간에 따라 움직이는 오브젝트 (레벨 플레이)
+- 레벨 JSON의 rotate(거울 회전)/path(블랙홀 이동)/toggle(포탈 깜빡임) 설정을 레벨 시작 후 경과 시간으로 적용
+  (형식은 level_format.py 참고)
+- 각 움직임은 시간 t의 상태를 바로 계산하므로 프레임이 밀리거나 건너뛰어도 위치가 어긋나지 않음
+- Animator.update는 이번 프레임에 실제로 바뀐 오브젝트만 돌려줌 (빛은 그 근처를 지나는 부분만 다시 계산)
+"""
+
+import math
+from bisect import bisect_right
+
+
+class RotateSchedule:
+    """every초마다 angles의 다음 각도로 (거울: Mirror.snap_angle의 대각선 방향들)"""
+
+    __slots__ = ("obj", "every", "angles", "phase")
+
+    def __init__(self, obj, every, angles, phase=0.0):
+        self.obj, self.every, self.angles, self.phase = obj, every, angles, phase
+
+    def apply(self, t):
+        angle = self.angles[int((t + self.phase) // self.every) % len(self.angles)]
+        if angle == self.obj.angle:
+            return False
+        self.obj.angle = angle
+        return True
+
+
+class PathMotion:
+    """points를 따라 일정한 속도(초당 픽셀)로 이동, 마지막 점에서 첫 점으로 돌아와 반복"""
+
+    __slots__ = ("obj", "points", "starts", "total", "speed")
+
+    def __init__(self, obj, points, speed):
+        self.obj, self.points, self.speed = obj, points, speed
+        # 구간마다 시작 거리 (마지막 구간은 마지막 점 -> 첫 점)
+        self.starts = []
+        total = 0.0
+        for i, (x1, y1) in enumerate(points):
+            x2, y2 = points[(i + 1) % len(points)]
+            self.starts.append(total)
+            total += math.hypot(x2 - x1, y2 - y1)
+        self.total = total
+
+    def apply(self, t):
+        if self.total <= 0:
+            return False
+        dist = (t * self.speed) % self.total
+        i = bisect_right(self.starts, dist) - 1
+        x1, y1 = self.points[i]
+        x2, y2 = self.points[(i + 1) % len(self.points)]
+        length = math.hypot(x2 - x1, y2 - y1)
+        ratio = (dist - self.starts[i]) / length if length else 0.0
+        x, y = x1 + (x2 - x1) * ratio, y1 + (y2 - y1) * ratio
+        if (x, y) == (self.obj.x, self.obj.y):
+            return False
+        self.obj.x, self.obj.y = x, y
+        return True
+
+
+class PortalToggle:
+    """on초 동안 켜지고 off초 동안 꺼짐"""
+
+    __slots__ = ("obj", "on", "off", "phase")
+
+    def __init__(self, obj, on, off, phase=0.0):
+        self.obj, self.on, self.off, self.phase = obj, on, off, phase
+
+    def apply(self, t):
+        active = (t + self.phase) % (self.on + self.off) < self.on
+        if active == self.obj.active:
+            return False
+        self.obj.active = active
+        return True
+
+
+BEHAVIOURS = {"rotate": RotateSchedule, "path": PathMotion, "toggle": PortalToggle}
+
+
+class Animator:
+    """레벨의 움직임 전체 (레벨을 불러올 때 만들고 매 프레임 update)"""
+
+    def __init__(self, behaviours=(), named_lists=None):
+        """
+        Parameters:
+            behaviours: level_format.decode_level의 "behaviours" [(씬 키, 인덱스, 종류, 파라미터)]
+            named_lists: {씬 키: 오브젝트 리스트} (레벨 오브젝트)
+        """
+        self.items = []  # (씬 키, 인덱스, 움직임)
+        for key, index, kind, params in behaviours:
+            lst = named_lists.get(key, ()) if named_lists else ()
+            if index < len(lst):
+                self.items.append((key, index, BEHAVIOURS[kind](lst[index], *params)))
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def moving(self, key):
+        """움직이는 오브젝트 인덱스 set (정적 레이어에서 뺄 오브젝트)"""
+        return {index for k, index, _ in self.items if k == key}
+
+    def update(self, t):
+        """
+        시간 t(초)의 상태 적용
+
+        Returns:
+            바뀐 오브젝트 [(씬 키, 인덱스, 바뀌기 전 (x, y))]
+        """
+        changed = []
+        for key, index, behaviour in self.items:
+            obj = behaviour.obj
+            old = (obj.x, obj.y)
+            if behaviour.apply(t):
+                changed.append((key, index, old))
+        return changed
@@ -0,0 +1,159 @@
+"""
+레벨 카탈로그 (levels_index.json)
+- level_*.json 파일 목록과 레벨별 메타데이터(라벨, 제한, 안내 문구, 썸네일, 내용 해시)를 한 파일에 기록
+- 시작 시 파일 mtime/크기만 확인하고, 바뀐 레벨만 다시 읽어 인덱스를 갱신 (증분 재구성)
+- 맵 선택창은 레벨 JSON을 하나하나 열지 않고 인덱스만으로 목록을 표시
+- 팩 파일에 인덱스가 들어 있으면 폴더를 검사하지 않고 그대로 사용
+
+사용법:
+    python catalog.py            # 현재 폴더의 인덱스 갱신 후 목록 출력
+"""
+
+import os
+import re
+import sys
+import json
+
+from level_cache import content_hash
+from pack import get_store
+
+# 상수
+CATALOG_FILE = "levels_index.json"
+CATALOG_VERSION = 1
+LEVEL_PATTERN = re.compile(r"^level_(\d+)\.json$")
+
+
+def scan_level_files(level_dir):
+    """폴더 안의 level_N.json 파일 목록 [(번호, 파일명)] (번호 순)"""
+    found = []
+    try:
+        names = os.listdir(level_dir)
+    except OSError:
+        return []
+    for name in names:
+        match = LEVEL_PATTERN.match(name)
+        if match:
+            found.append((int(match.group(1)), name))
+    found.sort()
+    return found
+
+
+def _make_entry(number, name, raw, st):
+    """레벨 파일 내용에서 카탈로그 항목 생성"""
+    data = json.loads(raw.decode("utf-8"))
+    if not isinstance(data, dict):
+        data = {}
+    meta = data.get("meta") if isinstance(data.get("meta"), dict) else {}
+    limits = data.get("limits") if isinstance(data.get("limits"), dict) else None
+    return {
+        "file": name,
+        "index": number,
+        "label": meta.get("name") or f"Level {number}",
+        "map_index": int(data.get("map_index", number)),
+        "limits": limits,
+        "hint": meta.get("hint", ""),
+        "thumbnail": meta.get("thumbnail"),
+        "hash": content_hash(raw),
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+    }
+
+
+def _read_index(index_path):
+    """기존 인덱스 읽기 (없거나 형식이 다르면 빈 dict)"""
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(index, dict) or index.get("version") != CATALOG_VERSION:
+        return {}
+    return {entry["file"]: entry for entry in index.get("levels", []) if isinstance(entry, dict) and "file" in entry}
+
+
+def _write_index(index_path, entries):
+    """인덱스 저장 (임시 파일에 쓴 뒤 교체)"""
+    tmp_path = index_path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CATALOG_VERSION, "levels": entries}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        print(f"[카탈로그] 인덱스 저장 실패: {e}")
+
+
+def load_catalog(level_dir):
+    """
+    카탈로그 불러오기 (필요한 항목만 증분 갱신)
+
+    Parameters:
+        level_dir: level_*.json이 있는 폴더
+
+    Returns:
+        레벨 번호 순 항목 리스트
+        [{"file", "index", "label", "map_index", "limits", "hint", "thumbnail", "hash", ...}]
+    """
+    index_path = os.path.join(level_dir, CATALOG_FILE)
+
+    # 배포용 팩에 들어 있는 인덱스는 팩 생성 시점에 이미 최신 상태
+    # (팩을 만든 뒤 저장/추가된 낱개 레벨 파일이 있으면 팩 인덱스는 낡았으므로 다시 훑음)
+    store = get_store()
+    if store.in_pack(index_path) and not any(store.loose_is_newer(os.path.join(level_dir, name))
+                                             for _, name in scan_level_files(level_dir)):
+        index = json.loads(store.read_bytes(index_path).decode("utf-8"))
+        return list(index.get("levels", []))
+
+    old_entries = _read_index(index_path)
+    entries = []
+    changed = False
+
+    for number, name in scan_level_files(level_dir):
+        path = os.path.join(level_dir, name)
+        try:
+            st = os.stat(path)
+            old = old_entries.get(name)
+            # 1) mtime/크기가 같으면 파일을 열지 않고 재사용
+            if old and old.get("mtime_ns") == st.st_mtime_ns and old.get("size") == st.st_size:
+                entries.append(old)
+                continue
+
+            with open(path, "rb") as f:
+                raw = f.read()
+            # 2) 내용 해시가 같으면 mtime만 갱신
+            if old and old.get("hash") == content_hash(raw):
+                old["mtime_ns"], old["size"] = st.st_mtime_ns, st.st_size
+                entries.append(old)
+            else:
+                entries.append(_make_entry(number, name, raw, st))
+            changed = True
+        except Exception as e:
+            print(f"[카탈로그] 레벨 읽기 실패: {name} ({e})")
+
+    if changed or len(entries) != len(old_entries):
+        _write_index(index_path, entries)
+        print(f"[카탈로그] 인덱스 갱신: {len(entries)}개 레벨")
+    return entries
+
+
+def find_entry(entries, filename):
+    """파일명(경로 가능)으로 카탈로그 항목 찾기 (없으면 None)"""
+    name = os.path.basename(filename)
+    for entry in entries:
+        if entry["file"] == name:
+            return entry
+    return None
+
+
+def next_entry(entries, filename):
+    """카탈로그 순서상 다음 레벨 항목 (마지막 레벨이거나 목록에 없으면 None)"""
+    name = os.path.basename(filename)
+    for i, entry in enumerate(entries):
+        if entry["file"] == name:
+            return entries[i + 1] if i + 1 < len(entries) else None
+    return None
+
+
+if __name__ == "__main__":
+    folder = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    for entry in load_catalog(folder):
+        print(f"{entry['file']:<16} {entry['label']:<10} 제한={entry['limits']} {entry['hint']}")
@@ -0,0 +1,107 @@
+"""
+폰트 캐시
+- pygame.font.SysFont는 처음 호출할 때 시스템 폰트 목록 전체를 훑음 (fc-list/레지스트리 조회, 수백 ms)
+- 이름으로 찾은 폰트 파일 경로를 __fontcache__/fonts.json에 저장해 두고, 다음 실행부터는 경로로 바로 엶
+- 저장된 파일이 사라졌으면 다시 찾음
+- 못 찾은 폰트는 저장하지 않음 (실행 중에만 기억 -> 나중에 폰트를 설치하면 다음 실행에서 찾음)
+- 같은 (이름, 크기, 굵게) Font 객체는 스레드마다 하나만 만듦 (SDL_ttf 폰트는 스레드 간에 같이 쓰면 안 됨)
+  스레드 로컬에 두므로 썸네일/프리페치 스레드가 끝나면 그 스레드의 Font도 같이 정리됨
+"""
+
+import os
+import json
+import threading
+
+import pygame
+
+# 상수
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FONT_CACHE_DIR = os.path.join(BASE_DIR, "__fontcache__")
+FONT_CACHE_FILE = os.path.join(FONT_CACHE_DIR, "fonts.json")
+DEFAULT_FONT = "Malgun Gothic"
+
+_paths = None              # "이름|굵기" -> 파일 경로 (디스크에 저장)
+_missing = set()           # 이번 실행에서 못 찾은 "이름|굵기" (저장 안 함 -> pygame 기본 폰트)
+_local = threading.local()  # .fonts: (이름, 크기, 굵게) -> Font (스레드마다 따로)
+_lock = threading.Lock()   # 썸네일/프리페치 스레드에서도 그림
+
+
+def _key(name, bold):
+    # SysFont와 같은 정규화 ("Malgun Gothic" == "malgungothic")
+    return f"{name.lower().replace(' ', '')}|{'bold' if bold else 'regular'}"
+
+
+def _load_paths():
+    global _paths
+    if _paths is None:
+        try:
+            with open(FONT_CACHE_FILE, encoding="utf-8") as f:
+                data = json.load(f)
+            _paths = data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            _paths = {}
+    return _paths
+
+
+def _save_paths():
+    try:
+        os.makedirs(FONT_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{FONT_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(_paths, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, FONT_CACHE_FILE)
+    except OSError as e:
+        print(f"[폰트 캐시] 저장 실패: {e}")
+
+
+def _font_path(name, bold):
+    paths = _load_paths()
+    key = _key(name, bold)
+    if key in _missing:
+        return None
+    path = paths.get(key)
+    if path and os.path.exists(path):
+        return path
+    # 캐시에 없거나 파일이 사라짐: 시스템 폰트 목록에서 찾기 (느림, 실행마다 한 번만)
+    path = pygame.font.match_font(name, bold=bold)
+    if path:
+        paths[key] = path
+        _save_paths()
+        return path
+    # 못 찾음: 이번 실행 동안만 기억 (예전 캐시의 "" 항목은 지움)
+    _missing.add(key)
+    if paths.pop(key, None) is not None:
+        _save_paths()
+    return None
+
+
+def font_path(name, bold=False):
+    """폰트 이름 -> 파일 경로 (없으면 None: pygame 기본 폰트)"""
+    with _lock:
+        return _font_path(name, bold)
+
+
+def get_font(size, name=DEFAULT_FONT, bold=False):
+    """
+    SysFont 대신 사용 (경로 캐시 + Font 객체 재사용)
+
+    Parameters:
+        size: 글자 크기
+        name: 시스템 폰트 이름
+        bold: 굵게 (굵은 글꼴 파일이 없으면 SysFont처럼 가짜 굵게)
+    """
+    fonts = getattr(_local, "fonts", None)
+    if fonts is None:
+        fonts = _local.fonts = {}
+    key = (name, size, bold)
+    font = fonts.get(key)
+    if font is None:
+        with _lock:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            path = _font_path(name, bold)
+            font = pygame.font.Font(path, size)
+            if bold and (path is None or path == _font_path(name, False)):
+                font.set_bold(True)
+        fonts[key] = font
+    return font
@@ -0,0 +1,122 @@
+"""
+맵 에디터 되돌리기/다시 실행 기록
+- 편집 하나를 장면 전체 복사본이 아니라 바뀐 부분(diff)만 작은 튜플로 기록
+- 되돌리기/다시 실행 비용은 바뀐 오브젝트 수에 비례 (맵 크기와 무관)
+- 기록 개수 제한 (오래된 것부터 버림)
+- 같은 오브젝트를 연속으로 회전하면(마우스 휠) 기록 하나로 합침
+- 편집/되돌리기/다시 실행이 적용될 때마다 등록된 콜백에 실제로 적용된 방향의 기록을 알림 (자동 저장)
+
+기록 형식:
+    ("splice", 리스트, 위치, 지운 항목들, 넣은 항목들)   리스트 일부 교체 (배치/삭제/클리어/불러오기)
+    ("attr", 오브젝트, 속성 이름, 이전 값, 새 값)        속성 변경 (회전)
+    ("item", 딕셔너리, 키, 이전 값, 새 값)               딕셔너리 값 변경 (레벨 제한/메타)
+    ("batch", [기록, ...])                               여러 기록을 한 번에
+"""
+
+from collections import deque
+
+# 상수
+HISTORY_LIMIT = 200
+
+
+def splice(lst, index, removed, added):
+    """리스트 일부 교체 기록 (실제 교체는 호출한 쪽에서 이미 했다고 가정)"""
+    return ("splice", lst, index, tuple(removed), tuple(added))
+
+
+def invert(op):
+    """반대 방향 기록 (되돌리기로 실제 적용되는 변경)"""
+    kind = op[0]
+    if kind == "splice":
+        _, lst, index, removed, added = op
+        return ("splice", lst, index, added, removed)
+    if kind in ("attr", "item"):
+        return op[:3] + (op[4], op[3])
+    if kind == "batch":
+        return ("batch", [invert(sub) for sub in reversed(op[1])])
+    return op
+
+
+def _apply(op, forward):
+    """기록 하나 적용 (forward=False면 되돌리기)"""
+    kind = op[0]
+    if kind == "splice":
+        _, lst, index, removed, added = op
+        if forward:
+            lst[index:index + len(removed)] = added
+        else:
+            lst[index:index + len(added)] = removed
+    elif kind == "attr":
+        _, obj, name, old, new = op
+        setattr(obj, name, new if forward else old)
+    elif kind == "item":
+        _, mapping, key, old, new = op
+        mapping[key] = new if forward else old
+    elif kind == "batch":
+        for sub in (op[1] if forward else reversed(op[1])):
+            _apply(sub, forward)
+
+
+class History:
+    """되돌리기/다시 실행 스택"""
+
+    def __init__(self, limit=HISTORY_LIMIT):
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack = []
+        self.merge_key = None  # 마지막 기록과 합칠 수 있는 키 (연속 회전)
+        self.version = 0       # 장면이 바뀔 때마다 증가 (빛 경로 미리보기 갱신 판단용)
+        self.listeners = []    # callback(op): 적용된 변경 알림
+
+    def record(self, op, merge_key=None):
+        """
+        편집 기록 (다시 실행 기록은 버림)
+
+        Parameters:
+            op: 기록 튜플 (빈 batch는 무시)
+            merge_key: 직전 기록과 같은 키의 "attr" 기록이면 하나로 합침
+        """
+        if op[0] == "batch" and not op[1]:
+            return
+        self.version += 1
+        self.redo_stack.clear()
+        if merge_key is not None and merge_key == self.merge_key and self.undo_stack:
+            last = self.undo_stack[-1]
+            # 처음 값은 유지하고 마지막 값만 갱신
+            self.undo_stack[-1] = last[:4] + op[4:]
+        else:
+            self.undo_stack.append(op)
+            self.merge_key = merge_key
+        self._notify(op)
+
+    def _notify(self, op):
+        for callback in self.listeners:
+            callback(op)
+
+    def undo(self):
+        """마지막 편집 되돌리기 (되돌린 게 있으면 True)"""
+        if not self.undo_stack:
+            return False
+        op = self.undo_stack.pop()
+        _apply(op, False)
+        self.version += 1
+        self.redo_stack.append(op)
+        self.merge_key = None
+        self._notify(invert(op))
+        return True
+
+    def redo(self):
+        """되돌린 편집 다시 실행 (다시 실행한 게 있으면 True)"""
+        if not self.redo_stack:
+            return False
+        op = self.redo_stack.pop()
+        _apply(op, True)
+        self.version += 1
+        self.undo_stack.append(op)
+        self.merge_key = None
+        self._notify(op)
+        return True
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.merge_key = None
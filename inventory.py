@@ -0,0 +1,82 @@
+"""
+도구 인벤토리 (플레이어가 배치하는 거울/렌즈/포탈 개수 관리)
+- 종류별 배치 개수를 배치/삭제할 때만 갱신 (매 프레임 player_objects를 세지 않음)
+- 레벨 제한(limits)과 비교해서 남은 개수를 O(1)로 계산
+- 개수가 바뀔 때만 등록된 콜백을 호출 (버튼 표시 갱신 등)
+"""
+
+from objects import Mirror, Lens, Portal
+
+# 도구 종류 -> 레벨 제한 키 (포탈 A/B는 같은 "portal" 제한을 따로 적용)
+LIMIT_KEYS = {"mirror": "mirror", "lens": "lens", "portal_a": "portal", "portal_b": "portal"}
+KINDS = tuple(LIMIT_KEYS)
+
+
+def kind_of(obj):
+    """오브젝트의 도구 종류 (인벤토리 대상이 아니면 None)"""
+    if isinstance(obj, Mirror):
+        return "mirror"
+    if isinstance(obj, Lens):
+        return "lens"
+    if isinstance(obj, Portal):
+        return "portal_a" if obj.portal_type == 'A' else "portal_b"
+    return None
+
+
+class Inventory:
+    """종류별 배치 개수 + 레벨 제한"""
+
+    def __init__(self, limits=None):
+        self.limits = dict(limits or {})
+        self.placed = dict.fromkeys(KINDS, 0)
+        self.listeners = []
+
+    def subscribe(self, callback):
+        """개수 변경 콜백 등록: callback(종류, 남은 개수) (등록 즉시 현재 값으로 한 번 호출)"""
+        self.listeners.append(callback)
+        for kind in KINDS:
+            callback(kind, self.remaining(kind))
+
+    def _notify(self, kind):
+        remaining = self.remaining(kind)
+        for callback in self.listeners:
+            callback(kind, remaining)
+
+    def reset(self, limits=None):
+        """새 레벨: 제한을 바꾸고 배치 개수를 0으로"""
+        if limits is not None:
+            self.limits = dict(limits)
+        self.placed = dict.fromkeys(KINDS, 0)
+        for kind in KINDS:
+            self._notify(kind)
+
+    def remaining(self, kind):
+        """남은 개수 (모르는 종류는 0)"""
+        key = LIMIT_KEYS.get(kind)
+        if key is None:
+            return 0
+        return self.limits.get(key, 0) - self.placed[kind]
+
+    def can_place(self, kind):
+        return self.remaining(kind) > 0
+
+    def add(self, obj):
+        """배치 기록 (인벤토리 대상이 아닌 오브젝트는 무시)"""
+        kind = kind_of(obj)
+        if kind is not None:
+            self.placed[kind] += 1
+            self._notify(kind)
+
+    def remove(self, obj):
+        """삭제 기록"""
+        kind = kind_of(obj)
+        if kind is not None and self.placed[kind] > 0:
+            self.placed[kind] -= 1
+            self._notify(kind)
+
+    def clear(self):
+        """배치한 도구 전부 삭제 (제한은 유지, 바뀐 종류만 알림)"""
+        for kind in KINDS:
+            if self.placed[kind]:
+                self.placed[kind] = 0
+                self._notify(kind)
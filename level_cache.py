@@ -0,0 +1,157 @@
+"""
+컴파일된 레벨 캐시
+- 레벨 JSON(v1/v2)을 검증 + 그리드 정규화한 씬 데이터를 marshal 바이너리로 저장
+- 캐시 위치: 원본 옆의 __levelcache__ 폴더 (예: __levelcache__/level_0.json.g41_50_300.bin)
+- 원본의 mtime/크기가 같으면 JSON 파싱 없이 캐시를 바로 사용
+- mtime만 바뀌고 내용 해시가 같으면 캐시를 재사용 (헤더만 갱신)
+- 같은 프로세스 안에서는 메모리 캐시로 파일 읽기도 생략
+- 팩 파일(pack.py)에 들어 있는 레벨은 팩에서 바로 읽음 (디스크 캐시 없이 메모리 캐시만 사용)
+  단, 팩을 만든 뒤 저장된 낱개 파일이 있으면 그 파일을 읽음 (AssetStore.in_pack)
+"""
+
+import os
+import json
+import marshal
+import hashlib
+import threading
+
+from level_format import decode_level
+from pack import get_store
+
+# 상수
+CACHE_DIR_NAME = "__levelcache__"
+CACHE_VERSION = 3  # 3: 씬에 "behaviours" 추가
+
+# 메모리 캐시: (절대 경로, 태그) -> (mtime_ns, size, payload)
+_memory_cache = {}
+
+
+def content_hash(raw):
+    """원본 바이트의 내용 해시 (sha1 16진수)"""
+    return hashlib.sha1(raw).hexdigest()
+
+
+def grid_tag(grid, snap=True):
+    """그리드 설정 (size, offset_x, offset_y)과 스냅 여부를 캐시 태그 문자열로 변환"""
+    if grid is None:
+        return "raw"
+    size, offset_x, offset_y = grid
+    return f"g{size}_{offset_x}_{offset_y}" + ("" if snap else "_raw")
+
+
+def cache_path(path, tag):
+    """원본 경로에 대응하는 캐시 파일 경로"""
+    folder, name = os.path.split(os.path.abspath(path))
+    return os.path.join(folder, CACHE_DIR_NAME, f"{name}.{tag}.bin")
+
+
+def compile_scene(data, grid=None, snap=True):
+    """레벨 JSON(v1/v2)을 검증하고 씬 튜플 목록으로 변환 (level_format.decode_level 참고)"""
+    return decode_level(data, grid, snap)
+
+
+def _read_cache(cpath):
+    """캐시 파일 읽기 (없거나 깨졌으면 None)"""
+    try:
+        with open(cpath, "rb") as f:
+            entry = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(entry, dict) or entry.get("version") != CACHE_VERSION:
+        return None
+    return entry
+
+
+def _write_cache(cpath, entry):
+    """캐시 파일 쓰기 (임시 파일에 쓴 뒤 교체, 실패해도 게임은 계속 진행)"""
+    try:
+        os.makedirs(os.path.dirname(cpath), exist_ok=True)
+        # 프리페치 스레드와 동시에 쓸 수 있으므로 임시 파일 이름을 스레드별로 구분
+        tmp_path = f"{cpath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            marshal.dump(entry, f)
+        os.replace(tmp_path, cpath)
+    except OSError as e:
+        print(f"[레벨 캐시] 캐시 저장 실패: {e}")
+
+
+def _load_packed(store, path, tag, compile_fn):
+    """팩 안의 레벨 로드 (팩은 실행 중 바뀌지 않으므로 메모리 캐시만 사용)"""
+    key = ("pack:" + store.relname(path), tag)
+    cached = _memory_cache.get(key)
+    if cached:
+        return cached[2]
+    payload = compile_fn(json.loads(store.read_bytes(path).decode("utf-8")))
+    _memory_cache[key] = (None, None, payload)
+    return payload
+
+
+def _load(path, tag, compile_fn):
+    """공통 로드 경로: 팩 -> 메모리 캐시 -> 디스크 캐시(mtime/크기 -> 해시) -> JSON 파싱"""
+    store = get_store()
+    if store.in_pack(path):
+        return _load_packed(store, path, tag, compile_fn)
+
+    abs_path = os.path.abspath(path)
+    st = os.stat(abs_path)
+    key = (abs_path, tag)
+
+    # 1) 메모리 캐시
+    cached = _memory_cache.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    # 2) 디스크 캐시 (mtime/크기 일치)
+    cpath = cache_path(abs_path, tag)
+    entry = _read_cache(cpath)
+    if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+        _memory_cache[key] = (st.st_mtime_ns, st.st_size, entry["payload"])
+        return entry["payload"]
+
+    with open(abs_path, "rb") as f:
+        raw = f.read()
+    digest = content_hash(raw)
+
+    # 3) 디스크 캐시 (내용 해시 일치 - 파일만 다시 저장된 경우)
+    if entry and entry["hash"] == digest:
+        entry["mtime_ns"], entry["size"] = st.st_mtime_ns, st.st_size
+        _write_cache(cpath, entry)
+        _memory_cache[key] = (st.st_mtime_ns, st.st_size, entry["payload"])
+        return entry["payload"]
+
+    # 4) 캐시 미스: JSON 파싱 후 컴파일
+    payload = compile_fn(json.loads(raw.decode("utf-8")))
+    _write_cache(cpath, {
+        "version": CACHE_VERSION,
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "hash": digest,
+        "payload": payload,
+    })
+    _memory_cache[key] = (st.st_mtime_ns, st.st_size, payload)
+    return payload
+
+
+def load_scene(path, grid=None, snap=True):
+    """
+    레벨 파일을 컴파일된 씬으로 불러오기 (캐시 사용)
+
+    Parameters:
+        path: 레벨 JSON 경로
+        grid: (size, offset_x, offset_y) - v2 칸 좌표 변환 / v1 좌표 스냅 기준
+        snap: v1 픽셀 좌표를 그리드 칸 중심으로 스냅할지 여부
+
+    Returns:
+        compile_scene()과 같은 형식의 dict (공유 객체이므로 수정하지 말 것)
+    """
+    return _load(path, grid_tag(grid, snap), lambda data: compile_scene(data, grid, snap))
+
+
+def load_json(path):
+    """JSON 문서를 그대로 불러오기 (캐시 사용, 반환값은 수정하지 말 것)"""
+    return _load(path, "json", lambda data: data)
+
+
+def clear_memory_cache():
+    """메모리 캐시 비우기 (디스크 캐시는 유지)"""
+    _memory_cache.clear()
@@ -0,0 +1,91 @@
+"""
+레벨 변환 도구 (v1 픽셀 좌표 -> v2 그리드 칸)
+- level_play.py의 그리드 (GRID_SIZE=41, 오프셋 50/300) 기준으로 칸 좌표 계산
+- 각도는 방향 인덱스로 양자화
+- v1 파일에 있던 제한(limits)/메타데이터(meta)는 그대로 옮김
+
+사용법:
+    python level_convert.py                  # 현재 폴더의 level_*.json 전체 변환
+    python level_convert.py level_3.json     # 지정한 파일만 변환
+    python level_convert.py --dry-run        # 결과만 출력, 파일은 그대로
+"""
+
+import sys
+import glob
+import json
+import argparse
+
+from level_format import decode_level, encode_level, dumps_level, get_version, pixel_to_cell
+from level_play import WIDTH, HEIGHT, GRID_SIZE, GRID_OFFSET_X, GRID_OFFSET_Y
+
+# 상수
+PLAY_GRID = (GRID_SIZE, GRID_OFFSET_X, GRID_OFFSET_Y)
+
+
+def play_grid_cells():
+    """플레이 화면에 들어가는 그리드 칸 수 (cols, rows)"""
+    cols = (WIDTH - 1 - GRID_OFFSET_X) // GRID_SIZE + 1
+    rows = (HEIGHT - 1 - GRID_OFFSET_Y) // GRID_SIZE + 1
+    return cols, rows
+
+
+def convert_file(path, dry_run=False):
+    """
+    v1 레벨 파일 하나를 v2로 변환
+
+    Returns:
+        True: 변환함 / False: 이미 v2라서 건너뜀
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if get_version(data) >= 2:
+        print(f"건너뜀 (이미 v2): {path}")
+        return False
+
+    # 칸 중심에서 벗어난 좌표 경고 (기존 로더가 로드할 때마다 스냅하던 값)
+    size, offset_x, offset_y = PLAY_GRID
+    for key, items in data.items():
+        if not isinstance(items, list):
+            continue
+        for obj in items:
+            if isinstance(obj, dict) and "x" in obj and "y" in obj:
+                col, row = pixel_to_cell(obj["x"], obj["y"], PLAY_GRID)
+                if (offset_x + col * size, offset_y + row * size) != (obj["x"], obj["y"]):
+                    print(f"  [{key}] ({obj['x']}, {obj['y']}) -> 칸 ({col}, {row}) 로 스냅")
+
+    scene = decode_level(data, PLAY_GRID, snap=True)
+    new_data = encode_level(scene, PLAY_GRID, scene["map_index"], scene["limits"], scene["meta"],
+                            play_grid_cells())
+    text = dumps_level(new_data)
+
+    if dry_run:
+        print(f"--- {path} (dry-run) ---")
+        print(text)
+        return True
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    print(f"변환 완료: {path}")
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="레벨 v1 -> v2 변환 도구")
+    parser.add_argument("files", nargs="*", help="변환할 레벨 JSON (기본: level_*.json)")
+    parser.add_argument("--dry-run", action="store_true", help="파일을 쓰지 않고 결과만 출력")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    files = args.files or sorted(glob.glob("level_*.json"))
+    converted = 0
+    for path in files:
+        try:
+            if convert_file(path, args.dry_run):
+                converted += 1
+        except Exception as e:
+            print(f"[변환 실패] {path}: {e}")
+    print(f"총 {converted}개 파일 변환")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+레벨 파일 형식
+- v1: 절대 픽셀 좌표 ({"x": 501, "y": 423, "angle": 45})
+- v2: 정수 그리드 칸 + 양자화된 각도 인덱스 + 제한/메타데이터
+
+v2 예시:
+    {
+      "version": 2,
+      "map_index": 0,
+      "grid": {"cols": 30, "rows": 11},
+      "limits": {"mirror": 2, "lens": 0, "portal": 0},
+      "meta": {"hint": "🔸 거울 2개만 사용 가능"},
+      "emitters": [{"col": 1, "row": 1, "color": "white", "dir": 0}],
+      "targets": [{"col": 25, "row": 7, "color": "white"}],
+      "mirrors": [{"col": 7, "row": 1, "dir": 0}],
+      ...
+    }
+
+시간에 따라 움직이는 오브젝트 (선택, 레벨 플레이에서만 동작 - behaviours.py):
+    거울 회전:   {"col": 7, "row": 1, "dir": 0, "rotate": {"every": 1.5, "dirs": [0, 1], "phase": 0}}
+                 every초마다 dirs(대각선 방향 인덱스, 없으면 자기 방향부터 4방향)의 다음 방향으로
+    블랙홀 이동: {"col": 3, "row": 2, "path": [[8, 2], [8, 6]], "speed": 2}
+                 자기 칸 -> path의 칸들 -> 다시 자기 칸을 speed(칸/초)로 반복 (v1은 path가 픽셀 좌표)
+    포탈 깜빡임: {"col": 5, "row": 4, "toggle": {"on": 2, "off": 1, "phase": 0}}
+                 on초 동안 켜지고 off초 동안 꺼짐 (꺼진 포탈은 빛을 보내거나 받지 않음)
+
+그리드는 (size, offset_x, offset_y) 튜플로 전달하며,
+칸 (col, row)의 중심 픽셀 = (offset_x + col * size, offset_y + row * size)
+"""
+
+import json
+
+# 상수
+FORMAT_VERSION = 2
+
+# 씬 키와 각 항목의 튜플 형식 (decode_level 결과)
+#   emitters: (x, y, color, angle)     targets: (x, y, color)
+#   mirrors/lenses: (x, y, angle)      portals_a/portals_b/blackholes: (x, y)
+SCENE_KEYS = ("emitters", "targets", "mirrors", "lenses", "portals_a", "portals_b", "blackholes")
+
+# 각도 양자화: angle = base + dir * step  (dir: 0 ~ 360/step - 1)
+ANGLE_STEPS = {
+    "emitters": (0, 90),   # 상하좌우 4방향
+    "mirrors": (45, 90),   # 대각선 4방향
+    "lenses": (0, 5),      # 마우스 휠 한 칸 = 5도
+}
+
+
+# 씬 키 -> 그 키의 오브젝트에 붙일 수 있는 움직임 종류 (레벨 JSON의 항목 키)
+BEHAVIOUR_KEYS = {
+    "mirrors": "rotate",
+    "blackholes": "path",
+    "portals_a": "toggle",
+    "portals_b": "toggle",
+}
+
+
+def angle_to_dir(key, angle):
+    """절대 각도(degree)를 각도 인덱스로 양자화"""
+    base, step = ANGLE_STEPS[key]
+    return int(round((angle - base) / step)) % (360 // step)
+
+
+def dir_to_angle(key, direction):
+    """각도 인덱스를 절대 각도(degree)로 변환"""
+    base, step = ANGLE_STEPS[key]
+    return (base + int(direction) * step) % 360
+
+
+def pixel_to_cell(x, y, grid):
+    """픽셀 좌표를 가장 가까운 그리드 칸 (col, row)으로 변환"""
+    size, offset_x, offset_y = grid
+    return int(round((x - offset_x) / size)), int(round((y - offset_y) / size))
+
+
+def cell_to_pixel(col, row, grid):
+    """그리드 칸 (col, row)의 중심 픽셀 좌표"""
+    size, offset_x, offset_y = grid
+    return offset_x + col * size, offset_y + row * size
+
+
+def get_version(data):
+    """레벨 데이터의 형식 버전 (version 키가 없으면 v1)"""
+    if isinstance(data, dict):
+        return int(data.get("version", 1))
+    return 1
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _scene_item(key, x, y, obj, angle):
+    """씬 키에 맞는 튜플 생성"""
+    if key == "emitters":
+        return (x, y, obj.get("color", "white"), angle)
+    if key == "targets":
+        return (x, y, obj.get("color", "white"))
+    if key in ("mirrors", "lenses"):
+        return (x, y, angle)
+    return (x, y)
+
+
+def _positive(value):
+    return _is_number(value) and value > 0
+
+
+def _decode_behaviour(key, obj, x, y, angle, version, grid, snap):
+    """
+    오브젝트 항목의 움직임 설정 -> (종류, 파라미터) (없으면 None, 잘못됐으면 경고 후 None)
+
+    파라미터 (픽셀/초 단위):
+        rotate: (every, (각도, ...), phase)
+        path:   (((x, y), ...) 자기 위치 포함, 초당 픽셀)
+        toggle: (on, off, phase)
+    """
+    kind = BEHAVIOUR_KEYS.get(key)
+    if kind is None or kind not in obj:
+        return None
+    value = obj[kind]
+    if kind == "rotate" and isinstance(value, dict) and _positive(value.get("every")):
+        dirs = value.get("dirs")
+        if dirs is None:
+            own = angle_to_dir(key, angle)
+            dirs = [own + i for i in range(360 // ANGLE_STEPS[key][1])]
+        if isinstance(dirs, list) and dirs and all(isinstance(d, int) for d in dirs):
+            angles = tuple(dir_to_angle(key, d) for d in dirs)
+            return kind, (float(value["every"]), angles, float(value.get("phase", 0)))
+    elif kind == "path" and isinstance(value, list) and value:
+        points = [(x, y)]
+        for point in value:
+            if not (isinstance(point, list) and len(point) == 2 and all(_is_number(v) for v in point)):
+                points = None
+                break
+            if version == 2:
+                points.append(cell_to_pixel(int(point[0]), int(point[1]), grid))
+            elif snap and grid is not None:
+                points.append(cell_to_pixel(*pixel_to_cell(point[0], point[1], grid), grid))
+            else:
+                points.append((point[0], point[1]))
+        speed = obj.get("speed", 1)
+        if points and _positive(speed):
+            cell = grid[0] if grid is not None else 1
+            return kind, (tuple(points), float(speed) * cell)
+    elif kind == "toggle" and isinstance(value, dict) and _positive(value.get("on")) and _positive(value.get("off")):
+        return kind, (float(value["on"]), float(value["off"]), float(value.get("phase", 0)))
+    print(f"[레벨 형식] 잘못된 움직임 설정 무시 ({key}.{kind}): {value}")
+    return None
+
+
+def _encode_behaviour(key, obj, kind, params, grid):
+    """_decode_behaviour의 반대 (v2 항목 obj에 움직임 설정 추가)"""
+    if kind == "rotate":
+        every, angles, phase = params
+        value = {"every": every, "dirs": [angle_to_dir(key, a) for a in angles]}
+        if phase:
+            value["phase"] = phase
+        obj["rotate"] = value
+    elif kind == "path":
+        points, speed = params
+        obj["path"] = [list(pixel_to_cell(px, py, grid)) for px, py in points[1:]]
+        obj["speed"] = speed / grid[0]
+    elif kind == "toggle":
+        on, off, phase = params
+        obj["toggle"] = {"on": on, "off": off, "phase": phase} if phase else {"on": on, "off": off}
+
+
+def splice_behaviours(behaviours, key, index, removed, added, carried=()):
+    """
+    오브젝트 리스트 일부 교체(key[index:index + removed] = added개)에 맞춰 움직임 인덱스 조정
+
+    Parameters:
+        behaviours: decode_level의 "behaviours" [(씬 키, 인덱스, 종류, 파라미터)]
+        carried: 새로 넣은 항목의 움직임 [(넣은 항목 안의 위치, 종류, 파라미터)]
+
+    Returns:
+        새 목록 (지운 항목의 움직임은 버리고, 뒤쪽 항목은 added - removed만큼 이동)
+    """
+    result = []
+    for k, i, kind, params in behaviours:
+        if k != key or i < index:
+            result.append((k, i, kind, params))
+        elif i >= index + removed:
+            result.append((k, i + added - removed, kind, params))
+    result += [(key, index + offset, kind, params) for offset, kind, params in carried]
+    return result
+
+
+def decode_level(data, grid=None, snap=True):
+    """
+    레벨 데이터(v1/v2)를 픽셀 좌표 씬으로 변환
+
+    Parameters:
+        data: json.load 결과
+        grid: (size, offset_x, offset_y) - v2 칸 좌표 변환에 필수
+        snap: v1 픽셀 좌표를 grid 칸 중심으로 스냅할지 여부
+
+    Returns:
+        {"version", "map_index", "limits", "meta", "grid_cells", "behaviours", "emitters": [(x, y, color, angle)], ...}
+        limits/grid_cells는 파일에 없으면 None
+        behaviours: [(씬 키, 인덱스, 종류, 파라미터)] - 움직이는 오브젝트 (_decode_behaviour 참고)
+    """
+    if not isinstance(data, dict):
+        raise ValueError("레벨 JSON 최상위는 객체(dict)여야 합니다")
+
+    version = get_version(data)
+    if version > FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 레벨 형식 버전입니다: {version}")
+    if version == 2 and grid is None:
+        raise ValueError("v2 레벨은 그리드 설정이 있어야 불러올 수 있습니다")
+
+    scene = {
+        "version": version,
+        "map_index": int(data.get("map_index", 0)),
+        "limits": dict(data["limits"]) if isinstance(data.get("limits"), dict) else None,
+        "meta": dict(data["meta"]) if isinstance(data.get("meta"), dict) else {},
+        "grid_cells": None,
+        "behaviours": [],
+    }
+    grid_info = data.get("grid")
+    if isinstance(grid_info, dict) and isinstance(grid_info.get("cols"), int) and isinstance(grid_info.get("rows"), int):
+        scene["grid_cells"] = (grid_info["cols"], grid_info["rows"])
+    for key in SCENE_KEYS:
+        items = []
+        for obj in data.get(key, []) or []:
+            if version == 2:
+                if not isinstance(obj, dict) or not isinstance(obj.get("col"), int) or not isinstance(obj.get("row"), int):
+                    print(f"[레벨 형식] 잘못된 항목 무시 ({key}): {obj}")
+                    continue
+                x, y = cell_to_pixel(obj["col"], obj["row"], grid)
+                angle = dir_to_angle(key, obj.get("dir", 0)) if key in ANGLE_STEPS else 0
+            else:
+                if not isinstance(obj, dict) or not _is_number(obj.get("x")) or not _is_number(obj.get("y")):
+                    print(f"[레벨 형식] 잘못된 항목 무시 ({key}): {obj}")
+                    continue
+                x, y = obj["x"], obj["y"]
+                if snap and grid is not None:
+                    x, y = cell_to_pixel(*pixel_to_cell(x, y, grid), grid)
+                angle = obj.get("angle", 0)
+            items.append(_scene_item(key, x, y, obj, angle))
+            behaviour = _decode_behaviour(key, obj, x, y, angle, version, grid, snap)
+            if behaviour is not None:
+                scene["behaviours"].append((key, len(items) - 1) + behaviour)
+        scene[key] = items
+    return scene
+
+
+def encode_level(scene, grid, map_index=0, limits=None, meta=None, grid_cells=None, behaviours=None):
+    """
+    픽셀 좌표 씬(decode_level 형식)을 v2 레벨 데이터로 변환
+
+    Parameters:
+        scene: {"emitters": [(x, y, color, angle)], ...}
+        grid: (size, offset_x, offset_y)
+        grid_cells: (cols, rows) - 기록용 그리드 크기 (선택)
+        behaviours: decode_level의 "behaviours" (없으면 scene의 값, 인덱스가 범위를 벗어나면 버림)
+    """
+    if behaviours is None:
+        behaviours = scene.get("behaviours") or ()
+    attached = {(key, index): (kind, params) for key, index, kind, params in behaviours}
+    data = {"version": FORMAT_VERSION, "map_index": int(map_index)}
+    if grid_cells:
+        data["grid"] = {"cols": grid_cells[0], "rows": grid_cells[1]}
+    if limits is not None:
+        data["limits"] = dict(limits)
+    if meta:
+        data["meta"] = dict(meta)
+
+    for key in SCENE_KEYS:
+        items = []
+        for item in scene.get(key, []):
+            col, row = pixel_to_cell(item[0], item[1], grid)
+            obj = {"col": col, "row": row}
+            if key in ("emitters", "targets"):
+                obj["color"] = item[2]
+            if key in ANGLE_STEPS:
+                obj["dir"] = angle_to_dir(key, item[-1])
+            behaviour = attached.get((key, len(items)))
+            if behaviour is not None:
+                _encode_behaviour(key, obj, *behaviour, grid)
+            items.append(obj)
+        data[key] = items
+    return data
+
+
+def dumps_level(data):
+    """
+    레벨 데이터를 문자열로 직렬화
+    최상위 키는 한 줄씩, 오브젝트는 한 줄에 하나씩 (indent=2보다 작고 diff 보기 쉬움)
+    """
+    lines = ["{"]
+    keys = list(data.keys())
+    for i, key in enumerate(keys):
+        value = data[key]
+        comma = "," if i < len(keys) - 1 else ""
+        if isinstance(value, list) and value:
+            lines.append(f"  {json.dumps(key)}: [")
+            for j, item in enumerate(value):
+                item_comma = "," if j < len(value) - 1 else ""
+                lines.append(f"    {json.dumps(item, ensure_ascii=False)}{item_comma}")
+            lines.append(f"  ]{comma}")
+        else:
+            lines.append(f"  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)}{comma}")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
@@ -1,21 +1,31 @@
 import pygame
-import math
-import json
 import sys
-import os
+import argparse
+import threading
+import time
+from collections import OrderedDict
 
 # 모듈 임포트 (objects.py, utils.py 필요)
-from objects import (Button, Emitter, Target, Mirror, Lens, Blackhole, Portal,
-                     COLORS, RADIUS)
-from utils import near, angle_wrap, vec_from_angle, advance, refract_angle, N_AIR
+from objects import Button, Emitter, Target, Mirror, Lens, Blackhole, Portal
+from utils import near, angle_wrap
+from runtime import is_headless, init_pygame, create_screen, present, save_frame
+from fonts import get_font
+from level_cache import load_scene
+from pack import get_store
+from inventory import Inventory
+from audio import BgmPlayer, SfxPool, track_path
+from scene_store import SceneStore, LIST_KINDS, PORTAL_A
+from behaviours import Animator
+from beam_front import BeamFront, render_beam, BEAM_SPEED, BEAM_BUDGET_MS
 
 # --- 기본 설정 ---
 WIDTH, HEIGHT = 1280, 720
 FPS = 60
 
-# BGM 설정
-BGM_DIR = os.path.join(os.path.dirname(__file__), "assets", "bgm")
-BGM_FILE = '경쾌한 BGM.mp3'
+# BGM (곡 선택/백그라운드 디코딩/크로스페이드는 audio.py)
+bgm = BgmPlayer()
+# 효과음 (배치/회전/목표 적중/퍼즐 완료, 믹서 초기화 때 미리 준비)
+sfx = SfxPool()
 
 # 오디오 초기화 함수
 def init_audio():
@@ -23,30 +33,29 @@ def init_audio():
         if not pygame.mixer.get_init():
             pygame.mixer.init()
             print("🔊 오디오 장치 초기화됨")
+        sfx.load()
     except Exception as e:
         print(f"❌ 오디오 초기화 에러: {e}")
 
-# BGM 재생 함수
-def play_bgm_for_map(map_index):
-    # 경로 생성
-    bgm_path = os.path.join(os.path.dirname(__file__), 'assets', 'bgm', '경쾌한 BGM.mp3')
-    
-    # 1. 경로 확인 (디버깅용)
-    print(f"🔍 BGM 경로: {bgm_path}")
+def get_bgm_path(map_index, meta=None):
+    """맵 번호에 해당하는 BGM 경로 (레벨 메타데이터의 "bgm", 없으면 기본 곡)"""
+    return track_path(map_index, meta)
 
-    # 2. 파일이 진짜 있는지 확인
-    if not os.path.exists(bgm_path):
-        print("❌ 오류: BGM 파일이 해당 경로에 없습니다.")
+# BGM 재생 함수
+def play_bgm_for_map(map_index, meta=None):
+    """
+    맵의 BGM 재생 요청 (바로 반환)
+    같은 곡이 이미 재생 중이면 그대로 이어서 재생, 다른 곡이면 백그라운드에서 준비 후 크로스페이드
+    """
+    bgm_path = get_bgm_path(map_index, meta)
+
+    # 파일이 진짜 있는지 확인 (팩 목차/파일 존재만 확인, 읽기는 백그라운드)
+    if not get_store().exists(bgm_path):
+        print(f"❌ 오류: BGM 파일이 해당 경로에 없습니다: {bgm_path}")
         return
 
-    # 3. 재생 시도
-    try:
-        pygame.mixer.music.load(bgm_path)
-        pygame.mixer.music.set_volume(0.5) # 볼륨 50%
-        pygame.mixer.music.play(-1)        # -1은 무한 반복
-        print("♬ BGM 재생 성공!")
-    except Exception as e:
-        print(f"❌ 재생 실패 (에러 내용): {e}")
+    if bgm.play(bgm_path):
+        print(f"🔍 BGM 준비: {bgm_path}")
 
 
 # 그리드 설정
@@ -54,12 +63,31 @@ GRID_SIZE = 41  # 가로 30칸 기준 (1230 / 30 = 41)
 GRID_OFFSET_X = 50
 GRID_OFFSET_Y = 300
 
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("광학 퍼즐 게임 - 레벨 플레이")
-clock = pygame.time.Clock()
-FONT = pygame.font.SysFont("Malgun Gothic", 20)
-FONT_BIG = pygame.font.SysFont("Malgun Gothic", 24)
+# 화면/폰트는 main()에서 init_display()로 생성 (임포트만으로 창이 열리지 않도록)
+screen = None
+clock = None
+FONT = None
+FONT_BIG = None
+headless = False
+
+def init_display(headless_mode=False):
+    """pygame 초기화 후 화면(헤드리스면 오프스크린 Surface)과 폰트 생성"""
+    global screen, clock, FONT, FONT_BIG, headless
+    headless = headless_mode
+    init_pygame(headless)
+    screen = create_screen((WIDTH, HEIGHT), "광학 퍼즐 게임 - 레벨 플레이", headless)
+    clock = pygame.time.Clock()
+    FONT = get_font(20)
+    FONT_BIG = get_font(24)
+    return screen
+
+def use_display(surface, font, font_big, headless_mode=False):
+    """이미 만들어진 화면/폰트 사용 (씬 매니저에서 창과 폰트를 공유할 때)"""
+    global screen, FONT, FONT_BIG, headless
+    screen = surface
+    FONT = font
+    FONT_BIG = font_big
+    headless = headless_mode
 
 # --- 그리드 함수 ---
 def snap_to_grid(x, y):
@@ -82,6 +110,50 @@ def draw_grid(surface):
         pygame.draw.line(surface, grid_color, (GRID_OFFSET_X, y), (WIDTH, y), 1)
         y += GRID_SIZE
 
+# --- 정적 레이어 (배경 + 그리드 + 고정 오브젝트) ---
+BACKGROUND = (30, 30, 30)
+STATIC_LAYER_CACHE_SIZE = 4
+
+_static_layers = OrderedDict()  # (발사장치, 블랙홀) 튜플 -> Surface
+_static_lock = threading.Lock()
+static_layer = None  # 현재 레벨의 정적 레이어
+
+def build_static_layer(scene):
+    """
+    레벨마다 바뀌지 않는 부분을 한 장의 Surface로 그리기
+    (배경, 그리드, 발사장치, 블랙홀 - 플레이 중 움직이지 않음, path가 있는 블랙홀은 매 프레임 따로 그림)
+    디스플레이 없이 그리므로 프리페치 스레드에서도 호출 가능
+    """
+    layer = pygame.Surface((WIDTH, HEIGHT))
+    layer.fill(BACKGROUND)
+    draw_grid(layer)
+    for x, y, color, angle in scene["emitters"]:
+        Emitter(x, y, color, angle).draw(layer)
+    moving = moving_indices(scene, "blackholes")
+    for i, (x, y) in enumerate(scene["blackholes"]):
+        if i not in moving:
+            Blackhole(x, y).draw(layer)
+    return layer
+
+def moving_indices(scene, key):
+    """레벨에서 움직임 설정이 붙은 오브젝트 인덱스 (level_format의 "behaviours")"""
+    return {index for k, index, kind, params in scene["behaviours"] if k == key}
+
+def get_static_layer(scene):
+    """정적 레이어 캐시 조회 (없으면 만들어서 최근 STATIC_LAYER_CACHE_SIZE개까지 보관)"""
+    key = (tuple(scene["emitters"]), tuple(scene["blackholes"]), tuple(sorted(moving_indices(scene, "blackholes"))))
+    with _static_lock:
+        layer = _static_layers.get(key)
+        if layer is not None:
+            _static_layers.move_to_end(key)
+            return layer
+    layer = build_static_layer(scene)
+    with _static_lock:
+        _static_layers[key] = layer
+        while len(_static_layers) > STATIC_LAYER_CACHE_SIZE:
+            _static_layers.popitem(last=False)
+    return layer
+
 def draw_info_box(surface, text, color=(255, 220, 0)):
     """안내 글상자 그리기"""
     info_text = FONT_BIG.render(text, True, color)
@@ -106,12 +178,26 @@ def draw_info_box(surface, text, color=(255, 220, 0)):
 emitters, targets, mirrors, lenses, blackholes = [], [], [], [], []
 portals_a, portals_b = [], []
 player_objects = []  # 플레이어가 배치한 오브젝트
+NAMED_LISTS = {"emitters": emitters, "targets": targets, "mirrors": mirrors, "lenses": lenses,
+               "portals_a": portals_a, "portals_b": portals_b, "blackholes": blackholes}
+scene_version = 0  # 오브젝트를 배치/삭제/회전하거나 레벨을 불러올 때마다 증가 (빛 추적 다시 시작)
+
+# --- 움직이는 오브젝트 (레벨의 rotate/path/toggle, behaviours.py) ---
+MAX_ANIM_STEP = 0.1  # 한 프레임에 진행하는 최대 시간 (창을 끌거나 씬을 바꿔서 멈췄다 돌아왔을 때)
+animator = Animator()
+anim_time = 0.0      # 레벨을 불러온 뒤 경과 시간 (초)
+anim_clock = None    # 지난 프레임 시각 (perf_counter)
+moving_blackholes = []  # 정적 레이어에 없어서 매 프레임 그리는 블랙홀
 
 # --- 모드/상태 ---
 object_mode = None  # 'mirror'|'lens'|'portal_a'|'portal_b'|'eraser'
 game_started = False
+was_complete = False  # 지난 프레임에 퍼즐 완료 상태였는지 (완료 효과음은 한 번만)
+last_hits = set()     # 마지막으로 끝까지 추적했을 때 빛을 받은 목표 (적중 효과음은 새로 맞은 목표만)
 level_file = "level_0.json"  # 현재 레벨 파일
 
+last_selected = None  # 마우스 휠로 회전할 오브젝트
+
 portal_a_used = 0
 portal_b_used = 0
 
@@ -132,46 +218,62 @@ buttons = [btn_start, btn_stop, btn_clear, btn_back,
            btn_mirror, btn_eraser, btn_lens, btn_portal_a, btn_portal_b]
 
 # --- 레벨별 제한 설정 ---
-LEVEL_LIMITS = {
-    "level_0.json": {"mirror": 2, "lens": 0, "portal": 0},
-    "level_1.json": {"mirror": 0, "lens": 2, "portal": 0},
-    "level_2.json": {"mirror": 1, "lens": 1, "portal": 0},
-    "level_3.json": {"mirror": 1, "lens": 2, "portal": 0},
-    "level_4.json": {"mirror": 0, "lens": 1, "portal": 1},
-    "level_5.json": {"mirror": 0, "lens": 3, "portal": 1},
-    "level_6.json": {"mirror": 1, "lens": 2, "portal": 1},
-    "level_7.json": {"mirror": 3, "lens": 1, "portal": 1},
-}
+# 제한과 안내 문구는 레벨 파일(v2의 "limits", "meta.hint")에 함께 저장됨
+DEFAULT_LIMITS = {"mirror": 99, "lens": 99, "portal": 99}
+
+# 현재 레벨의 제한/안내
+level_limits = dict(DEFAULT_LIMITS)
+level_hint = ""
+
+# 배치 개수/남은 개수 (배치·삭제할 때만 갱신)
+inventory = Inventory(level_limits)
+count_buttons = {"mirror": btn_mirror, "lens": btn_lens,
+                 "portal_a": btn_portal_a, "portal_b": btn_portal_b}
+
+def update_count_button(kind, remaining):
+    """인벤토리 개수가 바뀌었을 때만 버튼 표시 갱신"""
+    btn = count_buttons.get(kind)
+    if btn is not None:
+        btn.count = remaining
+
+inventory.subscribe(update_count_button)
 
 def get_remaining_count(item_type):
     """남은 아이템 개수 반환"""
-    level_name = os.path.basename(level_file)
-    limits = LEVEL_LIMITS.get(level_name, {"mirror": 99, "lens": 99, "portal": 99})
-    
-    if item_type == "mirror":
-        used = sum(1 for obj in player_objects if isinstance(obj, Mirror))
-        return limits["mirror"] - used
-    elif item_type == "lens":
-        used = sum(1 for obj in player_objects if isinstance(obj, Lens))
-        return limits["lens"] - used
-    elif item_type == "portal_a":
-        used_a = sum(1 for obj in player_objects
-                     if isinstance(obj, Portal) and obj.portal_type == 'A')
-        return limits["portal"] - used_a
-    elif item_type == "portal_b":
-        used_b = sum(1 for obj in player_objects
-                     if isinstance(obj, Portal) and obj.portal_type == 'B')
-        return limits["portal"] - used_b
-
-    return 0
+    return inventory.remaining(item_type)
+
+def touch_scene():
+    """장면이 바뀌었음을 표시 (다음 프레임에 빛을 처음부터 다시 추적)"""
+    global scene_version
+    scene_version += 1
+
+def place_object(obj):
+    """플레이어 오브젝트 배치 (인벤토리 갱신)"""
+    player_objects.append(obj)
+    touch_scene()
+    inventory.add(obj)
+    sfx.play("place")
+
+def remove_object(obj):
+    """플레이어 오브젝트 삭제 (인벤토리 갱신)"""
+    player_objects.remove(obj)
+    inventory.remove(obj)
+    touch_scene()
+
+def clear_player_objects():
+    """배치한 오브젝트 전부 삭제"""
+    player_objects.clear()
+    inventory.clear()
+    touch_scene()
 
 # --- 레벨 로드 ---
-def load_level(filename):
-    """JSON 파일에서 레벨 불러오기"""
+def load_level(filename, play_bgm=True):
+    """JSON 파일에서 레벨 불러오기 (play_bgm=False: 썸네일 렌더링 등 BGM 없이 로드)"""
     global emitters, targets, mirrors, lenses, portals_a, portals_b, blackholes, player_objects
+    global level_limits, level_hint, static_layer, animator, anim_time, anim_clock, moving_blackholes
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        # 컴파일된 씬 (v1은 그리드 스냅, v2는 칸 좌표 변환 완료, 캐시 사용)
+        scene = load_scene(filename, (GRID_SIZE, GRID_OFFSET_X, GRID_OFFSET_Y))
         
         # 고정 오브젝트만 로드 (발사장치, 목표지점)
         emitters.clear()
@@ -181,38 +283,46 @@ def load_level(filename):
         portals_a.clear()
         portals_b.clear()
         blackholes.clear()
-        player_objects.clear()
+        clear_player_objects()
 
         # 발사장치와 목표지점만 로드 (플레이어가 배치할 수 없음)
-        for e in data.get("emitters", []):
-            gx, gy = snap_to_grid(e["x"], e["y"])
-            emitters.append(Emitter(gx, gy, e.get("color","white"), e.get("angle",0)))
-        for t in data.get("targets", []):
-            gx, gy = snap_to_grid(t["x"], t["y"])
-            targets.append(Target(gx, gy, t.get("color","white")))
+        for x, y, color, angle in scene["emitters"]:
+            emitters.append(Emitter(x, y, color, angle))
+        for x, y, color in scene["targets"]:
+            targets.append(Target(x, y, color))
             
         # 거울, 렌즈 로드
-        for m in data.get("mirrors", []):
-            gx, gy = snap_to_grid(m["x"], m["y"])
-            mirrors.append(Mirror(gx, gy, m.get("angle",0)))
-        for l in data.get("lenses", []):
-            gx, gy = snap_to_grid(l["x"], l["y"])
-            lenses.append(Lens(gx, gy, l.get("angle",0)))
-        for p in data.get("portals_a", []):
-            gx, gy = snap_to_grid(p["x"], p["y"])
-            portals_a.append(Portal(gx, gy, 'A'))
-        for p in data.get("portals_b", []):
-            gx, gy = snap_to_grid(p["x"], p["y"])
-            portals_b.append(Portal(gx, gy, 'B'))
+        for x, y, angle in scene["mirrors"]:
+            mirrors.append(Mirror(x, y, angle))
+        for x, y, angle in scene["lenses"]:
+            lenses.append(Lens(x, y, angle))
+        for x, y in scene["portals_a"]:
+            portals_a.append(Portal(x, y, 'A'))
+        for x, y in scene["portals_b"]:
+            portals_b.append(Portal(x, y, 'B'))
         
         # 블랙홀 로드
-        for b in data.get("blackholes", []):
-            gx, gy = snap_to_grid(b["x"], b["y"])
-            blackholes.append(Blackhole(gx, gy))
+        for x, y in scene["blackholes"]:
+            blackholes.append(Blackhole(x, y))
+
+        # 움직이는 오브젝트 (시간 0의 상태로 시작)
+        animator = Animator(scene["behaviours"], NAMED_LISTS)
+        anim_time, anim_clock = 0.0, None
+        animator.update(anim_time)
+        moving_blackholes = [blackholes[i] for i in sorted(animator.moving("blackholes"))]
+        touch_scene()
+
+        # 레벨 제한/안내 (레벨 파일에 기록된 값, 없으면 제한 없음)
+        level_limits = dict(DEFAULT_LIMITS)
+        level_limits.update(scene["limits"] or {})
+        level_hint = scene["meta"].get("hint", "")
+        inventory.reset(level_limits)
+        static_layer = get_static_layer(scene)
         
         # --- BGM 재생 호출 추가 --- ### 👈 여기가 핵심입니다!
-        map_idx = data.get("map_index", 0)
-        play_bgm_for_map(map_idx)
+        map_idx = scene["map_index"]
+        if play_bgm:
+            play_bgm_for_map(map_idx, scene["meta"])
 
         print(f"레벨 로드 완료: {filename}")
         print(f"발사장치: {len(emitters)}개, 목표지점: {len(targets)}개")
@@ -221,122 +331,87 @@ def load_level(filename):
     except Exception as e:
         print(f"레벨 로드 실패: {e}")
 
-def get_level_info():
-    """레벨별 안내 메시지 반환"""
-    if "level_0.json" in level_file:
-        return "🔸 레벨 0: 거울 2개만 사용 가능"
-    elif "level_1.json" in level_file:
-        return "🔸 레벨 1: 렌즈 2개만 사용 가능"
-    else:
-        return ""
-
-# --- 빛 시뮬레이션 ---
-def simulate_light(surface):
-    """빛의 경로를 시뮬레이션"""
-    MAX_STEPS = 20000
-    MAX_BOUNCES = 64
-    NUDGE = 2.0
-
-    for t in targets:
-        t.hit = False
-
-    # 플레이어가 배치한 오브젝트로 임시 리스트 생성
-    temp_mirrors = list(mirrors) + [obj for obj in player_objects if isinstance(obj, Mirror)]
-    temp_lenses = list(lenses) + [obj for obj in player_objects if isinstance(obj, Lens)]
-    temp_portals_a = list(portals_a) + [obj for obj in player_objects if isinstance(obj, Portal) and obj.portal_type == 'A']
-    temp_portals_b = list(portals_b) + [obj for obj in player_objects if isinstance(obj, Portal) and obj.portal_type == 'B']
-    temp_blackholes = list(blackholes) + [obj for obj in player_objects if isinstance(obj, Blackhole)]
-
-    for emitter in emitters:
-        ray_queue = [(emitter.x, emitter.y, emitter.angle, emitter.color, set(), 0)]
-
-        while ray_queue:
-            x, y, angle, color_name, inside_lenses, bounces = ray_queue.pop(0)
-            steps = 0
-
-            while steps < MAX_STEPS:
-                steps += 1
-                x += math.cos(math.radians(angle))
-                y += math.sin(math.radians(angle))
+def start_level(filename, started=False):
+    """플레이 상태를 초기화하고 레벨 시작 (도구 선택/회전 대상/시뮬레이션 상태 리셋)"""
+    global level_file, game_started, object_mode, last_selected, was_complete, last_hits
+    level_file = filename
+    game_started = started
+    was_complete = False
+    last_hits = set()
+    object_mode = None
+    last_selected = None
+    print(f"📂 레벨 파일 로드 시도: {level_file}")
+    load_level(level_file)
 
-                if not (0 <= x < WIDTH and 0 <= y < HEIGHT):
-                    break
+# --- 빛 시뮬레이션 (광선 추적은 beam_front.py) ---
+beam_front = BeamFront()  # 진행형 추적 (매 프레임 조금씩 진행, 빛이 뻗어 나가는 애니메이션)
 
-                # 거울 반사
-                reflected = False
-                for m in temp_mirrors:
-                    if near(x, y, m.x, m.y):
-                        angle = angle_wrap(2 * m.angle - angle)
-                        x, y = advance(x, y, angle, NUDGE)
-                        bounces += 1
-                        reflected = True
-                        break
-                if reflected:
-                    if bounces > MAX_BOUNCES: break
-                    pygame.draw.circle(surface, COLORS[color_name], (int(x), int(y)), 2)
-
-                if not (0 <= x < WIDTH and 0 <= y < HEIGHT):
-                    break
+def current_scene():
+    """레벨 오브젝트 + 플레이어가 배치한 오브젝트를 배열 저장소로"""
+    return SceneStore.from_lists(NAMED_LISTS, (WIDTH, HEIGHT), player_objects)
 
-                # 렌즈: 45도 꺾기
-                bent = False
-                for lz in temp_lenses:
-                    lid = id(lz)
-                    dist = math.sqrt((x - lz.x)**2 + (y - lz.y)**2)
-                    if dist < 3 and lid not in inside_lenses:
-                        angle = angle_wrap(angle + 45)
-                        inside_lenses.add(lid)
-                        x, y = advance(x, y, angle, NUDGE)
-                        bounces += 1
-                        bent = True
-                        break
-                if bent:
-                    if bounces > MAX_BOUNCES: break
-                    pygame.draw.circle(surface, COLORS[color_name], (int(x), int(y)), 2)
-
-                for lz in temp_lenses:
-                    lid = id(lz)
-                    if lid in inside_lenses:
-                        dist = math.sqrt((x - lz.x)**2 + (y - lz.y)**2)
-                        if dist > RADIUS * 2:
-                            inside_lenses.remove(lid)
-
-                # 포탈
-                teleported = False
-                for pa in temp_portals_a:
-                    if near(x, y, pa.x, pa.y):
-                        if len(temp_portals_b) > 0:
-                            pb = temp_portals_b[0]
-                            x, y = pb.x, pb.y
-                            x, y = advance(x, y, angle, NUDGE * 2)
-                            teleported = True
-                            break
-                if teleported:
-                    pygame.draw.circle(surface, COLORS[color_name], (int(x), int(y)), 2)
-                    continue
-
-                # 블랙홀
-                absorbed = False
-                for bh in temp_blackholes:
-                    if near(x, y, bh.x, bh.y):
-                        absorbed = True
-                        break
-                if absorbed:
-                    break
+def simulate_light(surface):
+    """빛의 경로를 한 번에 끝까지 계산해서 surface에 그림 (썸네일 등)"""
+    _, hits = render_beam(current_scene(), surface)
+    for tid, t in enumerate(targets):
+        t.hit = tid in hits
+
+def update_animation():
+    """
+    움직이는 오브젝트를 경과 시간만큼 진행
+    빛을 추적 중이면 바뀐 오브젝트만 저장소에 반영하고, 그 근처를 지나는 광선만 다시 계산하게 함
+    """
+    global anim_time, anim_clock
+    if not animator:
+        return
+    now = time.perf_counter()
+    if headless or anim_clock is None:
+        dt = 1 / FPS  # 헤드리스는 프레임마다 같은 시간 (스냅샷이 항상 같도록)
+    else:
+        dt = min(now - anim_clock, MAX_ANIM_STEP)
+    anim_clock = now
+    anim_time += dt
+    changed = animator.update(anim_time)
+    if not changed or beam_front.version != scene_version:
+        return
 
-                # 목표 체크
-                for tg in targets:
-                    if near(x, y, tg.x, tg.y):
-                        if color_name == 'white':
-                            tg.hit = True
-                            pygame.draw.circle(surface, (255, 255, 0), (int(tg.x), int(tg.y)), RADIUS+6, 3)
-                            break
-                else:
-                    pygame.draw.circle(surface, COLORS[color_name], (int(x), int(y)), 2)
-                    if bounces > MAX_BOUNCES:
-                        break
-                    continue
-                break
+    scene = beam_front.scene
+    positions = []
+    portals_changed = False
+    for key, index, old in changed:
+        obj = NAMED_LISTS[key][index]
+        if scene.sync(scene.indices(LIST_KINDS[key])[index], obj):
+            portals_changed = True  # sync가 포탈 짝을 다시 연결함
+        positions.append(old)
+        positions.append((obj.x, obj.y))
+    if portals_changed:
+        # 포탈 B가 바뀌면 A에서 순간이동한 광선이 달라지므로 모든 A 근처도 다시 계산
+        positions += [(scene.x[i], scene.y[i]) for i in scene.indices(PORTAL_A)]
+    beam_front.invalidate(positions)
+
+def update_light(surface):
+    """
+    빛을 프레임 예산만큼 이어서 추적하고 그림 (장면이 바뀌었으면 처음부터)
+    헤드리스 실행은 스냅샷이 완성된 그림이 되도록 한 번에 끝까지 계산
+    한 번 끝까지 뻗은 뒤 움직이는 오브젝트 때문에 다시 계산하는 부분은 애니메이션 없이 바로 (시간 예산 안에서)
+    """
+    global last_hits
+    if beam_front.version != scene_version:
+        beam_front.start(current_scene(), scene_version)
+    if headless:
+        new_hits = beam_front.advance()
+    else:
+        steps = None if beam_front.settled else BEAM_SPEED
+        new_hits = beam_front.advance(steps=steps, budget_ms=BEAM_BUDGET_MS)
+
+    # 빛이 도달한 목표만 켜짐, 지난번 추적에서 맞지 않았던 목표에 새로 닿았을 때만 효과음
+    for tid, t in enumerate(targets):
+        t.hit = tid in beam_front.hits
+    if new_hits - last_hits:
+        sfx.play("hit")
+    if beam_front.done:
+        last_hits = set(beam_front.hits)
+    beam_front.draw(surface)
 
 def check_game_complete():
     """게임 완료 조건 체크"""
@@ -347,20 +422,227 @@ def check_game_complete():
             return False
     return True
 
+# --- 프레임 그리기 ---
+def draw_frame(surface):
+    """현재 상태를 주어진 Surface(화면 또는 오프스크린)에 그리기"""
+    global was_complete
+    # 배경 + 그리드 + 발사장치/블랙홀은 정적 레이어 한 번 blit
+    if static_layer is not None:
+        surface.blit(static_layer, (0, 0))
+    else:
+        surface.fill(BACKGROUND)
+        draw_grid(surface)
+
+    # 버튼 그리기
+    # 레벨별 안내 글상자
+    if level_hint:
+        draw_info_box(surface, level_hint)
+
+    limits = level_limits
+
+    for b in buttons:
+        # 레벨별 버튼 숨기기
+        if b == btn_mirror and limits.get("mirror", 0) == 0:
+            continue
+        if b == btn_lens and limits.get("lens", 0) == 0:
+            continue
+        if (b == btn_portal_a or b == btn_portal_b) and limits.get("portal", 0) == 0:
+            continue
+        b.draw(surface, FONT)
+    # 상태 표시
+    mode_text = f"선택 도구: {object_mode if object_mode else '없음'}  |  상태: {'실행중' if game_started else '대기'}"
+    surface.blit(FONT.render(mode_text, True, (230,230,230)), (20, 130))
+
+    # 안내 메시지
+    info = [
+        "좌클릭: 도구 배치 | 마우스 휠: 회전 | 지우개: 도구 삭제",
+        "목표: 발사장치에서 나온 빛이 목표지점에 도달하도록 도구 배치"
+    ]
+
+    for i, line in enumerate(info):
+        surface.blit(FONT.render(line, True, (180,180,180)), (20, 160 + i*22))
+
+    # 움직이는 오브젝트 진행
+    update_animation()
+
+    # 발사장치와 블랙홀 (정적 레이어가 없을 때만), 목표지점 (맞으면 모양이 바뀌므로 매 프레임)
+    if static_layer is None:
+        for e in emitters:
+            e.draw(surface)
+        for bh in blackholes:
+            bh.draw(surface)
+    else:
+        for bh in moving_blackholes:
+            bh.draw(surface)
+    for t in targets:
+        t.draw(surface)
+
+    # 레벨에 놓인 거울/렌즈/포탈 (회전하거나 깜빡일 수 있으므로 매 프레임)
+    for lst in (mirrors, lenses, portals_a, portals_b):
+        for obj in lst:
+            obj.draw(surface)
+
+    # 플레이어가 배치한 오브젝트
+    for obj in player_objects:
+        obj.draw(surface)
+
+    # 게임 시작 시 빛 시뮬레이션
+    if game_started:
+        update_light(surface)
+
+        complete = check_game_complete()
+        if complete:
+            complete_text = FONT_BIG.render("★ 퍼즐 완료! ★", True, (255, 255, 0))
+            complete_rect = complete_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+            bg_rect = complete_rect.inflate(40, 20)
+            pygame.draw.rect(surface, (0, 100, 0), bg_rect, border_radius=10)
+            pygame.draw.rect(surface, (255, 255, 0), bg_rect, 3, border_radius=10)
+            surface.blit(complete_text, complete_rect)
+
+        # 완료된 순간에만 효과음 (중단했다가 다시 시작해도 반복하지 않음)
+        # 편집 후 빛이 다시 뻗어 나가는 동안(아직 목표에 닿기 전)은 완료 상태를 유지
+        if complete and not was_complete:
+            sfx.play("complete")
+        if complete or beam_front.done:
+            was_complete = complete
+    else:
+        beam_front.reset()
+
+# --- 이벤트 처리 ---
+def handle_event(event):
+    """이벤트 하나 처리 (False를 반환하면 레벨 화면 종료: 창 닫기/메뉴로)"""
+    global object_mode, game_started, last_selected
+    if event.type == pygame.QUIT:
+        return False
+
+    elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+        mx, my = event.pos
+
+        # 버튼 처리
+        if btn_start.is_clicked((mx, my)):
+            game_started = True
+            return True
+        if btn_stop.is_clicked((mx, my)):
+            game_started = False
+            return True
+        if btn_clear.is_clicked((mx, my)):
+            clear_player_objects()
+            game_started = False
+            object_mode = None
+            return True
+        if btn_back.is_clicked((mx, my)):
+            return False
+
+        if btn_mirror.is_clicked((mx, my)):
+            if get_remaining_count("mirror") > 0:
+                object_mode = 'mirror'
+            return True
+
+        if btn_lens.is_clicked((mx, my)):
+            if get_remaining_count("lens") > 0:
+                object_mode = 'lens'
+            return True
+
+        if btn_portal_a.is_clicked((mx, my)):
+            if get_remaining_count("portal_a") > 0:
+                object_mode = 'portal_a'
+            return True
+
+        if btn_portal_b.is_clicked((mx, my)):
+            if get_remaining_count("portal_b") > 0:
+                object_mode = 'portal_b'
+            return True
+
+
+        if btn_eraser.is_clicked((mx, my)):
+            object_mode = 'eraser'
+            return True
+
+        # 오브젝트 배치/삭제
+        gx, gy = snap_to_grid(mx, my)
+
+        # 격자 범위 체크 (GRID_OFFSET_Y=300 ~ HEIGHT=720)
+        if gy < GRID_OFFSET_Y or gy >= HEIGHT or gx < GRID_OFFSET_X or gx >= WIDTH:
+            return True  # 격자 바깥이면 무시
+
+        if object_mode == 'mirror':
+            if get_remaining_count("mirror") > 0:
+                obj = Mirror(gx, gy, 45)
+                place_object(obj)
+                last_selected = obj
+            else:
+                print("거울을 더 이상 배치할 수 없습니다!")
+
+        elif object_mode == 'lens':
+            if get_remaining_count("lens") > 0:
+                obj = Lens(gx, gy, 0)
+                place_object(obj)
+                last_selected = obj
+            else:
+                print("렌즈를 더 이상 배치할 수 없습니다!")
+
+        elif object_mode == 'portal_a':
+            if get_remaining_count("portal_a") > 0:
+                obj = Portal(gx, gy, 'A')
+                place_object(obj)
+                last_selected = obj
+            else:
+                print("포탈 A를 더 이상 배치할 수 없습니다!")
+
+        elif object_mode == 'portal_b':
+            if get_remaining_count("portal_b") > 0:
+                obj = Portal(gx, gy, 'B')
+                place_object(obj)
+                last_selected = obj
+            else:
+                print("포탈 B를 더 이상 배치할 수 없습니다!")
+
+        elif object_mode == 'eraser':
+            for obj in player_objects[:]:
+                if hasattr(obj, 'x') and hasattr(obj, 'y') and near(mx, my, obj.x, obj.y):
+                    remove_object(obj)
+                    break
+
+    elif event.type == pygame.MOUSEWHEEL and last_selected is not None:
+        if isinstance(last_selected, (Mirror, Emitter)):
+            last_selected.rotate()
+            touch_scene()
+            sfx.play("rotate")
+        elif isinstance(last_selected, Lens):
+            last_selected.angle = angle_wrap(last_selected.angle + event.y * 5)
+            touch_scene()
+            sfx.play("rotate")
+
+    return True
+
 # --- 메인 ---
-def main():
-    global object_mode, game_started, player_objects, level_file
-    
+def parse_args(argv=None):
+    """명령행 인자 파싱 (레벨 파일, 헤드리스 실행 옵션)"""
+    parser = argparse.ArgumentParser(description="광학 퍼즐 게임 - 레벨 플레이")
+    parser.add_argument("level", nargs="?", default="level_0.json", help="레벨 JSON 파일")
+    parser.add_argument("--headless", action="store_true",
+                        help="창 없이 오프스크린으로 실행 (환경 변수 BYEOLMURI_HEADLESS=1과 동일)")
+    parser.add_argument("--frames", type=int, default=None,
+                        help="지정한 프레임 수만큼 실행 후 종료 (헤드리스 기본값 1)")
+    parser.add_argument("--snapshot", default=None, help="마지막 프레임을 저장할 이미지 경로")
+    parser.add_argument("--start", action="store_true", help="빛 시뮬레이션을 켠 상태로 시작")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    args.headless = args.headless or is_headless([])
+    if args.headless and args.frames is None:
+        args.frames = 1
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # 화면/폰트 생성 (임포트 시점이 아니라 실행 시점에 초기화)
+    init_display(args.headless)
+
     # --- 오디오 초기화 호출 추가 --- ### 👈 여기도 핵심입니다!
     init_audio()
 
     # 레벨 파일 로드
-    if len(sys.argv) > 1:
-        level_file = sys.argv[1]
-    else:
-        level_file = "level_0.json"
-    print(f"📂 레벨 파일 로드 시도: {level_file}")
-    load_level(level_file)
+    start_level(args.level, args.start)
     
     print(f"✅ 발사장치: {len(emitters)}개")
     print(f"✅ 목표지점: {len(targets)}개")
@@ -373,193 +655,30 @@ def main():
         print(f"   목표지점 위치: ({targets[0].x}, {targets[0].y})")
 
     running = True
-    last_selected = None
+    frame_count = 0
 
     while running:
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+            if not handle_event(event):
                 running = False
 
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mx, my = event.pos
-
-                # 버튼 처리
-                if btn_start.is_clicked((mx, my)):
-                    game_started = True
-                    continue
-                if btn_stop.is_clicked((mx, my)):
-                    game_started = False
-                    continue
-                if btn_clear.is_clicked((mx, my)):
-                    player_objects.clear()
-                    game_started = False
-                    object_mode = None
-                    continue
-                if btn_back.is_clicked((mx, my)):
-                    running = False
-                    continue
-
-                if btn_mirror.is_clicked((mx, my)):
-                    if get_remaining_count("mirror") > 0:
-                        object_mode = 'mirror'
-                    continue
-                    
-                if btn_lens.is_clicked((mx, my)):
-                    if get_remaining_count("lens") > 0:
-                        object_mode = 'lens'
-                    continue
-                    
-                if btn_portal_a.is_clicked((mx, my)):
-                    if get_remaining_count("portal_a") > 0:
-                        object_mode = 'portal_a'
-                    continue
-
-                if btn_portal_b.is_clicked((mx, my)):
-                    if get_remaining_count("portal_b") > 0:
-                        object_mode = 'portal_b'
-                    continue
-
-
-                if btn_eraser.is_clicked((mx, my)):
-                    object_mode = 'eraser'
-                    continue
-
-                # 오브젝트 배치/삭제
-                gx, gy = snap_to_grid(mx, my)
-                
-                # 격자 범위 체크 (GRID_OFFSET_Y=300 ~ HEIGHT=720)
-                if gy < GRID_OFFSET_Y or gy >= HEIGHT or gx < GRID_OFFSET_X or gx >= WIDTH:
-                    continue  # 격자 바깥이면 무시
-                
-                if object_mode == 'mirror':
-                    if get_remaining_count("mirror") > 0:
-                        obj = Mirror(gx, gy, 45)
-                        player_objects.append(obj)
-                        last_selected = obj
-                    else:
-                        print("거울을 더 이상 배치할 수 없습니다!")
-                        
-                elif object_mode == 'lens':
-                    if get_remaining_count("lens") > 0:
-                        obj = Lens(gx, gy, 0)
-                        player_objects.append(obj)
-                        last_selected = obj
-                    else:
-                        print("렌즈를 더 이상 배치할 수 없습니다!")
-                        
-                elif object_mode == 'portal_a':
-                    if get_remaining_count("portal_a") > 0:
-                        obj = Portal(gx, gy, 'A')
-                        player_objects.append(obj)
-                        last_selected = obj
-                    else:
-                        print("포탈 A를 더 이상 배치할 수 없습니다!")
-                        
-                elif object_mode == 'portal_b':
-                    if get_remaining_count("portal_b") > 0:
-                        obj = Portal(gx, gy, 'B')
-                        player_objects.append(obj)
-                        last_selected = obj
-                    else:
-                        print("포탈 B를 더 이상 배치할 수 없습니다!")
-
-                elif object_mode == 'eraser':
-                    for obj in player_objects[:]:
-                        if hasattr(obj, 'x') and hasattr(obj, 'y') and near(mx, my, obj.x, obj.y):
-                            player_objects.remove(obj)
-                            break
-
-            elif event.type == pygame.MOUSEWHEEL and last_selected is not None:
-                if isinstance(last_selected, (Mirror, Emitter)):
-                    last_selected.rotate()
-                elif isinstance(last_selected, Lens):
-                    last_selected.angle = angle_wrap(last_selected.angle + event.y * 5)
-
-        # 그리기
-        screen.fill((30, 30, 30))
-        
-        # 그리드 그리기
-        draw_grid(screen)
-
-     # 버튼에 남은 개수 업데이트
-        btn_mirror.count = get_remaining_count("mirror")
-        btn_lens.count = get_remaining_count("lens")
-        btn_portal_a.count = get_remaining_count("portal_a")
-        btn_portal_b.count = get_remaining_count("portal_b")
-
-        # 버튼 그리기
-        # 레벨별 안내 글상자
-        level_name = os.path.basename(level_file)
-        info_messages = {
-            "level_0.json": "🔸 거울 2개만 사용 가능",
-            "level_1.json": "🔸 렌즈 2개만 사용 가능",
-            "level_2.json": "🔸 거울 1개, 렌즈 1개 사용 가능",
-            "level_3.json": "🔸 거울 1개, 렌즈 2개 사용 가능",
-            "level_4.json": "🔸 거울 0개, 렌즈 1개, 포탈 1쌍 사용 가능",
-            "level_5.json": "🔸 렌즈 3개, 포탈 1쌍 사용 가능",
-            "level_6.json": "🔸 거울 1개, 렌즈 2개, 포탈 1쌍 사용 가능",
-            "level_7.json": "🔸 거울 3개, 렌즈 1개, 포탈 1쌍 사용 가능",
-        }
-
-        if level_name in info_messages:
-            draw_info_box(screen, info_messages[level_name])
-        
-        limits = LEVEL_LIMITS.get(level_name, {})
-
-        for b in buttons:
-            # 레벨별 버튼 숨기기
-            if b == btn_mirror and limits.get("mirror", 0) == 0:
-                continue
-            if b == btn_lens and limits.get("lens", 0) == 0:
-                continue
-            if (b == btn_portal_a or b == btn_portal_b) and limits.get("portal", 0) == 0:
-                continue
-            b.draw(screen, FONT)
-        # 상태 표시
-        mode_text = f"선택 도구: {object_mode if object_mode else '없음'}  |  상태: {'실행중' if game_started else '대기'}"
-        screen.blit(FONT.render(mode_text, True, (230,230,230)), (20, 130))
-
-        # 안내 메시지
-        info = [
-            "좌클릭: 도구 배치 | 마우스 휠: 회전 | 지우개: 도구 삭제",
-            "목표: 발사장치에서 나온 빛이 목표지점에 도달하도록 도구 배치"
-        ]
-        
-        for i, line in enumerate(info):
-            screen.blit(FONT.render(line, True, (180,180,180)), (20, 160 + i*22))
+        draw_frame(screen)
+        present(headless)
 
-        # 발사장치와 목표지점 (고정)
-        for e in emitters:
-            e.draw(screen)
-        for t in targets:
-            t.draw(screen)
+        # 헤드리스 실행: 지정 프레임 수만큼만 진행
+        frame_count += 1
+        if args.frames is not None and frame_count >= args.frames:
+            running = False
+        if not headless:
+            clock.tick(FPS)
 
-        # 블랙홀 그리기
-        for bh in blackholes:
-            bh.draw(screen)
+    if args.snapshot:
+        save_frame(screen, args.snapshot)
 
-        # 플레이어가 배치한 오브젝트
-        for obj in player_objects:
-            obj.draw(screen)
-
-        # 게임 시작 시 빛 시뮬레이션
-        if game_started:
-            simulate_light(screen)
-            
-            if check_game_complete():
-                complete_text = FONT_BIG.render("★ 퍼즐 완료! ★", True, (255, 255, 0))
-                complete_rect = complete_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-                bg_rect = complete_rect.inflate(40, 20)
-                pygame.draw.rect(screen, (0, 100, 0), bg_rect, border_radius=10)
-                pygame.draw.rect(screen, (255, 255, 0), bg_rect, 3, border_radius=10)
-                screen.blit(complete_text, complete_rect)
-
-        pygame.display.flip()
-        clock.tick(FPS)
-    
     # 종료 시 정리
     try:
-        pygame.mixer.music.stop()
+        bgm.shutdown()
+        sfx.unload()
         pygame.mixer.quit()
     except:
         pass
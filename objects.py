@@ -7,11 +7,16 @@
 - Prism: 프리즘 (분광)
 - Blackhole: 블랙홀 (흡수)
 - Button: UI 버튼
+
+장면 오브젝트는 __slots__로 인스턴스 dict 없이 저장 (큰 맵에서 메모리 절약)
+빛 계산용 배열 저장소는 scene_store.py
 """
 
 import pygame
 import math
 
+from fonts import get_font
+
 # 상수
 RADIUS = 10  # 공통 반경(충돌/선택) - 그리드 크기에 맞춰 조정
 
@@ -52,6 +57,8 @@ class Button:
 
 class Emitter:
     """빛 발사 장치 (흰색 빛) - 상하좌우 4방향만 가능 (0, 90, 180, 270도)"""
+    __slots__ = ("x", "y", "color", "angle")
+
     def __init__(self, x, y, color='white', angle=0):
         self.x, self.y, self.color = x, y, color
         self.angle = self.snap_angle(angle)
@@ -78,6 +85,8 @@ class Emitter:
 
 class Target:
     """목표 지점 (흰색)"""
+    __slots__ = ("x", "y", "color", "hit")
+
     def __init__(self, x, y, color='white'):
         self.x, self.y, self.color = x, y, color
         self.hit = False  # 빛을 받았는지 여부
@@ -92,6 +101,8 @@ class Target:
 
 class ColorTarget:
     """색상 목표 지점 (R, G, B 중 하나)"""
+    __slots__ = ("x", "y", "color", "hit")
+
     def __init__(self, x, y, color):
         self.x, self.y, self.color = x, y, color
         self.hit = False  # 빛을 받았는지 여부
@@ -109,9 +120,12 @@ class ColorTarget:
 
 class Mirror:
     """거울 (반사) - 대각선 4방향만 가능 (45, 135, 225, 315도)"""
+    __slots__ = ("x", "y", "angle", "behaviour")
+
     def __init__(self, x, y, angle=45):
         self.x, self.y = x, y
         self.angle = self.snap_angle(angle)
+        self.behaviour = None  # 레벨의 움직임 설정 (종류, 파라미터) - 에디터에서 오브젝트와 함께 이동/저장
     
     def snap_angle(self, angle):
         """각도를 대각선 4방향 중 가장 가까운 각도로 스냅 (45, 135, 225, 315)"""
@@ -138,6 +152,8 @@ class Mirror:
 
 class Lens:
     """렌즈 - 빛을 45도 꺾음"""
+    __slots__ = ("x", "y", "angle")
+
     def __init__(self, x, y, angle=0):
         self.x, self.y, self.angle = x, y, angle
     
@@ -148,6 +164,8 @@ class Lens:
 
 class Prism:
     """프리즘 (분광)"""
+    __slots__ = ("x", "y", "angle")
+
     def __init__(self, x, y, angle=0):
         self.x, self.y, self.angle = x, y, angle
     
@@ -166,8 +184,11 @@ class Prism:
 
 class Blackhole:
     """블랙홀 (흡수)"""
+    __slots__ = ("x", "y", "behaviour")
+
     def __init__(self, x, y):
         self.x, self.y = x, y
+        self.behaviour = None  # 레벨의 움직임 설정 (Mirror 참고)
     
     def draw(self, surf):
         pygame.draw.circle(surf, (0, 0, 0), (int(self.x), int(self.y)), RADIUS, 0)
@@ -176,17 +197,27 @@ class Blackhole:
 
 class Portal:
     """포탈 - 입구(A)와 출구(B)"""
+    __slots__ = ("x", "y", "portal_type", "active", "behaviour")
+
     def __init__(self, x, y, portal_type='A'):
         self.x, self.y = x, y
         self.portal_type = portal_type  # 'A' (입구) 또는 'B' (출구)
+        self.active = True  # 꺼진 포탈은 빛을 보내거나 받지 않음 (레벨의 toggle 설정)
+        self.behaviour = None  # 레벨의 움직임 설정 (Mirror 참고)
     
     def draw(self, surf):
-        if self.portal_type == 'A':
+        if not self.active:
+            # 꺼진 포탈 - 회색 테두리와 글자만
+            pygame.draw.circle(surf, (90, 90, 90), (int(self.x), int(self.y)), RADIUS, 2)
+            font = get_font(16, "Arial", bold=True)
+            text = font.render(self.portal_type, True, (90, 90, 90))
+            surf.blit(text, text.get_rect(center=(int(self.x), int(self.y))))
+        elif self.portal_type == 'A':
             # 입구 포탈 - 파란색
             pygame.draw.circle(surf, (0, 150, 255), (int(self.x), int(self.y)), RADIUS, 0)
             pygame.draw.circle(surf, (0, 100, 200), (int(self.x), int(self.y)), RADIUS, 3)
             # A 텍스트
-            font = pygame.font.SysFont("Arial", 16, bold=True)
+            font = get_font(16, "Arial", bold=True)
             text = font.render("A", True, (255, 255, 255))
             text_rect = text.get_rect(center=(int(self.x), int(self.y)))
             surf.blit(text, text_rect)
@@ -195,7 +226,7 @@ class Portal:
             pygame.draw.circle(surf, (255, 150, 0), (int(self.x), int(self.y)), RADIUS, 0)
             pygame.draw.circle(surf, (200, 100, 0), (int(self.x), int(self.y)), RADIUS, 3)
             # B 텍스트
-            font = pygame.font.SysFont("Arial", 16, bold=True)
+            font = get_font(16, "Arial", bold=True)
             text = font.render("B", True, (255, 255, 255))
             text_rect = text.get_rect(center=(int(self.x), int(self.y)))
             surf.blit(text, text_rect)
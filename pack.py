@@ -0,0 +1,277 @@
+"""
+팩 파일 (레벨 + 에셋을 하나로 묶은 아카이브)
+- 헤더 + 인덱스(이름 -> 오프셋/크기) + 압축하지 않은 데이터
+- 실행 시 mmap으로 열어서 이름으로 바로 읽기 (파일마다 경로 조회/열기 없음)
+- 팩이 없거나 팩에 없는 이름은 개발 중 편의를 위해 낱개 파일로 대체
+- 팩을 만든 뒤 저장된 낱개 파일(팩보다 새롭거나 크기가 다름)도 낱개 파일 우선 (에디터 저장이 묻히지 않음)
+
+파일 구조 (리틀 엔디언):
+    헤더:   MAGIC "BMPK" | version u16 | reserved u16 | count u32
+    인덱스: (name_len u16 | name utf-8 | offset u64 | size u64) * count
+    데이터: 각 파일 내용 (offset은 파일 처음 기준)
+
+사용법:
+    python pack.py build                  # 기본 구성으로 byeolmuri.pak 생성
+    python pack.py build -o out.pak a b   # 지정한 파일/폴더만 묶기
+    python pack.py list [byeolmuri.pak]   # 팩 내용 보기
+"""
+
+import io
+import os
+import sys
+import glob
+import mmap
+import struct
+import fnmatch
+import argparse
+
+# 상수
+MAGIC = b"BMPK"
+PACK_VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+ENTRY_HEAD = struct.Struct("<H")
+ENTRY_TAIL = struct.Struct("<QQ")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PACK = os.path.join(BASE_DIR, "byeolmuri.pak")
+
+# 기본 팩 구성 (BASE_DIR 기준 glob 패턴)
+DEFAULT_PATTERNS = [
+    "level_*.json",
+    "levels_index.json",
+    "picture/*",
+    "assets/bgm/*.mp3",
+]
+
+
+def normalize_name(name):
+    """팩 안의 이름 형식으로 변환 (슬래시 구분, 앞의 ./ 제거)"""
+    name = name.replace("\\", "/")
+    while name.startswith("./"):
+        name = name[2:]
+    return name
+
+
+class PackFile:
+    """mmap으로 연 팩 파일 (읽기 전용)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 빈 파일은 mmap할 수 없음
+            self._file.close()
+            raise ValueError(f"빈 팩 파일입니다: {path}")
+        self.index = self._read_index()
+
+    def _read_index(self):
+        mm = self._mm
+        magic, version, _, count = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"팩 파일 형식이 아닙니다: {self.path}")
+        if version != PACK_VERSION:
+            raise ValueError(f"지원하지 않는 팩 버전입니다: {version}")
+
+        index = {}
+        pos = HEADER.size
+        for _ in range(count):
+            (name_len,) = ENTRY_HEAD.unpack_from(mm, pos)
+            pos += ENTRY_HEAD.size
+            name = bytes(mm[pos:pos + name_len]).decode("utf-8")
+            pos += name_len
+            offset, size = ENTRY_TAIL.unpack_from(mm, pos)
+            pos += ENTRY_TAIL.size
+            index[name] = (offset, size)
+        return index
+
+    def __contains__(self, name):
+        return normalize_name(name) in self.index
+
+    def names(self):
+        return list(self.index.keys())
+
+    def view(self, name):
+        """복사 없이 내용을 가리키는 memoryview (팩을 닫기 전까지만 유효)"""
+        offset, size = self.index[normalize_name(name)]
+        return memoryview(self._mm)[offset:offset + size]
+
+    def read(self, name):
+        """내용을 bytes로 읽기"""
+        offset, size = self.index[normalize_name(name)]
+        return self._mm[offset:offset + size]
+
+    def close(self):
+        try:
+            self._mm.close()
+        except BufferError:
+            # 아직 살아 있는 memoryview가 있으면 프로세스 종료 시 정리됨
+            pass
+        self._file.close()
+
+
+def write_pack(out_path, files):
+    """
+    팩 파일 생성
+
+    Parameters:
+        out_path: 만들 팩 경로
+        files: [(팩 안 이름, 실제 경로)]
+    """
+    files = [(normalize_name(name), path) for name, path in files]
+    names = [name.encode("utf-8") for name, _ in files]
+    sizes = [os.path.getsize(path) for _, path in files]
+
+    index_size = sum(ENTRY_HEAD.size + len(n) + ENTRY_TAIL.size for n in names)
+    offset = HEADER.size + index_size
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, PACK_VERSION, 0, len(files)))
+        for name, size in zip(names, sizes):
+            f.write(ENTRY_HEAD.pack(len(name)))
+            f.write(name)
+            f.write(ENTRY_TAIL.pack(offset, size))
+            offset += size
+        for _, path in files:
+            with open(path, "rb") as src:
+                f.write(src.read())
+    os.replace(tmp_path, out_path)
+    print(f"팩 생성 완료: {out_path} ({len(files)}개 파일, {offset} bytes)")
+
+
+class AssetStore:
+    """
+    에셋 읽기 (팩 우선, 없거나 낱개 파일이 더 새로우면 낱개 파일)
+
+    이름은 BASE_DIR 기준 상대 경로 ("level_0.json", "assets/bgm/경쾌한 BGM.mp3")
+    """
+
+    def __init__(self, base_dir=BASE_DIR, pack_path=DEFAULT_PACK):
+        self.base_dir = base_dir
+        self.pack = None
+        self.pack_mtime_ns = 0
+        if pack_path and os.path.isfile(pack_path):
+            try:
+                self.pack = PackFile(pack_path)
+                self.pack_mtime_ns = os.stat(pack_path).st_mtime_ns
+                print(f"📦 팩 파일 사용: {pack_path} ({len(self.pack.index)}개 항목)")
+            except Exception as e:
+                print(f"[팩] 팩 파일 열기 실패, 낱개 파일 사용: {e}")
+
+    def relname(self, path):
+        """실제 경로/상대 경로를 팩 이름으로 변환 (BASE_DIR 밖이면 None)"""
+        if not os.path.isabs(path):
+            return normalize_name(path)
+        rel = os.path.relpath(path, self.base_dir)
+        if rel.startswith(".."):
+            return None
+        return normalize_name(rel)
+
+    def loose_is_newer(self, path):
+        """
+        낱개 파일이 팩 항목보다 우선인지 (팩을 만든 뒤 저장/추가된 파일)
+        - 팩에 없는 이름이거나, 팩 파일보다 mtime이 늦거나, 크기가 팩 항목과 다르면 True
+        - 배포 빌드처럼 낱개 파일이 없으면 False
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        name = self.relname(path)
+        if self.pack is None or name is None or name not in self.pack:
+            return True
+        return st.st_mtime_ns > self.pack_mtime_ns or st.st_size != self.pack.index[name][1]
+
+    def in_pack(self, path):
+        """팩에서 읽을 이름인지 (팩에 있고 낱개 파일이 더 새롭지 않음)"""
+        name = self.relname(path)
+        return (self.pack is not None and name is not None and name in self.pack
+                and not self.loose_is_newer(path))
+
+    def exists(self, path):
+        """팩 또는 낱개 파일로 존재하는지 확인"""
+        return self.in_pack(path) or os.path.exists(path)
+
+    def read_bytes(self, path):
+        """내용을 bytes로 읽기 (팩 -> 낱개 파일 순, 낱개 상대 경로는 현재 폴더 기준)"""
+        if self.in_pack(path):
+            return self.pack.read(self.relname(path))
+        with open(path, "rb") as f:
+            return f.read()
+
+    def open_stream(self, path):
+        """파일 객체 반환 (pygame.image.load, mixer.music.load 등에 전달)"""
+        if self.in_pack(path):
+            return io.BytesIO(self.pack.read(self.relname(path)))
+        return open(path, "rb")
+
+    def list_names(self, pattern):
+        """팩 안에서 glob 패턴과 맞는 이름 목록 (팩이 없으면 빈 리스트)"""
+        if self.pack is None:
+            return []
+        return sorted(n for n in self.pack.names() if fnmatch.fnmatch(n, pattern))
+
+
+_store = None
+
+
+def get_store():
+    """공용 AssetStore (처음 호출할 때 생성)"""
+    global _store
+    if _store is None:
+        _store = AssetStore()
+    return _store
+
+
+def collect_files(patterns, base_dir=BASE_DIR):
+    """glob 패턴/경로 목록을 [(팩 안 이름, 실제 경로)]로 변환"""
+    paths = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(os.path.join(base_dir, pattern))):
+            if os.path.isdir(path):
+                for root, _, names in os.walk(path):
+                    paths.extend(os.path.join(root, n) for n in sorted(names))
+            elif os.path.isfile(path):
+                paths.append(path)
+
+    files = []
+    seen = set()
+    for path in paths:
+        name = normalize_name(os.path.relpath(path, base_dir))
+        if name not in seen:
+            seen.add(name)
+            files.append((name, path))
+    return files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="팩 파일 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="팩 파일 생성")
+    p_build.add_argument("paths", nargs="*", help="묶을 파일/폴더/glob (기본 구성: 레벨, 카탈로그, 썸네일, BGM)")
+    p_build.add_argument("-o", "--output", default=DEFAULT_PACK, help="출력 팩 경로")
+
+    p_list = sub.add_parser("list", help="팩 내용 보기")
+    p_list.add_argument("pack", nargs="?", default=DEFAULT_PACK)
+
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    if args.command == "build":
+        if not args.paths:
+            # 카탈로그를 최신 상태로 만든 뒤 함께 묶음
+            from catalog import load_catalog
+            load_catalog(BASE_DIR)
+        files = collect_files(args.paths or DEFAULT_PATTERNS)
+        write_pack(args.output, files)
+    else:
+        pack = PackFile(args.pack)
+        for name, (offset, size) in pack.index.items():
+            print(f"{offset:>10} {size:>10}  {name}")
+        pack.close()
+
+
+if __name__ == "__main__":
+    main()
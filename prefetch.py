@@ -0,0 +1,69 @@
+"""
+백그라운드 프리페치
+- 레벨 N을 플레이하는 동안 N+1을, 메뉴에서는 마우스를 올린 레벨을 작업 스레드에서 미리 준비
+- 준비 항목: 컴파일된 씬(level_cache 메모리 캐시), 정적 레이어, 디코딩한 BGM(audio.py 작업 스레드), 썸네일
+- 이미 준비했거나 준비 중인 레벨은 다시 요청하지 않음 (실패한 레벨만 다시 시도)
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import level_play
+from level_cache import load_scene
+from pack import get_store
+from thumbnails import generate_thumbnails
+
+# 상수
+PLAY_GRID = (level_play.GRID_SIZE, level_play.GRID_OFFSET_X, level_play.GRID_OFFSET_Y)
+PREFETCH_WORKERS = 1
+
+
+def warm_level(level_path, entry=None):
+    """
+    레벨 하나를 미리 준비 (작업 스레드에서 실행)
+
+    Parameters:
+        level_path: 레벨 JSON 경로
+        entry: 카탈로그 항목 (있으면 썸네일도 준비)
+    """
+    scene = load_scene(level_path, PLAY_GRID)
+    level_play.get_static_layer(scene)
+
+    bgm_path = level_play.get_bgm_path(scene["map_index"], scene["meta"])
+    if get_store().exists(bgm_path):
+        level_play.bgm.prepare(bgm_path)
+
+    if entry is not None:
+        generate_thumbnails([entry], os.path.dirname(os.path.abspath(level_path)))
+    return level_path
+
+
+class Prefetcher:
+    """레벨 프리페치 작업 관리 (메인 스레드에서 호출)"""
+
+    def __init__(self, workers=PREFETCH_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self.jobs = {}  # 절대 경로 -> Future
+
+    def prefetch_level(self, level_path, entry=None):
+        """아직 준비하지 않은 레벨이면 백그라운드 준비 요청"""
+        key = os.path.abspath(level_path)
+        job = self.jobs.get(key)
+        if job is not None and not (job.done() and job.exception() is not None):
+            return job
+        job = self.executor.submit(warm_level, key, entry)
+        job.add_done_callback(self._report)
+        self.jobs[key] = job
+        return job
+
+    def is_ready(self, level_path):
+        job = self.jobs.get(os.path.abspath(level_path))
+        return job is not None and job.done() and job.exception() is None
+
+    @staticmethod
+    def _report(job):
+        if not job.cancelled() and job.exception() is not None:
+            print(f"[프리페치] 레벨 준비 실패: {job.exception()}")
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,93 @@
+"""
+실행 환경 설정
+- 헤드리스 모드 판별 (환경 변수 BYEOLMURI_HEADLESS 또는 --headless 플래그)
+- pygame 초기화 (화면/폰트만, 믹서는 소리가 필요한 씬에서 처음 쓸 때) / 화면(또는 오프스크린 Surface) 생성
+- 프레임 저장
+- 시작 벤치마크용 첫 프레임 시각 보고 (startup_bench.py)
+"""
+
+import os
+import sys
+import time
+import pygame
+
+# 상수
+HEADLESS_ENV = "BYEOLMURI_HEADLESS"
+HEADLESS_FLAG = "--headless"
+MIXER_FREQUENCY = 44100
+MIXER_BUFFER = 512  # 믹서 버퍼 샘플 수 (약 12ms, 효과음 지연을 한 프레임 안으로)
+STARTUP_ENV = "BYEOLMURI_STARTUP_T0"  # 시작 벤치마크가 넣어 주는 프로세스 시작 시각 (time.time())
+STARTUP_MARK = "[startup] first_frame_ms="
+
+_first_frame_done = False
+
+
+def is_headless(argv=None):
+    """헤드리스 모드 여부 확인 (CLI 플래그가 환경 변수보다 우선)"""
+    if argv is None:
+        argv = sys.argv
+    if HEADLESS_FLAG in argv:
+        return True
+    return os.environ.get(HEADLESS_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def init_pygame(headless=False):
+    """
+    pygame 초기화 (여러 번 호출해도 됨)
+    헤드리스 모드에서는 창을 열지 않도록 SDL 더미 드라이버를 사용
+    pygame.init() 대신 화면/폰트만 초기화 (오디오 장치 열기, 조이스틱 탐색 등은 시작을 느리게 함)
+    믹서는 설정만 해 두고 소리가 필요할 때 pygame.mixer.init()으로 엶 (작은 버퍼: 효과음이 늦게 들리지 않도록)
+    """
+    if headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.mixer.pre_init(MIXER_FREQUENCY, -16, 2, MIXER_BUFFER)
+    pygame.display.init()
+    pygame.font.init()
+
+
+def create_screen(size, caption="", headless=False):
+    """
+    그리기 대상 Surface 생성
+    - 일반 모드: 실제 창 (pygame.display.set_mode)
+    - 헤드리스 모드: 오프스크린 Surface
+    """
+    if headless:
+        return pygame.Surface(size)
+    screen = pygame.display.set_mode(size)
+    if caption:
+        pygame.display.set_caption(caption)
+    return screen
+
+
+def present(headless=False):
+    """그린 프레임을 화면에 반영 (헤드리스 모드에서는 생략)"""
+    if not headless:
+        pygame.display.flip()
+    if not _first_frame_done:
+        report_first_frame()
+
+
+def report_first_frame():
+    """첫 프레임: 시작 벤치마크로 실행됐으면 프로세스 시작부터 걸린 시간 출력"""
+    global _first_frame_done
+    _first_frame_done = True
+    started = os.environ.get(STARTUP_ENV)
+    if started:
+        print(f"{STARTUP_MARK}{(time.time() - float(started)) * 1000:.1f}", flush=True)
+
+
+def render_offscreen(draw_fn, size):
+    """오프스크린 Surface를 만들어 draw_fn(surface)로 그린 뒤 반환"""
+    surface = pygame.Surface(size)
+    draw_fn(surface)
+    return surface
+
+
+def save_frame(surface, path):
+    """Surface를 이미지 파일로 저장 (확장자에 따라 PNG/BMP 등)"""
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    pygame.image.save(surface, path)
+    print(f"프레임 저장 완료: {path}")
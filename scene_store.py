@@ -0,0 +1,240 @@
+"""
+장면 저장소 (struct-of-arrays)
+- 오브젝트 데이터를 종류 코드/x/y/각도/색/짝(포탈)/켜짐 배열(array)에 나란히 저장
+- 빛 계산은 오브젝트 리스트를 isinstance로 거르지 않고 배열에서 종류별 좌표를 바로 읽음
+- 오브젝트 하나가 dict를 가진 파이썬 객체가 아니라 배열 칸 몇 개이므로, 큰 맵도 메모리를 적게 씀
+  (워커 프로세스로 보낼 때도 배열 그대로 직렬화되어 작음)
+- ObjectView: 저장소 한 항목을 기존 오브젝트처럼 보여 주는 가벼운 뷰 (objects.py의 draw를 그대로 사용)
+"""
+
+from array import array
+
+from objects import (Emitter, Target, ColorTarget, Mirror, Lens, Prism, Blackhole, Portal, COLORS)
+
+# 종류 코드
+EMITTER, TARGET, COLOR_TARGET, MIRROR, LENS, PRISM, BLACKHOLE, PORTAL_A, PORTAL_B = range(9)
+
+# 에디터/레벨 파일의 리스트 이름 -> 종류 코드
+LIST_KINDS = {
+    "emitters": EMITTER,
+    "targets": TARGET,
+    "mirrors": MIRROR,
+    "lenses": LENS,
+    "portals_a": PORTAL_A,
+    "portals_b": PORTAL_B,
+    "blackholes": BLACKHOLE,
+}
+
+COLOR_NAMES = tuple(COLORS)  # 색 코드 -> 색 이름
+COLOR_CODES = {name: code for code, name in enumerate(COLOR_NAMES)}
+
+_CLASS_KINDS = {Emitter: EMITTER, Target: TARGET, ColorTarget: COLOR_TARGET, Mirror: MIRROR,
+                Lens: LENS, Prism: PRISM, Blackhole: BLACKHOLE}
+_DRAW = {EMITTER: Emitter.draw, TARGET: Target.draw, COLOR_TARGET: ColorTarget.draw, MIRROR: Mirror.draw,
+         LENS: Lens.draw, PRISM: Prism.draw, BLACKHOLE: Blackhole.draw,
+         PORTAL_A: Portal.draw, PORTAL_B: Portal.draw}
+
+
+def kind_of(obj):
+    """오브젝트 -> 종류 코드 (type 조회 한 번)"""
+    if type(obj) is Portal:
+        return PORTAL_A if obj.portal_type == 'A' else PORTAL_B
+    return _CLASS_KINDS[type(obj)]
+
+
+class SceneStore:
+    """장면 전체를 종류별 배열로 (추가만 가능, 편집은 원본 오브젝트에서 하고 다시 만듦)"""
+
+    __slots__ = ("size", "kind", "x", "y", "angle", "color", "pair", "hit", "active", "_by_kind")
+
+    def __init__(self, size=None):
+        self.size = size             # (너비, 높이) - 빛 계산 범위
+        self.kind = array("B")       # 종류 코드
+        self.x = array("d")
+        self.y = array("d")
+        self.angle = array("d")
+        self.color = array("B")      # 색 코드 (COLOR_NAMES)
+        self.pair = array("i")       # 포탈: 연결된 반대쪽 포탈의 인덱스 (없으면 -1)
+        self.hit = array("B")        # 목표: 빛을 받았는지
+        self.active = array("B")     # 포탈: 켜져 있는지 (레벨의 toggle 설정)
+        self._by_kind = None         # 종류 코드 -> 인덱스 리스트 (처음 조회할 때 만듦)
+
+    def __len__(self):
+        return len(self.kind)
+
+    def add(self, kind, x, y, angle=0, color="white", active=True):
+        """항목 추가 (인덱스 반환)"""
+        self.kind.append(kind)
+        self.x.append(x)
+        self.y.append(y)
+        self.angle.append(angle)
+        self.color.append(COLOR_CODES[color])
+        self.pair.append(-1)
+        self.hit.append(0)
+        self.active.append(1 if active else 0)
+        self._by_kind = None
+        return len(self.kind) - 1
+
+    def add_object(self, obj, kind=None):
+        return self.add(kind_of(obj) if kind is None else kind, obj.x, obj.y,
+                        getattr(obj, "angle", 0), getattr(obj, "color", "white"), getattr(obj, "active", True))
+
+    def extend(self, kind, objects):
+        """같은 종류 오브젝트 여러 개를 열 단위로 한 번에 추가"""
+        n = len(objects)
+        if not n:
+            return
+        self.kind.extend(array("B", [kind]) * n)
+        self.x.extend(array("d", [obj.x for obj in objects]))
+        self.y.extend(array("d", [obj.y for obj in objects]))
+        if hasattr(objects[0], "angle"):
+            self.angle.extend(array("d", [obj.angle for obj in objects]))
+        else:
+            self.angle.extend(array("d", [0.0]) * n)
+        if hasattr(objects[0], "color"):
+            self.color.extend(array("B", [COLOR_CODES[obj.color] for obj in objects]))
+        else:
+            self.color.extend(array("B", [COLOR_CODES["white"]]) * n)
+        self.pair.extend(array("i", [-1]) * n)
+        self.hit.extend(array("B", [0]) * n)
+        if hasattr(objects[0], "active"):
+            self.active.extend(array("B", [1 if obj.active else 0 for obj in objects]))
+        else:
+            self.active.extend(array("B", [1]) * n)
+        self._by_kind = None
+
+    @classmethod
+    def from_objects(cls, objects, size=None):
+        """오브젝트들 -> 저장소 (같은 종류 안에서는 주어진 순서 유지)"""
+        store = cls(size)
+        for obj in objects:
+            store.add_object(obj)
+        store.link_portals()
+        return store
+
+    @classmethod
+    def from_lists(cls, named_lists, size=None, extra=()):
+        """
+        {리스트 이름: 오브젝트 리스트} -> 저장소 (리스트 이름으로 종류를 알므로 type 조회도 없음)
+        extra: 리스트 뒤에 이어 붙일 오브젝트 (플레이어가 배치한 오브젝트, 종류는 type으로)
+        """
+        store = cls(size)
+        for name, lst in named_lists.items():
+            store.extend(LIST_KINDS[name], lst)
+        for obj in extra:
+            store.add_object(obj)
+        store.link_portals()
+        return store
+
+    def link_portals(self):
+        """포탈 짝 연결: 모든 A는 켜진 첫 번째 B로 (B는 켜진 첫 번째 A로)"""
+        active = self.active
+        entrances = [i for i in self.indices(PORTAL_A) if active[i]]
+        exits = [i for i in self.indices(PORTAL_B) if active[i]]
+        for i in self.indices(PORTAL_A):
+            self.pair[i] = exits[0] if exits else -1
+        for i in self.indices(PORTAL_B):
+            self.pair[i] = entrances[0] if entrances else -1
+
+    def sync(self, i, obj):
+        """
+        움직인 오브젝트의 위치/각도/켜짐을 항목 i에 다시 복사 (포탈이 켜지거나 꺼졌으면 link_portals도 호출)
+
+        Returns:
+            켜짐이 바뀌었는지 (포탈 짝이 다시 연결됨)
+        """
+        self.x[i] = obj.x
+        self.y[i] = obj.y
+        self.angle[i] = getattr(obj, "angle", 0)
+        active = 1 if getattr(obj, "active", True) else 0
+        if active == self.active[i]:
+            return False
+        self.active[i] = active
+        self.link_portals()
+        return True
+
+    def indices(self, kind):
+        """종류의 인덱스 리스트 (추가한 순서)"""
+        if self._by_kind is None:
+            by_kind = {}
+            for i, k in enumerate(self.kind):
+                by_kind.setdefault(k, []).append(i)
+            self._by_kind = by_kind
+        return self._by_kind.get(kind, [])
+
+    def points(self, kind):
+        """종류별 [(x, y)]"""
+        xs, ys = self.x, self.y
+        return [(xs[i], ys[i]) for i in self.indices(kind)]
+
+    def points_angle(self, kind):
+        """종류별 [(x, y, 각도)]"""
+        xs, ys, angles = self.x, self.y, self.angle
+        return [(xs[i], ys[i], angles[i]) for i in self.indices(kind)]
+
+    def color_name(self, i):
+        return COLOR_NAMES[self.color[i]]
+
+    def view(self, i):
+        return ObjectView(self, i)
+
+    def views(self, kind=None):
+        """항목 뷰 (kind를 주면 그 종류만)"""
+        indices = range(len(self)) if kind is None else self.indices(kind)
+        return [ObjectView(self, i) for i in indices]
+
+    def nbytes(self):
+        """배열 데이터 크기 (바이트)"""
+        return sum(column.itemsize * len(column)
+                   for column in (self.kind, self.x, self.y, self.angle, self.color, self.pair, self.hit,
+                                  self.active))
+
+
+def _column(name):
+    def get(self):
+        return getattr(self.store, name)[self.index]
+
+    def set(self, value):
+        getattr(self.store, name)[self.index] = value
+    return property(get, set)
+
+
+class ObjectView:
+    """저장소 한 항목 (objects.py 오브젝트와 같은 속성 이름, draw 그대로 사용)"""
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    x = _column("x")
+    y = _column("y")
+    angle = _column("angle")
+
+    @property
+    def kind(self):
+        return self.store.kind[self.index]
+
+    @property
+    def color(self):
+        return self.store.color_name(self.index)
+
+    @property
+    def hit(self):
+        return bool(self.store.hit[self.index])
+
+    @hit.setter
+    def hit(self, value):
+        self.store.hit[self.index] = 1 if value else 0
+
+    @property
+    def active(self):
+        return bool(self.store.active[self.index])
+
+    @property
+    def portal_type(self):
+        return 'A' if self.kind == PORTAL_A else 'B'
+
+    def draw(self, surf):
+        _DRAW[self.kind](self, surf)
@@ -0,0 +1,234 @@
+"""
+씬 매니저 (맵 선택창 / 레벨 플레이 / 맵 에디터를 한 프로세스에서 전환)
+- 창(display), 폰트, 믹서를 한 번만 초기화해서 모든 씬이 공유
+- 레벨 캐시/팩 파일도 모듈 단위로 공유되므로 레벨을 다시 열 때 파싱하지 않음
+- 레벨 플레이 중에는 다음 레벨을 백그라운드에서 미리 준비 (prefetch.py)
+- 씬은 스택으로 관리: 메뉴 위에 레벨/에디터를 올리고, 뒤로가기는 pop
+
+씬 인터페이스 (덕 타이핑):
+    enter()              스택에 올라갈 때
+    leave()              스택에서 내려갈 때
+    handle_event(event)  이벤트 하나 처리
+    draw(surface)        프레임 그리기 (present는 매니저가 함)
+"""
+
+import os
+import importlib.util
+
+import pygame
+
+import level_play
+from catalog import load_catalog, next_entry
+from prefetch import Prefetcher
+from runtime import is_headless, init_pygame, create_screen, present
+from fonts import get_font, DEFAULT_FONT
+
+# 상수
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+EDITOR_SCRIPT = os.path.join(BASE_DIR, "tool..py")
+SCREEN_SIZE = (level_play.WIDTH, level_play.HEIGHT)
+FONT_NAME = DEFAULT_FONT
+FPS = 60
+
+
+class SceneManager:
+    """창 하나를 여러 씬이 번갈아 쓰도록 관리"""
+
+    def __init__(self, size=SCREEN_SIZE, caption="별무리", headless=None):
+        self.headless = is_headless() if headless is None else headless
+        init_pygame(self.headless)
+        self.screen = create_screen(size, caption, self.headless)
+        self.clock = pygame.time.Clock()
+        self.fonts = {}
+        self.stack = []
+        self.running = False
+        self.prefetcher = Prefetcher()
+        # 믹서는 메뉴에서는 필요 없으므로 첫 레벨에 들어갈 때 엶 (LevelPlayScene.enter)
+
+    def get_font(self, size, name=FONT_NAME):
+        """폰트 (파일 경로는 fonts.py 디스크 캐시, 다음 실행부터는 시스템 폰트 목록을 훑지 않음)"""
+        key = (name, size)
+        if key not in self.fonts:
+            self.fonts[key] = get_font(size, name)
+        return self.fonts[key]
+
+    def set_caption(self, caption):
+        if not self.headless:
+            pygame.display.set_caption(caption)
+
+    @property
+    def scene(self):
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene):
+        self.stack.append(scene)
+        scene.enter()
+
+    def pop(self):
+        """맨 위 씬을 내리고, 아래 씬이 있으면 다시 활성화"""
+        if not self.stack:
+            return
+        self.stack.pop().leave()
+        if self.stack and hasattr(self.stack[-1], "resume"):
+            self.stack[-1].resume()
+
+    def replace(self, scene):
+        """맨 위 씬을 다른 씬으로 교체 (아래 씬은 다시 활성화하지 않음)"""
+        if self.stack:
+            self.stack.pop().leave()
+        self.push(scene)
+
+    def play_level(self, level_path):
+        """레벨 플레이 씬으로 전환 (프로세스 생성 없이)"""
+        self.push(LevelPlayScene(self, level_path))
+
+    def open_editor(self, map_index=None):
+        """맵 에디터 씬으로 전환"""
+        self.push(EditorScene(self, map_index))
+
+    def quit(self):
+        self.running = False
+
+    def run(self, scene, frames=None):
+        """
+        메인 루프
+
+        Parameters:
+            scene: 처음 올릴 씬 (보통 맵 선택창)
+            frames: 지정하면 그 프레임 수만큼만 실행 (헤드리스 테스트용)
+        """
+        self.push(scene)
+        self.running = True
+        frame_count = 0
+        while self.running and self.stack:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+                    break
+                if self.stack:
+                    self.stack[-1].handle_event(event)
+            if not self.running or not self.stack:
+                break
+
+            self.stack[-1].draw(self.screen)
+            present(self.headless)
+
+            frame_count += 1
+            if frames is not None and frame_count >= frames:
+                break
+            if not self.headless:
+                self.clock.tick(FPS)
+
+        while self.stack:
+            self.stack.pop().leave()
+        self.prefetcher.shutdown()
+        try:
+            level_play.bgm.shutdown()
+            level_play.sfx.unload()
+            pygame.mixer.quit()
+        except Exception:
+            pass
+        pygame.quit()
+
+
+class LevelPlayScene:
+    """level_play.py를 씬으로 실행 (퍼즐 완료 후 Enter: 다음 레벨)"""
+
+    def __init__(self, manager, level_path):
+        self.manager = manager
+        self.level_path = level_path
+        # 카탈로그 순서상 다음 레벨 (인덱스 파일만 읽으므로 빠름)
+        level_dir = os.path.dirname(os.path.abspath(level_path))
+        entry = next_entry(load_catalog(level_dir), level_path)
+        self.next_entry = entry
+        self.next_path = os.path.join(level_dir, entry["file"]) if entry else None
+        self.keep_bgm = False  # 다음 레벨로 넘어갈 때는 BGM을 멈추지 않음 (같은 곡이면 이어서, 다르면 크로스페이드)
+
+    def enter(self):
+        m = self.manager
+        m.set_caption("광학 퍼즐 게임 - 레벨 플레이")
+        level_play.use_display(m.screen, m.get_font(20), m.get_font(24), m.headless)
+        level_play.init_audio()
+        level_play.start_level(self.level_path)
+        # 플레이하는 동안 다음 레벨을 미리 준비
+        if self.next_path:
+            m.prefetcher.prefetch_level(self.next_path, self.next_entry)
+
+    def is_complete(self):
+        return level_play.game_started and level_play.check_game_complete()
+
+    def leave(self):
+        if not self.keep_bgm:
+            level_play.bgm.stop()
+
+    def handle_event(self, event):
+        # 퍼즐 완료 후 Enter -> 다음 레벨 (미리 준비해 둔 캐시 사용)
+        if (event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN
+                and self.next_path and self.is_complete()):
+            self.keep_bgm = True
+            self.manager.replace(LevelPlayScene(self.manager, self.next_path))
+            return
+        # "메뉴로" 버튼 -> 맵 선택창으로 복귀
+        if not level_play.handle_event(event):
+            self.manager.pop()
+
+    def draw(self, surface):
+        level_play.draw_frame(surface)
+        if self.next_path and self.is_complete():
+            text = level_play.FONT.render("Enter: 다음 레벨", True, (255, 255, 0))
+            surface.blit(text, text.get_rect(center=(level_play.WIDTH // 2, level_play.HEIGHT // 2 + 40)))
+
+
+_editor_module = None
+
+
+def load_editor_module():
+    """tool..py는 파일 이름 때문에 일반 import가 안 되므로 경로로 불러옴 (한 번만)"""
+    global _editor_module
+    if _editor_module is None:
+        spec = importlib.util.spec_from_file_location("tool", EDITOR_SCRIPT)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _editor_module = module
+    return _editor_module
+
+
+class EditorScene:
+    """tool..py(맵 에디터)를 씬으로 실행 (에디터 크기만큼 화면 왼쪽 위를 사용)"""
+
+    def __init__(self, manager, map_index=None):
+        self.manager = manager
+        self.map_index = map_index
+        self.editor = load_editor_module()
+        self.view = None
+
+    def enter(self):
+        m = self.manager
+        ed = self.editor
+        m.set_caption("Light Puzzle - Map Editor")
+        size = (min(ed.WIDTH, m.screen.get_width()), min(ed.HEIGHT, m.screen.get_height()))
+        self.view = m.screen.subsurface(pygame.Rect((0, 0), size))
+        ed.use_display(self.view, m.get_font(22), m.get_font(28), m.headless)
+        if self.map_index is not None:
+            ed.load_map(self.map_index)
+        else:
+            ed.restore_autosave()
+
+    def leave(self):
+        self.editor.beam_preview.shutdown()
+        self.editor.autosave.flush()  # 남은 편집은 기다리지 않고 저장 요청
+        self.view = None
+
+    def handle_event(self, event):
+        ed = self.editor
+        # 입력 중이 아닐 때 ESC -> 맵 선택창으로 복귀
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE and ed.input_mode is None:
+            self.manager.pop()
+            return
+        if not ed.handle_event(event):
+            self.manager.pop()
+
+    def draw(self, surface):
+        surface.fill((0, 0, 0))
+        self.editor.update()
+        self.editor.draw_frame(self.view)
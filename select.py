@@ -5,7 +5,12 @@ import subprocess
 import traceback
 import json
 
-pygame.init()
+from level_cache import load_json
+from catalog import load_catalog
+from pack import get_store
+from thumbnails import generate_thumbnails, ThumbnailLoader
+from runtime import init_pygame, present
+from fonts import get_font
 
 #색 정의 
 WHITE = (255,255,255)
@@ -13,6 +18,113 @@ GRAY = (100,100,100)
 LIGHT_GRAY = (200,200,200)
 HIGHLIGHT = (255,200,0)
 
+# 타일 맵 팔레트: 타일 id -> 색
+TILE_PALETTE = {
+    0: (30, 30, 30),      # 빈
+    1: (120, 120, 120),   # 벽
+    2: (200, 180, 80),    # 바닥(원래 아이템 표시는 엔티티로 분리됨)
+    3: (80, 160, 220),    # 물
+    4: (200, 80, 80),     # 적(엔티티로 분리)
+}
+TILE_DEFAULT = (50, 50, 50)
+TILE_BORDER = (40, 40, 40)
+
+# 타일 맵 청크/카메라
+CHUNK_TILES = 32        # 청크 한 변의 타일 수 (청크마다 Surface 하나)
+MIN_TILE_SIZE = 24      # 이보다 작아지지 않음 (큰 맵은 카메라로 스크롤)
+MAX_CACHED_CHUNKS = 64  # 넘으면 화면에서 먼 청크부터 해제
+
+# 텍스트 보기에 만들어 둘 최대 줄 수
+TEXT_VIEW_LINES = 200
+
+# 엔티티 색 이름 -> RGB
+NAMED_COLORS = {
+    'white': (255,255,255), 'black': (0,0,0), 'red': (200,50,50),
+    'green': (80,200,120), 'blue': (80,160,220), 'yellow': (230,200,60),
+    'cyan': (80,200,200), 'magenta': (200,80,180), 'orange': (255,160,60),
+    'gray': (150,150,150)
+}
+
+
+def name_to_rgb(name):
+    """색 이름 또는 #RRGGBB 문자열을 RGB로 변환 (모르면 None)"""
+    if not name:
+        return None
+    n = str(name).strip().lower()
+    if n in NAMED_COLORS:
+        return NAMED_COLORS[n]
+    # hex like #RRGGBB
+    if n.startswith('#') and len(n) == 7:
+        try:
+            return (int(n[1:3],16), int(n[3:5],16), int(n[5:7],16))
+        except ValueError:
+            return None
+    return None
+
+
+def _number(v):
+    return isinstance(v, (int, float))
+
+
+def iter_positions(data):
+    """
+    JSON 문서에서 좌표를 가진 오브젝트를 하나씩 돌려줌 (재귀 대신 스택 사용 -> 깊이 제한 없음)
+    - {x, y} / {col, row} / {pos: [x, y]} 형식을 인식, 찾은 오브젝트 안쪽은 더 들어가지 않음
+    - 타입이 없으면 부모 키 이름을 타입 힌트로 사용
+    - 오브젝트를 복사하지 않고 필요한 값만 꺼냄
+
+    Yields:
+        (타입, x, y, 색 또는 None)
+    """
+    stack = [(data, None)]
+    while stack:
+        obj, hint = stack.pop()
+        if isinstance(obj, dict):
+            pos = None
+            if 'x' in obj and 'y' in obj and _number(obj['x']) and _number(obj['y']):
+                pos = (int(obj['x']), int(obj['y']))
+            elif 'col' in obj and 'row' in obj and isinstance(obj['col'], int) and isinstance(obj['row'], int):
+                # v2 레벨: 그리드 칸 col,row
+                pos = (obj['col'], obj['row'])
+            elif 'pos' in obj and isinstance(obj['pos'], (list, tuple)) and len(obj['pos']) >= 2 \
+                    and _number(obj['pos'][0]) and _number(obj['pos'][1]):
+                pos = (int(obj['pos'][0]), int(obj['pos'][1]))
+            if pos is not None:
+                yield obj.get('type') or hint or 'obj', pos[0], pos[1], obj.get('color')
+                continue
+            # 문서 순서대로 나오도록 뒤에서부터 쌓음
+            stack.extend((v, k) for k, v in reversed(list(obj.items())))
+        elif isinstance(obj, list):
+            stack.extend((item, hint) for item in reversed(obj))
+
+
+def pretty_lines(data, limit):
+    """들여쓰기한 JSON 텍스트의 앞 limit줄만 만듦 (문서 전체를 문자열로 만들지 않음)"""
+    lines = []
+    buf = ''
+    for piece in json.JSONEncoder(ensure_ascii=False, indent=2).iterencode(data):
+        buf += piece
+        if '\n' in buf:
+            parts = buf.split('\n')
+            lines.extend(parts[:-1])
+            buf = parts[-1]
+            if len(lines) >= limit:
+                return lines[:limit]
+    if buf:
+        lines.append(buf)
+    return lines[:limit]
+
+
+class Entity:
+    """타일 맵 엔티티 (아이템/적) - 수천 개라도 가볍도록 __slots__ 사용"""
+    __slots__ = ('type', 'x', 'y', 'color')
+
+    def __init__(self, etype, x, y, color=None):
+        self.type = etype
+        self.x = x
+        self.y = y
+        self.color = color
+
 
 # 간단한 Button 기본 클래스 (UI용)
 class Button:
@@ -52,9 +164,11 @@ class Button:
 # MapSelector는 Button을 상속받아 기본 UI 속성(화면/폰트 등)을 공유하도록 함
 class MapSelector(Button):
     def __init__(self, width=1280, height=720):
+        # 화면/폰트만 초기화 (pygame.init()은 오디오 장치까지 열어서 느림)
+        init_pygame()
         # 임시 rect, label로 Button 초기화 (MapSelector는 전체 UI 담당)
         screen = pygame.display.set_mode((width, height))
-        super().__init__(screen, (0,0,0,0), "", pygame.font.SysFont('malgungothic', 20))
+        super().__init__(screen, (0,0,0,0), "", get_font(20, 'malgungothic'))
         self.WIDTH = width
         self.HEIGHT = height
         pygame.display.set_caption('맵 선택창')
@@ -69,11 +183,18 @@ class MapSelector(Button):
         self.BASE_DIR = os.path.dirname(__file__)
         self.IMG_DIR = os.path.join(self.BASE_DIR, "picture")
         self.MAP_DIR = os.path.join(self.BASE_DIR, "map")
+        if not os.path.isdir(self.MAP_DIR):
+            self.MAP_DIR = self.BASE_DIR  # map/ 폴더가 없으면 프로젝트 폴더의 level_*.json 사용
+
+        # 레벨 카탈로그 (levels_index.json, 바뀐 레벨만 다시 읽음)
+        self.catalog = load_catalog(self.MAP_DIR)
 
         # 그리드
-        self.MAP_COUNT = 8
+        self.MAP_COUNT = len(self.catalog)
         self.COLS = 4
-        self.ROWS = 2
+        self.ROWS = 2            # 한 화면에 보이는 줄 수 (전체 줄 수는 레벨 개수에 따라 스크롤)
+        self.PREFETCH_ROWS = 1   # 화면 밖 미리 불러올 줄 수
+        self.EVICT_ROWS = 3      # 화면에서 이만큼 멀어진 줄은 썸네일/라벨 해제
         self.PADDING = 20
         self.MARGIN_TOP = 10
         self.LABEL_HEIGHT = 28
@@ -88,15 +209,33 @@ class MapSelector(Button):
         self.SLOT_W = int(self.TILE_W * self.SLOT_SCALE)
         self.SLOT_H = int(self.TILE_H * self.SLOT_SCALE)
 
-        # 라벨·명령: Level 0 ~ Level 7, 파일은 level_0.json ~ level_7.json
-        self.map_labels = [f"Level {i}" for i in range(0, self.MAP_COUNT)]
-        self.commands = [f"level_{i}.json" for i in range(0, self.MAP_COUNT)]
-        self.commands = (self.commands + [""] * self.MAP_COUNT)[:self.MAP_COUNT]
-
-        # 이미지/섬네일
+        # 스크롤 (픽셀 단위, 한 줄 높이 = 타일 + 여백)
+        self.ROW_PITCH = self.TILE_H + self.PADDING
+        self.total_rows = (self.MAP_COUNT + self.COLS - 1) // self.COLS
+        # 슬롯이 보이는 영역: 뒤로가기 버튼 아래 ~ 하단 안내 문구 위 (이 밖은 잘라서 그림)
+        self.grid_view = pygame.Rect(0, 56, self.WIDTH, self.HEIGHT - 30 - 56)
+        # 첫 슬롯 위쪽 ~ 마지막 줄 라벨 아래쪽이 보이는 영역 안에 들어오도록 스크롤 범위 계산
+        first_top = self.MARGIN_TOP + self.PADDING + (self.TILE_H - self.SLOT_H) // 2
+        content_bottom = first_top + (self.total_rows - 1) * self.ROW_PITCH + self.SLOT_H + self.LABEL_HEIGHT
+        self.max_scroll = max(0, content_bottom - self.grid_view.bottom)
+        self.scroll_y = 0
+        self.live_rows = set()   # 썸네일/라벨을 들고 있는 줄
+        self.label_cache = {}    # 레벨 인덱스 -> 라벨 Surface
+
+        # 라벨·명령: 카탈로그 순서 (파일은 level_N.json)
+        self.map_labels = [entry["label"] for entry in self.catalog]
+        self.commands = [entry["file"] for entry in self.catalog]
+
+        # 이미지/섬네일 (스레드 풀에서 디코드, 슬롯 크기로 한 번만 축소해서 보관)
         self.image_files = self._get_image_files()
         self.image_files = (self.image_files + [""] * self.MAP_COUNT)[:self.MAP_COUNT]
-        self.thumbnails = self._load_thumbnails()
+        self.thumb_paths = [os.path.join(self.IMG_DIR, fname) if fname else None for fname in self.image_files]
+        self.thumb_loader = ThumbnailLoader((self.SLOT_W, self.SLOT_H))
+        self.placeholder = pygame.Surface((self.SLOT_W, self.SLOT_H))
+        self.placeholder.fill(self.GRAY)
+        # 이미지가 없는 레벨은 레벨 JSON으로 렌더링한 썸네일 사용 (생성도 백그라운드, 그동안은 빈 슬롯)
+        missing = [entry for entry, fname in zip(self.catalog, self.image_files) if not fname]
+        self.thumb_gen_job = self.thumb_loader.submit(generate_thumbnails, missing, self.MAP_DIR, (self.SLOT_W, self.SLOT_H)) if missing else None
 
         # 뒤로가기 버튼 (좌상단) — 동작은 상태에 따라 분기
         back_rect = (10, 10, 120, 36)
@@ -109,8 +248,8 @@ class MapSelector(Button):
         self.level_data = None
         self.level_lines = []
         # 메인 메뉴 UI용 폰트/버튼
-        self.title_font = pygame.font.SysFont('malgungothic', 64)
-        btn_font = pygame.font.SysFont('malgungothic', 32)
+        self.title_font = get_font(64, 'malgungothic')
+        btn_font = get_font(32, 'malgungothic')
         btn_w, btn_h = 360, 72
         gap = 18
         cx = (self.WIDTH - btn_w) // 2
@@ -125,9 +264,17 @@ class MapSelector(Button):
         self.map_h = 0
         self.tile_size = 0
         self.map_offset = (0, 0)
+        # 청크 단위로 그려 두는 타일+엔티티 Surface, 카메라(맵 픽셀 좌표)
+        self.view_rect = pygame.Rect(self.PADDING, 120, self.WIDTH - self.PADDING * 2, self.HEIGHT - 140)
+        self.chunks = {}              # (청크 x, 청크 y) -> Surface
+        self.chunk_entities = {}      # (청크 x, 청크 y) -> [엔티티]
+        self.camera = [0, 0]
+        self.sprite_cache = {}        # (타입, 색, 타일 크기) -> Surface
+        self.text_cache = {}          # (문자열, 색) -> Surface
         # 레벨 오브젝트
         self.player = None            # {'x':int, 'y':int}
-        self.entities = []            # [{'type':str,'x':int,'y':int}, ...]
+        self.entities = set()         # {Entity, ...}
+        self.cells = {}               # (x, y) -> [Entity] 칸 점유 인덱스 (충돌/수집 O(1) 조회)
         self.collected_items = 0
         # 상태
         self.clock = pygame.time.Clock()
@@ -135,36 +282,85 @@ class MapSelector(Button):
 
     def _get_image_files(self):
         exts = {'.png', '.jpg', '.jpeg', '.bmp', '.gif'}
-        if not os.path.isdir(self.IMG_DIR):
-            return []
-        files = [f for f in sorted(os.listdir(self.IMG_DIR)) if os.path.splitext(f)[1].lower() in exts]
-        return files
-
-    def _load_thumbnails(self):
-        thumbs = []
-        for fname in self.image_files:
-            if fname:
-                path = os.path.join(self.IMG_DIR, fname)
-                try:
-                    img = pygame.image.load(path).convert_alpha()
-                    thumb = pygame.transform.smoothscale(img, (self.TILE_W, self.TILE_H))
-                    thumbs.append((fname, thumb))
-                except Exception as e:
-                    print("이미지 로드 실패:", path, e)
-                    surf = pygame.Surface((self.TILE_W, self.TILE_H))
-                    surf.fill(self.GRAY)
-                    thumbs.append((fname, surf))
+        files = []
+        store = get_store()
+        packed = store.list_names("picture/*")
+        if packed:
+            files = [n.split("/", 1)[1] for n in packed if os.path.splitext(n)[1].lower() in exts]
+        elif os.path.isdir(self.IMG_DIR):
+            files = [f for f in sorted(os.listdir(self.IMG_DIR)) if os.path.splitext(f)[1].lower() in exts]
+        # 카탈로그에 썸네일이 지정된 레벨은 그 파일, 나머지는 picture/ 폴더 순서대로 사용
+        result = []
+        for i, entry in enumerate(self.catalog):
+            if entry.get("thumbnail"):
+                result.append(entry["thumbnail"])
+            elif i < len(files):
+                result.append(files[i])
             else:
-                surf = pygame.Surface((self.TILE_W, self.TILE_H))
-                surf.fill(self.GRAY)
-                thumbs.append((fname, surf))
-        return thumbs
+                result.append("")
+        return result
+
+    def _update_thumbnails(self):
+        """백그라운드 썸네일 작업 결과 반영 (프레임마다 호출)"""
+        if self.thumb_gen_job is not None and self.thumb_gen_job.done():
+            try:
+                generated = self.thumb_gen_job.result()
+            except Exception as e:
+                print("썸네일 생성 실패:", e)
+                generated = {}
+            for i, entry in enumerate(self.catalog):
+                if self.thumb_paths[i] is None and entry["file"] in generated:
+                    self.thumb_paths[i] = generated[entry["file"]]
+            self.thumb_gen_job = None
+            self.live_rows = set()  # 새로 생긴 썸네일도 요청되도록 다시 계산
+        self.thumb_loader.poll()
+
+    def _visible_rows(self, margin=0):
+        """보이는 영역(grid_view)에 걸친 줄 번호 범위 (margin만큼 위아래로 확장)"""
+        origin = self.MARGIN_TOP + self.PADDING - self.scroll_y  # 0번 줄 칸의 위쪽 y
+        first = (self.grid_view.top - origin) // self.ROW_PITCH
+        last = (self.grid_view.bottom - origin) // self.ROW_PITCH
+        return range(max(0, first - margin), min(self.total_rows, last + 1 + margin))
+
+    def _row_indices(self, row):
+        """줄에 속한 레벨 인덱스 범위"""
+        return range(row * self.COLS, min(self.MAP_COUNT, (row + 1) * self.COLS))
+
+    def _visible_indices(self):
+        for row in self._visible_rows():
+            yield from self._row_indices(row)
+
+    def _update_live_rows(self):
+        """보이는 줄 + 미리 불러올 줄은 요청, 멀어진 줄은 해제"""
+        wanted = set(self._visible_rows(self.PREFETCH_ROWS))
+        keep = set(self._visible_rows(self.EVICT_ROWS))
+        for row in wanted - self.live_rows:
+            for i in self._row_indices(row):
+                if self.thumb_paths[i]:
+                    self.thumb_loader.request(self.thumb_paths[i])
+        for row in self.live_rows - keep:
+            for i in self._row_indices(row):
+                if self.thumb_paths[i]:
+                    self.thumb_loader.discard(self.thumb_paths[i])
+                self.label_cache.pop(i, None)
+        self.live_rows = wanted | (self.live_rows & keep)
+
+    def _get_label_surf(self, index):
+        surf = self.label_cache.get(index)
+        if surf is None:
+            label = self.image_files[index] or self.map_labels[index]
+            surf = self.label_cache[index] = self.font.render(label, True, self.WHITE)
+        return surf
+
+    def scroll_by(self, dy):
+        """메뉴 스크롤 (범위 밖으로 나가지 않게 제한)"""
+        self.scroll_y = max(0, min(self.max_scroll, self.scroll_y + dy))
 
     def _get_tile_rect(self, index):
         col = index % self.COLS
         row = index // self.COLS
         cell_x = self.PADDING + col * (self.TILE_W + self.PADDING)
-        cell_y = self.MARGIN_TOP + self.PADDING + row * (self.TILE_H + self.PADDING)
+        cell_y = self.MARGIN_TOP + self.PADDING + row * self.ROW_PITCH - self.scroll_y
         x = cell_x + (self.TILE_W - self.SLOT_W) // 2
         y = cell_y + (self.TILE_H - self.SLOT_H) // 2
         return pygame.Rect(x, y, self.SLOT_W, self.SLOT_H)
@@ -209,13 +405,14 @@ class MapSelector(Button):
             print("load_level: filename 빈값")
             return
         path = filename if os.path.isabs(filename) else os.path.join(self.MAP_DIR, filename)
-        print("load_level 호출 ->", {"filename": filename, "MAP_DIR": self.MAP_DIR, "path": path, "exists": os.path.exists(path)})
-        if not os.path.exists(path):
+        exists = get_store().exists(path)
+        print("load_level 호출 ->", {"filename": filename, "MAP_DIR": self.MAP_DIR, "path": path, "exists": exists})
+        if not exists:
             print("레벨 파일이 존재하지 않음:", path)
             return
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # 컴파일된 캐시에서 불러오기 (원본이 바뀌지 않았으면 JSON 파싱 생략)
+            data = load_json(path)
             print("JSON 로드 완료. 타입:", type(data).__name__)
             if isinstance(data, dict):
                 print("JSON 키:", list(data.keys())[:10])
@@ -234,7 +431,7 @@ class MapSelector(Button):
                 self.map_h = len(self.map_tiles)
                 self.map_w = max((len(r) for r in self.map_tiles), default=0)
                 # 엔티티 초기화
-                self.entities = []
+                self._clear_entities()
                 self.player = None
                 self.collected_items = 0
                 # tiles 내에 플레이어(5) 또는 아이템(2) 표기 있으면 엔티티로 변환
@@ -244,61 +441,28 @@ class MapSelector(Button):
                             self.player = {'x': rx, 'y': ry}
                             self.map_tiles[ry][rx] = 0
                         elif val == 2:
-                            self.entities.append({'type': 'item', 'x': rx, 'y': ry})
+                            self._add_entity(Entity('item', rx, ry))
                             self.map_tiles[ry][rx] = 0
                         elif val == 4:
-                            self.entities.append({'type': 'enemy', 'x': rx, 'y': ry})
+                            self._add_entity(Entity('enemy', rx, ry))
                             self.map_tiles[ry][rx] = 0
                 # 타일 크기 계산: 화면에 맞춰 최대한 키움
-                avail_w = self.WIDTH - self.PADDING * 2
-                avail_h = self.HEIGHT - 140  # 상단 UI 공간 확보
-                if self.map_w > 0 and self.map_h > 0:
-                    self.tile_size = max(4, min(avail_w // self.map_w, avail_h // self.map_h))
-                else:
-                    self.tile_size = 16
-                map_px_w = self.tile_size * self.map_w
-                map_px_h = self.tile_size * self.map_h
-                self.map_offset = ((self.WIDTH - map_px_w) // 2, 120 + (avail_h - map_px_h)//2)
-                # 플래그 상태 전환
+                self._setup_map_view()
+                # 플래그 상태 전환 (타일 맵은 텍스트 보기를 쓰지 않으므로 pretty text 생략)
                 self.state = 'level'
-                # 간단한 pretty text도 준비(디버그용)
-                pretty = json.dumps(data, ensure_ascii=False, indent=2)
-                self.level_lines = pretty.splitlines()[:200]
+                self.level_lines = []
                 print("레벨(맵) 로드됨:", path, "size:", self.map_w, "x", self.map_h, "player:", self.player, "entities:", len(self.entities))
                 return
             # tiles 없으면 텍스트 보기로 폴백
             print("tiles 키/형식 없음 — 오브젝트 좌표 추출 시도")
-            # 재귀적으로 (x,y) 또는 pos를 찾아 엔티티 목록 생성
-            found_positions = []
-            def extract_positions(obj, hint=None):
-                if isinstance(obj, dict):
-                    # 명시적 x,y
-                    if 'x' in obj and 'y' in obj and isinstance(obj['x'], (int,float)) and isinstance(obj['y'], (int,float)):
-                        t = obj.get('type') or hint or 'obj'
-                        # 메타(색상 등)를 함께 저장
-                        found_positions.append({'type': t, 'x': int(obj['x']), 'y': int(obj['y']), 'meta': dict(obj)})
-                        return
-                    # pos: [x,y]
-                    if 'pos' in obj and isinstance(obj['pos'], (list,tuple)) and len(obj['pos'])>=2:
-                        px,py = obj['pos'][0], obj['pos'][1]
-                        if isinstance(px,(int,float)) and isinstance(py,(int,float)):
-                            t = obj.get('type') or hint or 'obj'
-                            found_positions.append({'type': t, 'x': int(px), 'y': int(py), 'meta': dict(obj)})
-                            return
-                    # 키별 재귀
-                    for k,v in obj.items():
-                        extract_positions(v, k)
-                elif isinstance(obj, list):
-                    for item in obj:
-                        extract_positions(item, hint)
-
-            extract_positions(data)
+            # (x,y) / col,row / pos 를 가진 오브젝트를 반복(스택)으로 훑어 엔티티 목록 생성
+            found_positions = list(iter_positions(data))
             if found_positions:
                 # 경계 계산
-                xs = [p['x'] for p in found_positions]
-                ys = [p['y'] for p in found_positions]
-                minx, maxx = min(xs), max(xs)
-                miny, maxy = min(ys), max(ys)
+                minx = min(p[1] for p in found_positions)
+                maxx = max(p[1] for p in found_positions)
+                miny = min(p[2] for p in found_positions)
+                maxy = max(p[2] for p in found_positions)
                 pad = 1
                 width = maxx - minx + 1 + pad*2
                 height = maxy - miny + 1 + pad*2
@@ -307,43 +471,34 @@ class MapSelector(Button):
                 self.map_h = max(1, height)
                 self.map_tiles = [[0 for _ in range(self.map_w)] for __ in range(self.map_h)]
                 # 엔티티로 변환 (좌표 보정)
-                self.entities = []
+                self._clear_entities()
                 self.player = None
-                for p in found_positions:
-                    gx = p['x'] - minx + pad
-                    gy = p['y'] - miny + pad
-                    t = p.get('type','obj')
+                for t, x, y, color in found_positions:
+                    gx = x - minx + pad
+                    gy = y - miny + pad
                     # 간단한 타입 매핑
                     if isinstance(t, str):
                         low = t.lower()
-                        meta = p.get('meta', {}) if isinstance(p.get('meta', {}), dict) else {}
-                        color = meta.get('color')
                         if 'player' in low or 'start' in low:
                             self.player = {'x': gx, 'y': gy}
                         elif 'item' in low or 'emit' in low or 'target' in low:
-                            self.entities.append({'type':'item','x':gx,'y':gy, 'color': color})
+                            self._add_entity(Entity('item', gx, gy, color))
                         elif 'enemy' in low or 'mirror' in low or 'prism' in low:
-                            self.entities.append({'type':'enemy','x':gx,'y':gy, 'color': color})
+                            self._add_entity(Entity('enemy', gx, gy, color))
                         else:
                             # 기타는 아이템으로 표시
-                            self.entities.append({'type':'item','x':gx,'y':gy, 'color': color})
+                            self._add_entity(Entity('item', gx, gy, color))
                     else:
-                        self.entities.append({'type':'item','x':gx,'y':gy, 'color': None})
+                        self._add_entity(Entity('item', gx, gy))
                 # 타일 크기 계산 및 오프셋
-                avail_w = self.WIDTH - self.PADDING * 2
-                avail_h = self.HEIGHT - 140
-                self.tile_size = max(4, min(avail_w // self.map_w, avail_h // self.map_h))
-                map_px_w = self.tile_size * self.map_w
-                map_px_h = self.tile_size * self.map_h
-                self.map_offset = ((self.WIDTH - map_px_w) // 2, 120 + (avail_h - map_px_h)//2)
+                self._setup_map_view()
                 self.collected_items = 0
                 self.state = 'level'
                 print("오브젝트 기반 맵 생성: size", self.map_w, "x", self.map_h, "entities", len(self.entities), "player", bool(self.player))
                 return
-            # 못 찾으면 기존 텍스트 폴백
+            # 못 찾으면 기존 텍스트 폴백 (보기 텍스트는 처음 그릴 때 만듦)
             print("좌표 정보 미발견 — 텍스트 폴백으로 전환")
-            pretty = json.dumps(data, ensure_ascii=False, indent=2)
-            self.level_lines = pretty.splitlines()[:200]
+            self.level_lines = None
             self.map_tiles = None
             self.state = 'level'
             print("레벨(텍스트) 로드됨:", path)
@@ -351,6 +506,159 @@ class MapSelector(Button):
             print("레벨 로드 실패:", path, e)
             traceback.print_exc()
 
+    # --- 레벨 보기 레이어 ---
+    def _text(self, text, color):
+        """자주 쓰는 글자 Surface 캐시"""
+        key = (text, color)
+        surf = self.text_cache.get(key)
+        if surf is None:
+            if len(self.text_cache) >= 256:
+                self.text_cache.clear()  # HUD 숫자 등이 계속 늘어나지 않도록
+            surf = self.text_cache[key] = self.font.render(text, True, color)
+        return surf
+
+    def _entity_sprite(self, ent):
+        """엔티티 모양 (타입/색/타일 크기별로 한 번만 그림)"""
+        ent_color = name_to_rgb(ent.color) or ((230,200,60) if ent.type=='item' else (200,80,80))
+        key = (ent.type, ent_color, self.tile_size)
+        sprite = self.sprite_cache.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
+            size = max(6, self.tile_size - 6)
+            er = pygame.Rect((self.tile_size - size)//2, (self.tile_size - size)//2, size, size)
+            if ent.type == 'item':
+                pygame.draw.ellipse(sprite, ent_color, er)
+                pygame.draw.ellipse(sprite, (120,100,20), er, 2)
+            elif ent.type == 'enemy':
+                pygame.draw.rect(sprite, ent_color, er)
+                pygame.draw.rect(sprite, (120,20,20), er, 2)
+            else:
+                pygame.draw.circle(sprite, ent_color, er.center, size//2)
+            self.sprite_cache[key] = sprite
+        return sprite
+
+    def _chunk_of(self, x, y):
+        return x // CHUNK_TILES, y // CHUNK_TILES
+
+    def _setup_map_view(self):
+        """타일 크기/청크/카메라 초기화 (작은 맵은 화면에 맞춰 확대, 큰 맵은 MIN_TILE_SIZE로 스크롤)"""
+        view = self.view_rect
+        if self.map_w > 0 and self.map_h > 0:
+            self.tile_size = max(MIN_TILE_SIZE, min(view.w // self.map_w, view.h // self.map_h))
+        else:
+            self.tile_size = MIN_TILE_SIZE
+        self.chunks = {}
+        self.chunk_entities = {}
+        for ent in self.entities:
+            self.chunk_entities.setdefault(self._chunk_of(ent.x, ent.y), []).append(ent)
+        self._update_camera()
+
+    def _update_camera(self):
+        """플레이어를 화면 가운데에 두도록 카메라 이동 (맵 밖은 보이지 않게 제한, 맵이 작으면 가운데 정렬)"""
+        view = self.view_rect
+        ts = self.tile_size
+        map_px = (self.map_w * ts, self.map_h * ts)
+        focus = ((self.player['x'] + 0.5) * ts, (self.player['y'] + 0.5) * ts) if self.player else (map_px[0] / 2, map_px[1] / 2)
+        for axis, size in ((0, view.w), (1, view.h)):
+            if map_px[axis] <= size:
+                self.camera[axis] = -(size - map_px[axis]) // 2
+            else:
+                self.camera[axis] = int(max(0, min(map_px[axis] - size, focus[axis] - size / 2)))
+        # 화면상 맵 원점 (플레이어/HUD 그리기에 사용)
+        self.map_offset = (view.x - self.camera[0], view.y - self.camera[1])
+
+    def _render_chunk(self, cx, cy):
+        """청크 하나를 그림: 타일 + 이 청크와 왼쪽/위 청크의 엔티티 (라벨이 경계를 넘어와도 잘리지 않게)"""
+        ts = self.tile_size
+        x0, y0 = cx * CHUNK_TILES, cy * CHUNK_TILES
+        cols = min(CHUNK_TILES, self.map_w - x0)
+        rows = min(CHUNK_TILES, self.map_h - y0)
+        surf = pygame.Surface((cols * ts, rows * ts))
+        surf.fill(TILE_PALETTE[0])
+        for ry in range(y0, y0 + rows):
+            row = self.map_tiles[ry]
+            for rx in range(x0, x0 + cols):
+                val = row[rx] if rx < len(row) else 0
+                r = pygame.Rect((rx - x0) * ts, (ry - y0) * ts, ts, ts)
+                surf.fill(TILE_PALETTE.get(val, TILE_DEFAULT), r)
+                pygame.draw.rect(surf, TILE_BORDER, r, 1)
+        for ncy in (cy - 1, cy):
+            for ncx in (cx - 1, cx):
+                for ent in self.chunk_entities.get((ncx, ncy), ()):
+                    ex = (ent.x - x0) * ts
+                    ey = (ent.y - y0) * ts
+                    surf.blit(self._entity_sprite(ent), (ex, ey))
+                    # 작은 라벨 표시 (타입 이름)
+                    surf.blit(self._text(ent.type, (240,240,240)), (ex, ey))
+        return surf
+
+    def _get_chunk(self, cx, cy):
+        surf = self.chunks.get((cx, cy))
+        if surf is None:
+            surf = self.chunks[(cx, cy)] = self._render_chunk(cx, cy)
+        return surf
+
+    def _visible_chunks(self):
+        """화면(view_rect)에 걸친 청크 좌표 목록"""
+        chunk_px = CHUNK_TILES * self.tile_size
+        view = self.view_rect
+        first_x = max(0, self.camera[0] // chunk_px)
+        first_y = max(0, self.camera[1] // chunk_px)
+        last_x = min((self.map_w - 1) // CHUNK_TILES, (self.camera[0] + view.w - 1) // chunk_px)
+        last_y = min((self.map_h - 1) // CHUNK_TILES, (self.camera[1] + view.h - 1) // chunk_px)
+        return [(cx, cy) for cy in range(first_y, last_y + 1) for cx in range(first_x, last_x + 1)]
+
+    def _evict_chunks(self, visible):
+        """캐시된 청크가 많으면 보이는 청크에서 먼 것부터 해제"""
+        if len(self.chunks) <= MAX_CACHED_CHUNKS or not visible:
+            return
+        vx = sum(c[0] for c in visible) / len(visible)
+        vy = sum(c[1] for c in visible) / len(visible)
+        far = sorted(self.chunks, key=lambda c: abs(c[0] - vx) + abs(c[1] - vy), reverse=True)
+        for key in far[:len(self.chunks) - MAX_CACHED_CHUNKS]:
+            del self.chunks[key]
+
+    def _get_level_lines(self):
+        """텍스트 보기용 줄 목록 (처음 보여줄 때 앞부분만 만들고 재사용)"""
+        if self.level_lines is None:
+            self.level_lines = pretty_lines(self.level_data, TEXT_VIEW_LINES)
+        return self.level_lines
+
+    # --- 엔티티 / 칸 점유 인덱스 ---
+    def _clear_entities(self):
+        self.entities = set()
+        self.cells = {}
+
+    def _add_entity(self, ent):
+        self.entities.add(ent)
+        self.cells.setdefault((ent.x, ent.y), []).append(ent)
+
+    def entities_at(self, x, y):
+        """(x, y) 칸에 있는 엔티티 목록 (없으면 빈 튜플)"""
+        return self.cells.get((x, y), ())
+
+    def entity_at(self, x, y, etype):
+        """(x, y) 칸에서 해당 타입의 첫 엔티티 (없으면 None)"""
+        for ent in self.cells.get((x, y), ()):
+            if ent.type == etype:
+                return ent
+        return None
+
+    def _remove_entity(self, ent):
+        """엔티티 제거: 인덱스에서 빼고, 그 엔티티가 그려진 청크(자기 청크와 라벨이 넘어간 오른쪽/아래 청크)만 다시 그리게 함"""
+        self.entities.discard(ent)
+        cell = self.cells.get((ent.x, ent.y))
+        if cell and ent in cell:
+            cell.remove(ent)
+            if not cell:
+                del self.cells[(ent.x, ent.y)]
+        cx, cy = self._chunk_of(ent.x, ent.y)
+        bucket = self.chunk_entities.get((cx, cy))
+        if bucket and ent in bucket:
+            bucket.remove(ent)
+        for key in ((cx, cy), (cx + 1, cy), (cx, cy + 1), (cx + 1, cy + 1)):
+            self.chunks.pop(key, None)
+
     def on_back(self):
         # 뒤로가기 동작: 메뉴에서는 창 종료, 레벨에서는 메뉴로 복귀
         if self.state == 'menu':
@@ -379,32 +687,36 @@ class MapSelector(Button):
             title_surf = self.font.render("", True, self.WHITE)
             self.screen.blit(title_surf, (self.PADDING, 56))  # 뒤로가기 버튼과 겹치지 않도록 아래로 이동
 
+            self._update_thumbnails()
+            self._update_live_rows()
             mx, my = pygame.mouse.get_pos()
-            for i, (fname, thumb) in enumerate(self.thumbnails):
+            hover_ok = self.grid_view.collidepoint((mx, my))
+            self.screen.set_clip(self.grid_view)  # 스크롤된 줄이 버튼/안내 문구 위로 나오지 않게
+            for i in self._visible_indices():
                 rect = self._get_tile_rect(i)
-                # 썸네일을 슬롯 크기에 맞춰 그리기
-                if thumb:
-                    try:
-                        scaled = pygame.transform.smoothscale(thumb, (rect.w, rect.h))
-                        self.screen.blit(scaled, scaled.get_rect(center=rect.center))
-                    except Exception:
-                        self.screen.blit(thumb, thumb.get_rect(center=rect.center))
-                else:
-                    surf = pygame.Surface((rect.w, rect.h))
-                    surf.fill(self.GRAY)
-                    self.screen.blit(surf, surf.get_rect(center=rect.center))
+                # 썸네일 (이미 슬롯 크기, 아직 로드 중이면 빈 슬롯)
+                path = self.thumb_paths[i]
+                thumb = self.thumb_loader.get(path) if path else None
+                self.screen.blit(thumb or self.placeholder, rect.topleft)
 
                 # 테두리
-                if rect.collidepoint((mx, my)):
+                if hover_ok and rect.collidepoint((mx, my)):
                     pygame.draw.rect(self.screen, self.HIGHLIGHT, rect, 4)
                 else:
                     pygame.draw.rect(self.screen, self.LIGHT_GRAY, rect, 2)
 
-                # 라벨
-                label = fname if fname else self.map_labels[i]
-                label_surf = self.font.render(label, True, self.WHITE)
+                # 라벨 (보이는 줄만 만들어서 캐시)
+                label_surf = self._get_label_surf(i)
                 label_pos = (rect.x + (rect.w - label_surf.get_width()) // 2, rect.y + rect.h + 4)
                 self.screen.blit(label_surf, label_pos)
+            self.screen.set_clip(None)
+
+            # 스크롤 막대 (레벨이 한 화면보다 많을 때만)
+            if self.max_scroll > 0:
+                track_h = self.grid_view.h
+                bar_h = max(30, track_h * track_h // (track_h + self.max_scroll))
+                bar_y = self.grid_view.top + (track_h - bar_h) * self.scroll_y // self.max_scroll
+                pygame.draw.rect(self.screen, self.GRAY, (self.WIDTH - 10, bar_y, 6, bar_h))
         elif self.state == 'main_menu':
             # 메인 메뉴 전용 그리기
             title_surf = self.title_font.render("맵 선택기", True, self.WHITE)
@@ -427,68 +739,13 @@ class MapSelector(Button):
  
             if self.map_tiles:
                 ox, oy = self.map_offset
-                # 기본 팔레트: 타일 id -> 색
-                palette = {
-                    0: (30, 30, 30),      # 빈
-                    1: (120, 120, 120),   # 벽
-                    2: (200, 180, 80),    # 바닥(원래 아이템 표시는 엔티티로 분리됨)
-                    3: (80, 160, 220),    # 물
-                    4: (200, 80, 80),     # 적(엔티티로 분리)
-                }
-                # 타일 그리기
-                for ry, row in enumerate(self.map_tiles):
-                    for rx in range(self.map_w):
-                        try:
-                            val = row[rx] if rx < len(row) else 0
-                        except Exception:
-                            val = 0
-                        color = palette.get(val, (50, 50, 50))
-                        r = pygame.Rect(ox + rx * self.tile_size, oy + ry * self.tile_size, self.tile_size, self.tile_size)
-                        pygame.draw.rect(self.screen, color, r)
-                        pygame.draw.rect(self.screen, (40,40,40), r, 1)
-                # 엔티티 그리기 (아이템/적)
-                def name_to_rgb(name):
-                    if not name:
-                        return None
-                    n = str(name).strip().lower()
-                    m = {
-                        'white': (255,255,255), 'black': (0,0,0), 'red': (200,50,50),
-                        'green': (80,200,120), 'blue': (80,160,220), 'yellow': (230,200,60),
-                        'cyan': (80,200,200), 'magenta': (200,80,180), 'orange': (255,160,60),
-                        'gray': (150,150,150)
-                    }
-                    if n in m:
-                        return m[n]
-                    # hex like #RRGGBB
-                    if n.startswith('#') and len(n) == 7:
-                        try:
-                            r = int(n[1:3],16); g = int(n[3:5],16); b = int(n[5:7],16)
-                            return (r,g,b)
-                        except Exception:
-                            return None
-                    return None
-
-                for ent in self.entities:
-                    ex = ox + ent['x'] * self.tile_size
-                    ey = oy + ent['y'] * self.tile_size
-                    size = max(6, self.tile_size - 6)
-                    er = pygame.Rect(ex + (self.tile_size - size)//2, ey + (self.tile_size - size)//2, size, size)
-                    ent_color = name_to_rgb(ent.get('color')) or ((230,200,60) if ent['type']=='item' else (200,80,80))
-                    if ent['type'] == 'item':
-                        pygame.draw.ellipse(self.screen, ent_color, er)
-                        pygame.draw.ellipse(self.screen, (120,100,20), er, 2)
-                    elif ent['type'] == 'enemy':
-                        pygame.draw.rect(self.screen, ent_color, er)
-                        pygame.draw.rect(self.screen, (120,20,20), er, 2)
-                    else:
-                        pygame.draw.circle(self.screen, ent_color, er.center, size//2)
-                    # 작은 라벨 표시 (타입 대신 원래 키가 있으면 meta에서 표시 가능)
-                    try:
-                        lbl_txt = ent.get('type','')
-                        lbl = self.font.render(lbl_txt, True, (240,240,240))
-                        self.screen.blit(lbl, (ex, ey))
-                    except Exception:
-                        pass
+                # 화면에 걸친 청크만 blit (청크는 처음 보일 때 한 번 그림, 엔티티가 바뀐 청크만 다시 그림)
+                self.screen.set_clip(self.view_rect)
+                chunk_px = CHUNK_TILES * self.tile_size
+                visible = self._visible_chunks()
+                for cx, cy in visible:
+                    self.screen.blit(self._get_chunk(cx, cy), (ox + cx * chunk_px, oy + cy * chunk_px))
+                self._evict_chunks(visible)
                 # 플레이어 그리기
                 if self.player:
                     px = ox + self.player['x'] * self.tile_size
@@ -498,21 +755,18 @@ class MapSelector(Button):
                     l = max(6, self.tile_size//2)
                     pygame.draw.line(self.screen, (80,200,120), (cx-l, cy), (cx+l, cy), 3)
                     pygame.draw.line(self.screen, (80,200,120), (cx, cy-l), (cx, cy+l), 3)
-                    try:
-                        pl = self.font.render("PLAYER", True, (200,255,220))
-                        self.screen.blit(pl, (px, py - pl.get_height()))
-                    except Exception:
-                        pass
+                    pl = self._text("PLAYER", (200,255,220))
+                    self.screen.blit(pl, (px, py - pl.get_height()))
+                self.screen.set_clip(None)
                 # HUD: 수집한 아이템 수
-                hud = f"Items: {self.collected_items}"
-                hud_s = self.font.render(hud, True, (220,220,220))
+                hud_s = self._text(f"Items: {self.collected_items}", (220,220,220))
                 self.screen.blit(hud_s, (self.PADDING, 92))
             else:
                 # JSON 텍스트 출력 (스크롤 기능은 간단화)
                 start_y = 110
                 line_h = self.font.get_linesize()
                 max_lines = (self.HEIGHT - start_y - 40) // line_h
-                for idx, line in enumerate(self.level_lines[:max_lines]):
+                for idx, line in enumerate(self._get_level_lines()[:max_lines]):
                     try:
                         surf = self.font.render(line, True, self.WHITE)
                     except Exception:
@@ -525,7 +779,7 @@ class MapSelector(Button):
         hint = "ESC: 종료"
         hint_surf = self.font.render(hint, True, (180,180,180))
         self.screen.blit(hint_surf, (self.WIDTH - hint_surf.get_width() - self.PADDING, self.HEIGHT - 30))
-        pygame.display.flip()
+        present()
 
     def run(self):
         while self.running:
@@ -540,6 +794,16 @@ class MapSelector(Button):
                                 self.on_back()
                             else:
                                 self.running = False
+                        # 메뉴 스크롤: PageUp/PageDown/Home/End
+                        if self.state == 'menu':
+                            if event.key == pygame.K_PAGEDOWN:
+                                self.scroll_by(self.ROWS * self.ROW_PITCH)
+                            elif event.key == pygame.K_PAGEUP:
+                                self.scroll_by(-self.ROWS * self.ROW_PITCH)
+                            elif event.key == pygame.K_HOME:
+                                self.scroll_by(-self.max_scroll)
+                            elif event.key == pygame.K_END:
+                                self.scroll_by(self.max_scroll)
                         # 플레이어 이동: 화살표 / WASD
                         if self.state == 'level' and self.player:
                             if event.key in (pygame.K_LEFT, pygame.K_a):
@@ -550,15 +814,18 @@ class MapSelector(Button):
                                 self._move_player(0, -1)
                             elif event.key in (pygame.K_DOWN, pygame.K_s):
                                 self._move_player(0, 1)
+                    elif event.type == pygame.MOUSEWHEEL and self.state == 'menu':
+                        self.scroll_by(-event.y * self.ROW_PITCH // 2)
                     # 버튼 이벤트 처리
                     self.back_button.handle_event(event)
                     if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                         mx, my = event.pos
                         if self.state == 'menu':
-                            for i in range(self.MAP_COUNT):
+                            # 잘려서 안 보이는 부분(버튼/안내 문구 쪽)은 슬롯 클릭으로 치지 않음
+                            for i in (self._visible_indices() if self.grid_view.collidepoint((mx, my)) else ()):
                                 rect = self._get_tile_rect(i)
                                 if rect.collidepoint((mx, my)):
-                                    print("선택된 맵 인덱스:", i, "파일:", self.thumbnails[i][0], "명령:", self.commands[i])
+                                    print("선택된 맵 인덱스:", i, "파일:", self.image_files[i], "명령:", self.commands[i])
                                     # JSON 파일은 내부 로드로 처리
                                     self.load_level(self.commands[i])
                                     break
@@ -577,6 +844,7 @@ class MapSelector(Button):
             except Exception:
                 traceback.print_exc()
                 self.running = False
+        self.thumb_loader.shutdown()
         pygame.quit()
         try:
             sys.exit(0)
@@ -597,16 +865,16 @@ class MapSelector(Button):
             target = 0
         if target == 1:
             return
-        # 이동 처리
+        # 이동 처리 (카메라가 플레이어를 따라감)
         self.player['x'] = nx
         self.player['y'] = ny
-        # 아이템과 충돌 검사: 엔티티 리스트에서 item을 제거하면 수집
-        for i, ent in enumerate(self.entities):
-            if ent['x'] == nx and ent['y'] == ny and ent['type'] == 'item':
-                del self.entities[i]
-                self.collected_items += 1
-                print("아이템 획득, 총:", self.collected_items)
-                break
+        self._update_camera()
+        # 아이템과 충돌 검사: 칸 점유 인덱스로 바로 조회, item을 제거하면 수집
+        item = self.entity_at(nx, ny, 'item')
+        if item is not None:
+            self._remove_entity(item)
+            self.collected_items += 1
+            print("아이템 획득, 총:", self.collected_items)
 
 if __name__ == "__main__":
     selector = MapSelector()
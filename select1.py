@@ -1,11 +1,11 @@
 import pygame
 import os
-import sys
-import subprocess
 import traceback
-import json
 
-pygame.init()
+from catalog import load_catalog
+from level_cache import load_json
+from pack import get_store
+from thumbnails import generate_thumbnails, ThumbnailLoader
 
 # 색 정의 
 WHITE = (255, 255, 255)
@@ -52,14 +52,17 @@ class Button:
 
 
 # MapSelector는 Button을 상속받아 기본 UI 속성(화면/폰트 등)을 공유하도록 함
+# 씬 매니저(scenes.py)의 첫 씬으로 실행되며, 레벨/에디터는 같은 창에서 씬으로 전환
 class MapSelector(Button):
-    def __init__(self, width=1280, height=720):
+    def __init__(self, width=1280, height=720, manager=None):
+        if manager is None:
+            from scenes import SceneManager
+            manager = SceneManager((width, height))
+        self.manager = manager
         # 임시 rect, label로 Button 초기화 (MapSelector는 전체 UI 담당)
-        screen = pygame.display.set_mode((width, height))
-        super().__init__(screen, (0, 0, 0, 0), "", pygame.font.SysFont('malgungothic', 20))
+        super().__init__(manager.screen, (0, 0, 0, 0), "", manager.get_font(20))
         self.WIDTH = width
         self.HEIGHT = height
-        pygame.display.set_caption('맵 선택창')
 
         # 색상
         self.WHITE = (255, 255, 255)
@@ -72,8 +75,11 @@ class MapSelector(Button):
         self.IMG_DIR = os.path.join(self.BASE_DIR, "picture")
         self.MAP_DIR = self.BASE_DIR
 
+        # 레벨 카탈로그 (levels_index.json, 바뀐 레벨만 다시 읽음)
+        self.catalog = load_catalog(self.MAP_DIR)
+
         # 그리드
-        self.MAP_COUNT = 8
+        self.MAP_COUNT = len(self.catalog)
         self.COLS = 4
         self.ROWS = 2
         self.PADDING = 20
@@ -90,15 +96,20 @@ class MapSelector(Button):
         self.SLOT_W = int(self.TILE_W * self.SLOT_SCALE)
         self.SLOT_H = int(self.TILE_H * self.SLOT_SCALE)
 
-        # 라벨·명령: Level 0 ~ Level 7, 파일은 level_0.json ~ level_7.json
-        self.map_labels = [f"Level {i}" for i in range(0, self.MAP_COUNT)]
-        self.commands = [f"level_{i}.json" for i in range(0, self.MAP_COUNT)]
-        self.commands = (self.commands + [""] * self.MAP_COUNT)[:self.MAP_COUNT]
+        # 라벨·명령: 카탈로그 순서 (파일은 level_N.json)
+        self.map_labels = [entry["label"] for entry in self.catalog]
+        self.commands = [entry["file"] for entry in self.catalog]
 
-        # 이미지/섬네일
+        # 이미지/섬네일 (스레드 풀에서 디코드, 슬롯 크기로 한 번만 축소해서 보관)
         self.image_files = self._get_image_files()
         self.image_files = (self.image_files + [""] * self.MAP_COUNT)[:self.MAP_COUNT]
-        self.thumbnails = self._load_thumbnails()
+        self.thumb_paths = [os.path.join(self.IMG_DIR, fname) if fname else None for fname in self.image_files]
+        self.thumb_loader = ThumbnailLoader((self.SLOT_W, self.SLOT_H))
+        self.placeholder = pygame.Surface((self.SLOT_W, self.SLOT_H))
+        self.placeholder.fill(self.GRAY)
+        # 이미지가 없는 레벨은 레벨 JSON으로 렌더링한 썸네일 사용 (생성도 백그라운드, 그동안은 빈 슬롯)
+        missing = [entry for entry, fname in zip(self.catalog, self.image_files) if not fname]
+        self.thumb_gen_job = self.thumb_loader.submit(generate_thumbnails, missing, self.MAP_DIR, (self.SLOT_W, self.SLOT_H)) if missing else None
 
         # 뒤로가기 버튼 (좌상단) — 동작은 상태에 따라 분기
         back_rect = (10, 10, 120, 36)
@@ -110,37 +121,41 @@ class MapSelector(Button):
         self.current_level = None
         self.level_data = None
         self.level_lines = []
-        
-        # 상태
-        self.clock = pygame.time.Clock()
-        self.running = True
+        self.hover_index = None  # 마우스를 올린 슬롯 (백그라운드 프리페치 대상)
 
     def _get_image_files(self):
         exts = {'.png', '.jpg', '.jpeg', '.bmp', '.gif'}
-        if not os.path.isdir(self.IMG_DIR):
-            return []
-        files = [f for f in sorted(os.listdir(self.IMG_DIR)) if os.path.splitext(f)[1].lower() in exts]
-        return files
-
-    def _load_thumbnails(self):
-        thumbs = []
-        for fname in self.image_files:
-            if fname:
-                path = os.path.join(self.IMG_DIR, fname)
-                try:
-                    img = pygame.image.load(path).convert_alpha()
-                    thumb = pygame.transform.smoothscale(img, (self.TILE_W, self.TILE_H))
-                    thumbs.append((fname, thumb))
-                except Exception as e:
-                    print("이미지 로드 실패:", path, e)
-                    surf = pygame.Surface((self.TILE_W, self.TILE_H))
-                    surf.fill(self.GRAY)
-                    thumbs.append((fname, surf))
+        files = []
+        store = get_store()
+        packed = store.list_names("picture/*")
+        if packed:
+            files = [n.split("/", 1)[1] for n in packed if os.path.splitext(n)[1].lower() in exts]
+        elif os.path.isdir(self.IMG_DIR):
+            files = [f for f in sorted(os.listdir(self.IMG_DIR)) if os.path.splitext(f)[1].lower() in exts]
+        # 카탈로그에 썸네일이 지정된 레벨은 그 파일, 나머지는 picture/ 폴더 순서대로 사용
+        result = []
+        for i, entry in enumerate(self.catalog):
+            if entry.get("thumbnail"):
+                result.append(entry["thumbnail"])
+            elif i < len(files):
+                result.append(files[i])
             else:
-                surf = pygame.Surface((self.TILE_W, self.TILE_H))
-                surf.fill(self.GRAY)
-                thumbs.append((fname, surf))
-        return thumbs
+                result.append("")
+        return result
+
+    def _update_thumbnails(self):
+        """백그라운드 썸네일 작업 결과 반영 (프레임마다 호출)"""
+        if self.thumb_gen_job is not None and self.thumb_gen_job.done():
+            try:
+                generated = self.thumb_gen_job.result()
+            except Exception as e:
+                print("썸네일 생성 실패:", e)
+                generated = {}
+            for i, entry in enumerate(self.catalog):
+                if self.thumb_paths[i] is None and entry["file"] in generated:
+                    self.thumb_paths[i] = generated[entry["file"]]
+            self.thumb_gen_job = None
+        self.thumb_loader.poll()
 
     def _get_tile_rect(self, index):
         col = index % self.COLS
@@ -151,11 +166,23 @@ class MapSelector(Button):
         y = cell_y + (self.TILE_H - self.SLOT_H) // 2
         return pygame.Rect(x, y, self.SLOT_W, self.SLOT_H)
 
+    # --- 씬 인터페이스 ---
+    def enter(self):
+        self.manager.set_caption('맵 선택창')
+
+    def resume(self):
+        # 레벨/에디터에서 돌아왔을 때
+        self.manager.set_caption('맵 선택창')
+        self.state = 'menu'
+
+    def leave(self):
+        self.thumb_loader.shutdown()
+
     def on_back(self):
         """뒤로가기 동작: 메뉴에서는 창 종료, 레벨에서는 메뉴로 복귀"""
         if self.state == 'menu':
             print("뒤로가기(종료) 클릭됨")
-            self.running = False
+            self.manager.quit()
         else:
             print("레벨에서 뒤로가기 -> 메뉴로")
             self.state = 'menu'
@@ -164,34 +191,22 @@ class MapSelector(Button):
             self.level_lines = []
 
     def launch_game(self):
-        """로드된 레벨 데이터를 게임 프로그램으로 전달하여 실행"""
+        """로드된 레벨을 레벨 플레이 씬으로 실행 (같은 창/프로세스에서 전환)"""
         if not self.current_level:
             print("레벨이 로드되지 않았습니다.")
             return
         
         try:
-            # 게임 프로그램 경로
-            game_script = os.path.join(self.BASE_DIR, "level_play.py")
-            
-            if not os.path.exists(game_script):
-                print(f"게임 파일을 찾을 수 없습니다: {game_script}")
-                return
-            
             # 레벨 파일 경로
             level_path = os.path.join(self.MAP_DIR, self.current_level)
             
-            if not os.path.exists(level_path):
+            if not get_store().exists(level_path):
                 print(f"레벨 파일을 찾을 수 없습니다: {level_path}")
                 return
             
-            # 게임 프로그램 실행
-            print(f"게임 실행 시도: {game_script}")
+            # 레벨 플레이 씬으로 전환
             print(f"레벨 파일: {level_path}")
-            
-            if os.name == 'nt':  # Windows
-                subprocess.Popen(['python', game_script, level_path])
-            else:  # Mac/Linux
-                subprocess.Popen(['python3', game_script, level_path])
+            self.manager.play_level(level_path)
             
             print(f"✅ 게임 실행 완료: {self.current_level}")
             
@@ -206,16 +221,17 @@ class MapSelector(Button):
             return
         
         path = filename if os.path.isabs(filename) else os.path.join(self.MAP_DIR, filename)
+        exists = get_store().exists(path)
         print("load_level 호출 ->", {"filename": filename, "MAP_DIR": self.MAP_DIR, 
-                                      "path": path, "exists": os.path.exists(path)})
+                                      "path": path, "exists": exists})
         
-        if not os.path.exists(path):
+        if not exists:
             print("레벨 파일이 존재하지 않음:", path)
             return
         
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # 컴파일된 캐시 또는 팩에서 불러오기
+            data = load_json(path)
             
             print("JSON 로드 완료. 타입:", type(data).__name__)
             if isinstance(data, dict):
@@ -234,7 +250,7 @@ class MapSelector(Button):
             print("레벨 로드 실패:", path, e)
             traceback.print_exc()
 
-    def draw(self):
+    def draw(self, surface=None):
         self.screen.fill((20, 20, 20))
         
         if self.state == 'menu':
@@ -242,20 +258,15 @@ class MapSelector(Button):
             self.screen.blit(title_surf, (self.PADDING, 56))
 
             mx, my = pygame.mouse.get_pos()
-            for i, (fname, thumb) in enumerate(self.thumbnails):
+            self._update_thumbnails()
+            for i in range(self.MAP_COUNT):
                 rect = self._get_tile_rect(i)
+                fname = self.image_files[i]
                 
-                # 썸네일 그리기
-                if thumb:
-                    try:
-                        scaled = pygame.transform.smoothscale(thumb, (rect.w, rect.h))
-                        self.screen.blit(scaled, scaled.get_rect(center=rect.center))
-                    except Exception:
-                        self.screen.blit(thumb, thumb.get_rect(center=rect.center))
-                else:
-                    surf = pygame.Surface((rect.w, rect.h))
-                    surf.fill(self.GRAY)
-                    self.screen.blit(surf, surf.get_rect(center=rect.center))
+                # 썸네일 (이미 슬롯 크기, 아직 로드 중이면 빈 슬롯)
+                path = self.thumb_paths[i]
+                thumb = self.thumb_loader.get(path) if path else None
+                self.screen.blit(thumb or self.placeholder, rect.topleft)
 
                 # 테두리
                 if rect.collidepoint((mx, my)):
@@ -272,50 +283,52 @@ class MapSelector(Button):
         # 뒤로가기 버튼 그리기 (항상 표시)
         self.back_button.draw()
 
-        hint = "ESC: 종료"
+        hint = "ESC: 종료 | E: 맵 에디터"
         hint_surf = self.font.render(hint, True, (180, 180, 180))
         self.screen.blit(hint_surf, (self.WIDTH - hint_surf.get_width() - self.PADDING, self.HEIGHT - 30))
-        pygame.display.flip()
 
-    def run(self):
-        while self.running:
-            try:
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        self.running = False
-                    elif event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_ESCAPE:
-                            if self.state == 'level':
-                                self.on_back()
-                            else:
-                                self.running = False
-                    
-                    # 버튼 이벤트 처리
-                    self.back_button.handle_event(event)
-                    
-                    if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                        mx, my = event.pos
-                        if self.state == 'menu':
-                            for i in range(self.MAP_COUNT):
-                                rect = self._get_tile_rect(i)
-                                if rect.collidepoint((mx, my)):
-                                    print("선택된 맵 인덱스:", i, "파일:", self.thumbnails[i][0], 
-                                          "명령:", self.commands[i])
-                                    # JSON 파일은 내부 로드로 처리
-                                    self.load_level(self.commands[i])
-                                    break
-                
-                self.draw()
-                self.clock.tick(60)
-            except Exception:
-                traceback.print_exc()
-                self.running = False
+    def handle_event(self, event):
+        """이벤트 하나 처리 (씬 매니저가 호출)"""
+        if event.type == pygame.QUIT:
+            self.manager.quit()
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                if self.state == 'level':
+                    self.on_back()
+                else:
+                    self.manager.quit()
+            elif event.key == pygame.K_e and self.state == 'menu':
+                self.manager.open_editor()
+                return
+        
+        # 버튼 이벤트 처리
+        self.back_button.handle_event(event)
+        
+        # 마우스를 올린 레벨은 클릭하기 전에 미리 준비
+        if event.type == pygame.MOUSEMOTION and self.state == 'menu':
+            hovered = next((i for i in range(self.MAP_COUNT) if self._get_tile_rect(i).collidepoint(event.pos)), None)
+            if hovered is not None and hovered != self.hover_index:
+                path = os.path.join(self.MAP_DIR, self.commands[hovered])
+                self.manager.prefetcher.prefetch_level(path, self.catalog[hovered])
+            self.hover_index = hovered
         
-        pygame.quit()
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            mx, my = event.pos
+            if self.state == 'menu':
+                for i in range(self.MAP_COUNT):
+                    rect = self._get_tile_rect(i)
+                    if rect.collidepoint((mx, my)):
+                        print("선택된 맵 인덱스:", i, "파일:", self.image_files[i], 
+                              "명령:", self.commands[i])
+                        # JSON 파일은 내부 로드로 처리
+                        self.load_level(self.commands[i])
+                        break
+
+    def run(self):
         try:
-            sys.exit(0)
-        except SystemExit:
-            pass
+            self.manager.run(self)
+        except Exception:
+            traceback.print_exc()
 
 
 if __name__ == "__main__":
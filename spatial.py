@@ -0,0 +1,81 @@
+"""
+격자 칸 단위 공간 인덱스 (맵 에디터 범위 선택/지우개/채우기용)
+- 칸 (x // cell, y // cell) -> 그 칸에 있는 오브젝트들
+- 추가/삭제/이동 O(1), 범위 조회는 범위에 걸친 칸 수(또는 오브젝트가 있는 칸 수) 만큼만
+"""
+
+from utils import RADIUS as NEAR_RADIUS
+
+# 상수
+DEFAULT_CELL = 25
+
+
+class SpatialIndex:
+    """오브젝트 위치(x, y) 인덱스 (오브젝트마다 태그(리스트 이름)를 함께 보관)"""
+
+    def __init__(self, cell_size=DEFAULT_CELL):
+        self.cell_size = cell_size
+        self.cells = {}  # (칸 x, 칸 y) -> {id(obj): (태그, obj)}
+        self.keys = {}   # id(obj) -> (칸 x, 칸 y)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, obj):
+        return id(obj) in self.keys
+
+    def _key(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def add(self, obj, tag):
+        key = self._key(obj.x, obj.y)
+        self.cells.setdefault(key, {})[id(obj)] = (tag, obj)
+        self.keys[id(obj)] = key
+
+    def remove(self, obj):
+        """인덱스에서 제거 (위치는 추가할 때 기록한 칸 사용, 없으면 무시)"""
+        key = self.keys.pop(id(obj), None)
+        if key is None:
+            return
+        bucket = self.cells.get(key)
+        if bucket is not None:
+            bucket.pop(id(obj), None)
+            if not bucket:
+                del self.cells[key]
+
+    def update(self, obj):
+        """위치가 바뀐 오브젝트 다시 넣기"""
+        key = self.keys.get(id(obj))
+        if key is None:
+            return
+        tag = self.cells[key][id(obj)][0]
+        self.remove(obj)
+        self.add(obj, tag)
+
+    def clear(self):
+        self.cells.clear()
+        self.keys.clear()
+
+    def query_rect(self, left, top, right, bottom):
+        """사각형 안(경계 포함)에 위치한 오브젝트 [(태그, obj)]"""
+        kx0, ky0 = self._key(left, top)
+        kx1, ky1 = self._key(right, bottom)
+        found = []
+        if (kx1 - kx0 + 1) * (ky1 - ky0 + 1) <= len(self.cells):
+            keys = ((kx, ky) for ky in range(ky0, ky1 + 1) for kx in range(kx0, kx1 + 1))
+            buckets = (self.cells.get(key) for key in keys)
+        else:
+            # 범위가 넓으면 오브젝트가 있는 칸만 확인
+            buckets = (bucket for (kx, ky), bucket in self.cells.items()
+                       if kx0 <= kx <= kx1 and ky0 <= ky <= ky1)
+        for bucket in buckets:
+            if not bucket:
+                continue
+            for tag, obj in bucket.values():
+                if left <= obj.x <= right and top <= obj.y <= bottom:
+                    found.append((tag, obj))
+        return found
+
+    def query_near(self, x, y, r=NEAR_RADIUS):
+        """(x, y)에서 가로/세로 r 안에 있는 오브젝트 (기본 반경이면 utils.near와 같은 기준)"""
+        return self.query_rect(x - r, y - r, x + r, y + r)
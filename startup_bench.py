@@ -0,0 +1,110 @@
+"""
+시작 시간 벤치마크 (프로세스 시작 ~ 첫 프레임)
+- 각 진입점을 헤드리스(SDL 더미 드라이버)로 여러 번 실행해서 첫 프레임을 내보내기까지 걸린 시간을 측정
+- 자식 프로세스는 runtime.present()에서 첫 프레임 시간을 출력하고, 그 줄을 읽으면 바로 종료시킴
+- --cold: 매 실행 전에 폰트 경로 캐시(__fontcache__)를 지워서 캐시가 없을 때와 비교
+
+사용법:
+    python startup_bench.py                   # 모든 진입점 5회씩
+    python startup_bench.py --runs 10 --cold
+    python startup_bench.py level_play tool
+"""
+
+import os
+import sys
+
+# 이 폴더의 select.py가 표준 라이브러리 select를 가리지 않도록 subprocess보다 먼저 불러 둠 (아래 BOOTSTRAP 참고)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+_saved_path = sys.path[:]
+sys.path[:] = [p for p in sys.path if os.path.abspath(p or os.curdir) != BASE_DIR]
+import select  # noqa: F401
+sys.path[:] = _saved_path
+
+import time
+import shutil
+import argparse
+import statistics
+import subprocess
+
+# 상수 (runtime.py와 같은 값, pygame을 불러오지 않도록 복사)
+HEADLESS_ENV = "BYEOLMURI_HEADLESS"
+STARTUP_ENV = "BYEOLMURI_STARTUP_T0"
+STARTUP_MARK = "[startup] first_frame_ms="
+FONT_CACHE_DIR = os.path.join(BASE_DIR, "__fontcache__")
+TIMEOUT = 60  # 한 번 실행 제한 시간 (초)
+
+# 이름 -> 스크립트와 인자
+TARGETS = {
+    "select1": ["select1.py"],
+    "level_play": ["level_play.py", "level_0.json"],
+    "tool": ["tool..py"],
+    "select": ["select.py"],
+}
+
+# 자식 프로세스 시작 코드
+# 스크립트 폴더가 sys.path에 먼저 들어가면 이 프로젝트의 select.py가 표준 라이브러리 select를 가리므로
+# (POSIX에서는 pygame -> subprocess가 select를 import) 표준 모듈을 먼저 불러 둔 뒤 스크립트를 실행
+BOOTSTRAP = (
+    "import sys, os, runpy\n"
+    "script = sys.argv[1]\n"
+    "sys.path[:] = [p for p in sys.path if p not in ('', os.getcwd())]\n"
+    "import select\n"
+    "sys.path.insert(0, os.path.dirname(os.path.abspath(script)))\n"
+    "sys.argv = sys.argv[1:]\n"
+    "runpy.run_path(script, run_name='__main__')\n"
+)
+
+
+def run_once(args):
+    """
+    한 번 실행해서 첫 프레임까지 걸린 시간(ms) 반환 (첫 프레임이 안 나오면 None)
+    """
+    env = dict(os.environ)
+    env.update({"SDL_VIDEODRIVER": "dummy", "SDL_AUDIODRIVER": "dummy", HEADLESS_ENV: "1",
+                "PYTHONUNBUFFERED": "1"})
+    env[STARTUP_ENV] = repr(time.time())
+    proc = subprocess.Popen([sys.executable, "-c", BOOTSTRAP] + args, cwd=BASE_DIR, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                            text=True, encoding="utf-8", errors="replace")
+    deadline = time.monotonic() + TIMEOUT
+    result = None
+    try:
+        for line in proc.stdout:
+            if line.startswith(STARTUP_MARK):
+                result = float(line[len(STARTUP_MARK):])
+                break
+            if time.monotonic() > deadline:
+                break
+    finally:
+        proc.kill()
+        proc.wait()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시작 시간 벤치마크 (첫 프레임까지)")
+    parser.add_argument("targets", nargs="*", default=list(TARGETS), help=f"측정할 진입점 ({', '.join(TARGETS)})")
+    parser.add_argument("--runs", type=int, default=5, help="진입점마다 실행 횟수")
+    parser.add_argument("--cold", action="store_true", help="매 실행 전에 폰트 경로 캐시 삭제")
+    args = parser.parse_args(argv)
+
+    print(f"{'진입점':<12}{'중앙값(ms)':>12}{'최소(ms)':>12}{'최대(ms)':>12}")
+    for name in args.targets:
+        if name not in TARGETS:
+            print(f"[벤치마크] 알 수 없는 진입점: {name}")
+            continue
+        times = []
+        for _ in range(args.runs):
+            if args.cold:
+                shutil.rmtree(FONT_CACHE_DIR, ignore_errors=True)
+            elapsed = run_once(TARGETS[name])
+            if elapsed is not None:
+                times.append(elapsed)
+        if not times:
+            print(f"{name:<12}{'실패':>12}")
+            continue
+        print(f"{name:<12}{statistics.median(times):>12.1f}{min(times):>12.1f}{max(times):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
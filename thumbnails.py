@@ -0,0 +1,213 @@
+"""
+레벨 썸네일 자동 생성
+- 레벨 JSON을 오프스크린으로 렌더링 (오브젝트 + 초기 빛 경로) 후 슬롯 크기로 축소
+- 결과는 __thumbcache__/<내용 해시>_<가로>x<세로>.png 로 저장
+- 내용 해시가 바뀐 레벨만 다시 렌더링 (카탈로그의 hash 사용)
+- 렌더링은 별도 프로세스 풀에서 실행 (각 워커가 level_play를 헤드리스로 사용)
+- ThumbnailLoader: 맵 선택창용 비동기 로더 (스레드 풀 디코드, 슬롯 크기로 한 번만 축소, 개수 제한 캐시)
+
+사용법:
+    python thumbnails.py                 # 카탈로그 전체 썸네일 생성 (기본 크기)
+    python thumbnails.py --size 221x233  # 크기 지정
+"""
+
+import os
+import sys
+import argparse
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# 상수
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+THUMB_DIR = os.path.join(BASE_DIR, "__thumbcache__")
+DEFAULT_SIZE = (221, 233)  # 맵 선택창 슬롯 크기 (1280x720 기준)
+LOADER_WORKERS = 2
+LOADER_MAX_ITEMS = 64
+BACKGROUND = (30, 30, 30)
+
+
+def thumb_path(entry, size, thumb_dir=THUMB_DIR):
+    """카탈로그 항목에 대응하는 썸네일 캐시 경로"""
+    w, h = size
+    return os.path.join(thumb_dir, f"{entry['hash']}_{w}x{h}.png")
+
+
+def render_level(level_path, size):
+    """
+    레벨 하나를 오프스크린 Surface로 렌더링 (워커 프로세스에서 실행)
+
+    Returns:
+        size 크기의 pygame.Surface
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    import level_play as lp
+
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+    lp.load_level(level_path, play_bgm=False)
+    surface = pygame.Surface((lp.WIDTH, lp.HEIGHT))
+    surface.fill(BACKGROUND)
+    lp.draw_grid(surface)
+    for group in (lp.blackholes, lp.mirrors, lp.lenses, lp.portals_a, lp.portals_b,
+                  lp.emitters, lp.targets):
+        for obj in group:
+            obj.draw(surface)
+    lp.simulate_light(surface)
+
+    # UI 영역을 뺀 그리드 부분만 잘라서 슬롯 크기로 축소 (첫 줄/칸 오브젝트가 잘리지 않게 반 칸 여유)
+    left = lp.GRID_OFFSET_X - lp.GRID_SIZE // 2
+    top = lp.GRID_OFFSET_Y - lp.GRID_SIZE // 2
+    area = pygame.Rect(left, top, lp.WIDTH - left, lp.HEIGHT - top)
+    return pygame.transform.smoothscale(surface.subsurface(area), size)
+
+
+def _render_job(level_path, out_path, size):
+    """워커 작업: 렌더링 후 PNG로 저장 (임시 파일 -> 교체)"""
+    import pygame
+    surf = render_level(level_path, size)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = out_path[:-4] + ".tmp.png"
+    pygame.image.save(surf, tmp_path)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def generate_thumbnails(entries, level_dir, size=DEFAULT_SIZE, thumb_dir=THUMB_DIR, workers=None):
+    """
+    카탈로그 항목들의 썸네일 준비 (이미 있는 것은 건너뜀)
+
+    Parameters:
+        entries: catalog.load_catalog() 결과
+        level_dir: 레벨 파일 폴더
+        size: (가로, 세로) 슬롯 크기
+
+    Returns:
+        {레벨 파일명: 썸네일 경로} (렌더링 실패한 레벨은 제외)
+    """
+    result = {}
+    missing = []
+    for entry in entries:
+        path = thumb_path(entry, size, thumb_dir)
+        if os.path.isfile(path):
+            result[entry["file"]] = path
+        else:
+            missing.append((entry, path))
+
+    if not missing:
+        return result
+
+    print(f"[썸네일] {len(missing)}개 레벨 렌더링")
+    workers = workers or min(len(missing), os.cpu_count() or 1)
+    # spawn: 부모 프로세스의 pygame/디스플레이 상태를 물려받지 않도록 새 인터프리터로 시작
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        jobs = {pool.submit(_render_job, os.path.join(level_dir, entry["file"]), path, tuple(size)): entry
+                for entry, path in missing}
+        for job, entry in jobs.items():
+            try:
+                result[entry["file"]] = job.result()
+            except Exception as e:
+                print(f"[썸네일] 렌더링 실패: {entry['file']} ({e})")
+    return result
+
+
+def _decode_image(path, size):
+    """이미지 디코드 + 슬롯 크기로 축소 (로더 스레드에서 실행, 디스플레이 변환은 하지 않음)"""
+    import pygame
+    from pack import get_store
+
+    with get_store().open_stream(path) as src:
+        img = pygame.image.load(src, os.path.basename(path))
+    if img.get_size() != size:
+        try:
+            img = pygame.transform.smoothscale(img, size)
+        except ValueError:
+            # smoothscale은 24/32비트만 지원 (팔레트 이미지 등은 일반 scale)
+            img = pygame.transform.scale(img, size)
+    return img
+
+
+class ThumbnailLoader:
+    """
+    썸네일 비동기 로더
+    - request(path)로 디코드를 스레드 풀에 맡기고, get(path)로 준비된 Surface를 가져감
+    - 축소는 로드할 때 한 번만 하고, 결과는 최근 사용 순으로 max_items개까지 보관
+    - 모든 메서드는 메인 스레드에서 호출 (완료된 작업의 convert도 메인 스레드에서 처리)
+    """
+
+    def __init__(self, size, max_items=LOADER_MAX_ITEMS, workers=LOADER_WORKERS):
+        self.size = tuple(size)
+        self.max_items = max_items
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumb")
+        self.cache = OrderedDict()  # path -> Surface
+        self.pending = {}           # path -> Future
+        self.failed = set()
+
+    def submit(self, fn, *args):
+        """로더 스레드 풀에서 임의 작업 실행 (썸네일 생성 등)"""
+        return self.executor.submit(fn, *args)
+
+    def request(self, path):
+        """아직 없으면 백그라운드 디코드 요청"""
+        if path and path not in self.cache and path not in self.pending and path not in self.failed:
+            self.pending[path] = self.executor.submit(_decode_image, path, self.size)
+
+    def poll(self):
+        """끝난 디코드 결과를 캐시로 옮김 (프레임마다 한 번 호출)"""
+        import pygame
+
+        for path in [p for p, job in self.pending.items() if job.done()]:
+            job = self.pending.pop(path)
+            try:
+                surf = job.result()
+                try:
+                    surf = surf.convert_alpha() if surf.get_alpha() is not None else surf.convert()
+                except pygame.error:
+                    pass  # 디스플레이가 없으면 변환 없이 사용
+                self.cache[path] = surf
+                self.cache.move_to_end(path)
+            except Exception as e:
+                print("썸네일 로드 실패:", path, e)
+                self.failed.add(path)
+        while len(self.cache) > self.max_items:
+            self.cache.popitem(last=False)
+
+    def get(self, path):
+        """준비된 Surface (아직 없으면 None, 요청은 자동으로 함)"""
+        surf = self.cache.get(path)
+        if surf is None:
+            self.request(path)
+            return None
+        self.cache.move_to_end(path)
+        return surf
+
+    def discard(self, path):
+        """캐시/대기 중인 작업에서 제거 (화면에서 멀어진 슬롯 정리)"""
+        self.cache.pop(path, None)
+        job = self.pending.pop(path, None)
+        if job is not None:
+            job.cancel()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="레벨 썸네일 생성")
+    parser.add_argument("level_dir", nargs="?", default=BASE_DIR, help="레벨 폴더")
+    parser.add_argument("--size", default=f"{DEFAULT_SIZE[0]}x{DEFAULT_SIZE[1]}", help="썸네일 크기 (가로x세로)")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    from catalog import load_catalog
+    w, h = (int(v) for v in args.size.lower().split("x"))
+    paths = generate_thumbnails(load_catalog(args.level_dir), args.level_dir, (w, h))
+    for name, path in sorted(paths.items()):
+        print(f"{name:<16} {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,20 @@
 import pygame
-import math
-import json
+import sys
+import argparse
 
 # 모듈 임포트
 from objects import (Button, Emitter, Target, Mirror, Lens, Blackhole, Portal,
-                     COLORS, RADIUS)
-from utils import near, angle_wrap, vec_from_angle, advance, refract_angle, N_AIR
+                     RADIUS)
+from utils import angle_wrap
+from runtime import is_headless, init_pygame, create_screen, present, save_frame
+from fonts import get_font
+from level_cache import load_scene
+from history import History, splice
+from autosave import AutoSaver, journal_entry, to_record
+from beam import BeamPreview
+from beam_front import render_beam
+from scene_store import SceneStore
+from spatial import SpatialIndex
 
 # --- 기본 설정 ---
 WIDTH, HEIGHT = 1000, 700
@@ -16,12 +25,31 @@ GRID_SIZE = 25  # 그리드 한 칸의 크기 (작을수록 그리드 개수 증
 GRID_OFFSET_X = 50  # 그리드 시작 X 위치
 GRID_OFFSET_Y = 300  # 그리드 시작 Y 위치 (버튼 아래)
 
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Light Puzzle - Map Editor")
-clock = pygame.time.Clock()
-FONT = pygame.font.SysFont("Malgun Gothic", 22)
-FONT_BIG = pygame.font.SysFont("Malgun Gothic", 28)
+# 화면/폰트는 main()에서 init_display()로 생성 (임포트만으로 창이 열리지 않도록)
+screen = None
+clock = None
+FONT = None
+FONT_BIG = None
+headless = False
+
+def init_display(headless_mode=False):
+    """pygame 초기화 후 화면(헤드리스면 오프스크린 Surface)과 폰트 생성"""
+    global screen, clock, FONT, FONT_BIG, headless
+    headless = headless_mode
+    init_pygame(headless)
+    screen = create_screen((WIDTH, HEIGHT), "Light Puzzle - Map Editor", headless)
+    clock = pygame.time.Clock()
+    FONT = get_font(22)
+    FONT_BIG = get_font(28)
+    return screen
+
+def use_display(surface, font, font_big, headless_mode=False):
+    """이미 만들어진 화면/폰트 사용 (씬 매니저에서 창과 폰트를 공유할 때)"""
+    global screen, FONT, FONT_BIG, headless
+    screen = surface
+    FONT = font
+    FONT_BIG = font_big
+    headless = headless_mode
 
 # --- 그리드 함수 ---
 def snap_to_grid(x, y):
@@ -47,12 +75,37 @@ def draw_grid(surface):
 # --- 오브젝트 리스트 ---
 emitters, targets, mirrors, lenses, blackholes = [], [], [], [], []
 portals_a, portals_b = [], []  # 포탈 A(입구), B(출구)
+NAMED_LISTS = {"emitters": emitters, "targets": targets, "mirrors": mirrors, "lenses": lenses,
+               "portals_a": portals_a, "portals_b": portals_b, "blackholes": blackholes}
+OBJECT_LISTS = tuple(NAMED_LISTS.values())
+LIST_NAMES = {id(lst): name for name, lst in NAMED_LISTS.items()}
+
+# 리스트 이름 -> 생성자 (인자는 autosave.to_record 레코드 순서)
+FACTORIES = {"emitters": Emitter, "targets": Target, "mirrors": Mirror, "lenses": Lens,
+             "portals_a": lambda x, y: Portal(x, y, 'A'), "portals_b": lambda x, y: Portal(x, y, 'B'),
+             "blackholes": Blackhole}
+SINGLE_LISTS = ("emitters", "targets", "portals_a", "portals_b")  # 1개만 허용 (복제하지 않음)
+# Shift+드래그(선) / Ctrl+드래그(사각형 채우기)로 여러 칸에 배치할 수 있는 모드
+FILL_MODES = {"mirror": ("mirrors", lambda x, y: Mirror(x, y, 45)), "blackhole": ("blackholes", Blackhole)}
+SELECT_COLOR = (80, 200, 255)
+ARROW_KEYS = {pygame.K_LEFT: (-GRID_SIZE, 0), pygame.K_RIGHT: (GRID_SIZE, 0),
+              pygame.K_UP: (0, -GRID_SIZE), pygame.K_DOWN: (0, GRID_SIZE)}
 
 # --- 모드/상태 ---
-object_mode = None  # 'emitter'|'target'|'mirror'|'lens'|'blackhole'|'portal_a'|'portal_b'|'eraser'
+object_mode = None  # 'emitter'|'target'|'mirror'|'lens'|'blackhole'|'portal_a'|'portal_b'|'eraser'|'select'
 game_started = False
 input_mode = None  # 'save' | 'load' | None
 input_text = ""    # 입력 중인 맵 번호
+last_selected = None  # 각도 조절 대상
+selection = []  # 선택 도구로 고른 오브젝트 [(리스트 이름, 오브젝트)]
+drag = None     # 드래그 중: {"kind": 'box'|'move'|'line'|'fill', "mode", "start", "end"}
+# 불러온 레벨의 제한/메타데이터 (에디터에서 수정하지 않으므로 저장 시 그대로 유지)
+# map_index: 현재 편집 중인 맵 번호 (None: 이름 없는 작업, 자동 저장 대상)
+# 움직이는 오브젝트 설정은 오브젝트의 behaviour에 붙어 있음 (배치/삭제/되돌리기에도 그 오브젝트를 따라감)
+level_extras = {"limits": None, "meta": {}, "grid_cells": None, "map_index": None}
+history = History()  # 되돌리기/다시 실행 (바뀐 부분만 기록)
+autosave = AutoSaver((GRID_SIZE, GRID_OFFSET_X, GRID_OFFSET_Y))  # 편집 저널 + 백그라운드 저장
+spatial_index = SpatialIndex(GRID_SIZE)  # 오브젝트 위치 인덱스 (범위 선택, 지우개, 채우기)
 
 # --- 버튼들 ---
 btn_start     = Button( 20, 20, 120, 40, "게임 시작")
@@ -71,66 +124,347 @@ btn_load   = Button(580, 70, 120, 40, "맵 불러오기")
 # 포탈 버튼 (3번째 줄)
 btn_portal_a = Button( 20, 120, 80, 40, "포탈 A")
 btn_portal_b = Button(110, 120, 80, 40, "포탈 B")
+btn_undo     = Button(210, 120, 120, 40, "되돌리기")
+btn_redo     = Button(340, 120, 120, 40, "다시 실행")
+btn_select   = Button(470, 120, 120, 40, "선택")
 
 buttons = [btn_start, btn_emitter, btn_target, btn_mirror, btn_lens, btn_blackhole,
            btn_eraser, btn_stop, btn_clear, btn_save, btn_load,
-           btn_portal_a, btn_portal_b]
+           btn_portal_a, btn_portal_b, btn_undo, btn_redo, btn_select]
+
+# --- 편집 (되돌리기 기록과 함께) ---
+def add_object(lst, obj):
+    """오브젝트 배치"""
+    lst.append(obj)
+    history.record(splice(lst, len(lst) - 1, (), (obj,)))
+
+def erase_object(lst, obj):
+    """오브젝트 삭제"""
+    index = lst.index(obj)
+    del lst[index]
+    history.record(splice(lst, index, (obj,), ()))
+
+def clear_objects():
+    """모든 오브젝트 삭제 (되돌리기 한 번으로 복구)"""
+    ops = []
+    for lst in OBJECT_LISTS:
+        if lst:
+            ops.append(splice(lst, 0, lst, ()))
+            lst.clear()
+    history.record(("batch", ops))
+
+def erase_many(items):
+    """
+    여러 오브젝트를 한 번에 삭제 (되돌리기 한 번으로 복구)
+    리스트마다 뒤쪽부터 연속 구간 단위로 지움 (기록한 위치가 순서대로 다시 적용해도 맞음)
+
+    Parameters:
+        items: [(리스트 이름, 오브젝트)]
+    """
+    groups = {}
+    for name, obj in items:
+        groups.setdefault(name, set()).add(id(obj))
+    ops = []
+    for name, ids in groups.items():
+        lst = NAMED_LISTS[name]
+        indices = [i for i, obj in enumerate(lst) if id(obj) in ids]
+        end = len(indices)
+        while end > 0:
+            start = end - 1
+            while start > 0 and indices[start - 1] == indices[start] - 1:
+                start -= 1
+            first, last = indices[start], indices[end - 1] + 1
+            ops.append(splice(lst, first, lst[first:last], ()))
+            del lst[first:last]
+            end = start
+    history.record(("batch", ops))
+
+def place_many(name, make, points):
+    """
+    여러 칸에 한 번에 배치 (이미 오브젝트가 있는 칸은 건너뜀, 되돌리기 한 번으로 복구)
+
+    Returns:
+        배치한 개수
+    """
+    lst = NAMED_LISTS[name]
+    objs = [make(x, y) for x, y in points if not spatial_index.query_near(x, y)]
+    if objs:
+        index = len(lst)
+        lst.extend(objs)
+        history.record(splice(lst, index, (), objs))
+    return len(objs)
+
+def record_rotation(obj, old_angle):
+    """회전 기록 (같은 오브젝트를 연속으로 돌리면 기록 하나로 합침)"""
+    history.record(("attr", obj, "angle", old_angle, obj.angle), merge_key=obj)
+
+def undo():
+    history.undo()
+
+def redo():
+    history.redo()
+
+def scene_records():
+    """현재 오브젝트를 레코드 씬으로 (저장용)"""
+    return {name: [to_record(name, obj) for obj in lst] for name, lst in NAMED_LISTS.items()}
+
+def scene_extras():
+    """저장할 레벨 메타데이터 + 현재 위치 기준 움직임 설정 [(리스트 이름, 위치, 종류, 파라미터)]"""
+    behaviours = [(name, index) + obj.behaviour for name, lst in NAMED_LISTS.items()
+                  for index, obj in enumerate(lst) if getattr(obj, "behaviour", None)]
+    return dict(level_extras, behaviours=behaviours)
+
+def _is_load(op):
+    """불러오기(또는 그 되돌리기) 기록인지: 레벨 메타데이터가 함께 바뀜"""
+    if op[0] == "item":
+        return True
+    return op[0] == "batch" and any(_is_load(sub) for sub in op[1])
+
+def _on_history_change(op):
+    """편집/되돌리기가 적용될 때마다 자동 저장 저널에 기록"""
+    if _is_load(op):
+        target = level_extras["map_index"]
+        if _loading or target != autosave.target:
+            # 파일에서 불러옴 / 다른 맵으로 전환 (그 맵의 파일이 곧 기준이므로 쓸 것 없음)
+            autosave.switch(target)
+        else:
+            # 같은 맵 위에서 불러오기를 되돌림 -> 장면이 통째로 바뀌므로 저널 대신 전체 쓰기
+            autosave.write_scene(target, scene_records(), scene_extras())
+        return
+    entry = journal_entry(op, NAMED_LISTS)
+    if entry is not None:
+        autosave.record(entry)
+
+def _update_index(op):
+    """기록 하나를 공간 인덱스에 반영 (오브젝트가 빠졌으면 True)"""
+    kind = op[0]
+    if kind == "splice":
+        _, lst, _index, removed, added = op
+        name = LIST_NAMES[id(lst)]
+        for obj in removed:
+            spatial_index.remove(obj)
+        for obj in added:
+            spatial_index.add(obj, name)
+        return bool(removed)
+    if kind == "attr" and op[2] in ("x", "y"):
+        spatial_index.update(op[1])
+    elif kind == "batch":
+        return any([_update_index(sub) for sub in op[1]])
+    return False
+
+def _on_index_change(op):
+    """편집/되돌리기/불러오기가 적용될 때마다 공간 인덱스 갱신 (사라진 오브젝트는 선택 해제)"""
+    if _update_index(op):
+        _drop_stale_selection()
+
+history.listeners.append(_on_index_change)
+history.listeners.append(_on_history_change)
+_loading = False  # load_map 안에서 기록 중
+
+def update():
+    """프레임마다 한 번 호출 (자동 저장 디바운스)"""
+    autosave.tick()
+
+def restore_autosave():
+    """비정상 종료로 남은 이름 없는 작업이 있으면 복구해서 불러옴"""
+    recovered = autosave.recover(None)
+    if recovered:
+        print(f"[자동 저장] 이름 없는 작업의 편집 {recovered}개 복구")
+        load_map(None)
+
+def _drop_stale_selection():
+    """삭제/되돌리기로 사라진 오브젝트는 회전 대상과 선택에서 해제"""
+    global last_selected, selection
+    if last_selected is not None and last_selected not in spatial_index:
+        last_selected = None
+    if any(obj not in spatial_index for _, obj in selection):
+        selection = [item for item in selection if item[1] in spatial_index]
+
+# --- 선택 도구 / 여러 칸 배치 ---
+def in_grid(x, y):
+    return GRID_OFFSET_X <= x < WIDTH and GRID_OFFSET_Y <= y < HEIGHT
+
+def grid_cells(start, end, line):
+    """
+    두 그리드 점 사이의 칸 좌표 (그리드 밖은 제외)
+
+    Parameters:
+        start, end: 스냅된 좌표
+        line: True면 직선 위의 칸 (브레젠햄), False면 사각형 안의 모든 칸
+    """
+    (c0, r0), (c1, r1) = [(round((x - GRID_OFFSET_X) / GRID_SIZE), round((y - GRID_OFFSET_Y) / GRID_SIZE))
+                          for x, y in (start, end)]
+    if line:
+        cells = []
+        dc, dr = abs(c1 - c0), -abs(r1 - r0)
+        sc, sr = (1 if c1 >= c0 else -1), (1 if r1 >= r0 else -1)
+        err = dc + dr
+        c, r = c0, r0
+        while True:
+            cells.append((c, r))
+            if c == c1 and r == r1:
+                break
+            e2 = 2 * err
+            if e2 >= dr:
+                err += dr; c += sc
+            if e2 <= dc:
+                err += dc; r += sr
+    else:
+        cells = [(c, r) for r in range(min(r0, r1), max(r0, r1) + 1)
+                 for c in range(min(c0, c1), max(c0, c1) + 1)]
+    points = [(GRID_OFFSET_X + c * GRID_SIZE, GRID_OFFSET_Y + r * GRID_SIZE) for c, r in cells]
+    return [(x, y) for x, y in points if in_grid(x, y)]
+
+def select_rect(start, end):
+    """드래그한 사각형에 닿은 오브젝트 선택 (하나만 고르면 마우스 휠 회전 대상으로도 지정)"""
+    global selection, last_selected
+    (x0, y0), (x1, y1) = start, end
+    selection = spatial_index.query_rect(min(x0, x1) - RADIUS, min(y0, y1) - RADIUS,
+                                         max(x0, x1) + RADIUS, max(y0, y1) + RADIUS)
+    if len(selection) == 1:
+        last_selected = selection[0][1]
+
+def move_selection(dx, dy):
+    """선택한 오브젝트를 (dx, dy)만큼 이동 (하나라도 그리드 밖으로 나가면 취소, 되돌리기 한 번)"""
+    if not selection or (dx == 0 and dy == 0):
+        return
+    if not all(in_grid(obj.x + dx, obj.y + dy) for _, obj in selection):
+        print("선택한 오브젝트가 그리드 밖으로 나가므로 이동할 수 없습니다.")
+        return
+    ops = []
+    for _, obj in selection:
+        ops.append(("attr", obj, "x", obj.x, obj.x + dx))
+        ops.append(("attr", obj, "y", obj.y, obj.y + dy))
+        obj.x += dx
+        obj.y += dy
+    history.record(("batch", ops))
+
+def duplicate_selection():
+    """선택한 오브젝트를 한 칸 오른쪽 아래에 복제하고 복제본을 선택 (1개만 허용되는 오브젝트는 제외)"""
+    global selection
+    groups = {}
+    for name, obj in selection:
+        x, y = obj.x + GRID_SIZE, obj.y + GRID_SIZE
+        if name in SINGLE_LISTS or not in_grid(x, y):
+            continue
+        record = to_record(name, obj)
+        record[0:2] = x, y
+        groups.setdefault(name, []).append(FACTORIES[name](*record))
+    ops, copies = [], []
+    for name, objs in groups.items():
+        lst = NAMED_LISTS[name]
+        ops.append(splice(lst, len(lst), (), objs))
+        lst.extend(objs)
+        copies += [(name, obj) for obj in objs]
+    history.record(("batch", ops))
+    if copies:
+        selection = copies
+
+def handle_selection_key(event):
+    """선택 도구 단축키: Delete/Backspace 삭제, Ctrl+D 복제, 방향키 한 칸 이동"""
+    if event.key in (pygame.K_DELETE, pygame.K_BACKSPACE):
+        erase_many(selection)
+    elif event.key == pygame.K_d and event.mod & pygame.KMOD_CTRL:
+        duplicate_selection()
+    elif event.key in ARROW_KEYS:
+        move_selection(*ARROW_KEYS[event.key])
+
+def finish_drag(pos):
+    """드래그 끝: 범위 선택 / 선택 이동 / 선 또는 사각형으로 여러 칸 배치"""
+    global drag
+    kind, mode, start = drag["kind"], drag["mode"], drag["start"]
+    drag = None
+    if kind == 'box':
+        select_rect(start, pos)
+    elif kind == 'move':
+        (sx, sy), (ex, ey) = snap_to_grid(*start), snap_to_grid(*pos)
+        move_selection(ex - sx, ey - sy)
+    else:
+        name, make = FILL_MODES[mode]
+        place_many(name, make, grid_cells(start, snap_to_grid(*pos), kind == 'line'))
+
+def draw_selection(surface):
+    """선택 표시 + 드래그 미리보기"""
+    size = RADIUS * 2 + 6
+    if object_mode == 'select':
+        for _, obj in selection:
+            pygame.draw.rect(surface, SELECT_COLOR, (obj.x - RADIUS - 3, obj.y - RADIUS - 3, size, size), 1)
+    if drag is None:
+        return
+    (sx, sy), (ex, ey) = drag["start"], drag["end"]
+    if drag["kind"] == 'box':
+        pygame.draw.rect(surface, SELECT_COLOR, (min(sx, ex), min(sy, ey), abs(ex - sx), abs(ey - sy)), 1)
+    elif drag["kind"] == 'move':
+        (gx0, gy0), (gx1, gy1) = snap_to_grid(sx, sy), snap_to_grid(ex, ey)
+        dx, dy = gx1 - gx0, gy1 - gy0
+        for _, obj in selection:
+            pygame.draw.circle(surface, SELECT_COLOR, (obj.x + dx, obj.y + dy), RADIUS, 1)
+    else:
+        for x, y in grid_cells(drag["start"], snap_to_grid(ex, ey), drag["kind"] == 'line'):
+            pygame.draw.circle(surface, SELECT_COLOR, (x, y), RADIUS, 1)
 
 # --- 저장/불러오기 ---
 def save_map(map_index):
     """
-    맵을 JSON 파일로 저장 (인덱스별)
-    모든 오브젝트 포함 (발사장치, 목표지점, 거울, 렌즈, 프리즘, 블랙홀)
+    맵을 JSON 파일로 저장 (인덱스별, v2 그리드 형식)
+    모든 오브젝트 포함 (발사장치, 목표지점, 거울, 렌즈, 포탈, 블랙홀)
+    좌표는 그리드 칸 (col, row), 각도는 방향 인덱스로 저장
+    파일 쓰기는 자동 저장 스레드에서 (임시 파일 -> 교체), 이후 자동 저장도 이 맵 번호로
     """
-    level_data = {
-        "map_index": map_index,
-        "emitters": [{"x":e.x, "y":e.y, "color":e.color, "angle":e.angle} for e in emitters],
-        "targets": [{"x":t.x, "y":t.y, "color":t.color} for t in targets],
-        "mirrors": [{"x":m.x, "y":m.y, "angle":m.angle} for m in mirrors],
-        "lenses": [{"x":l.x, "y":l.y, "angle":l.angle} for l in lenses],
-        "portals_a": [{"x":p.x, "y":p.y} for p in portals_a],
-        "portals_b": [{"x":p.x, "y":p.y} for p in portals_b],
-        "blackholes": [{"x":b.x, "y":b.y} for b in blackholes],
-    }
-    filename = f"level_{map_index}.json"
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(level_data, f, ensure_ascii=False, indent=2)
-    print(f"맵 저장 완료: {filename}")
+    level_extras["map_index"] = map_index
+    autosave.write_scene(map_index, scene_records(), scene_extras(), announce=True)
 
 def load_map(map_index):
     """
-    JSON 파일에서 맵 불러오기 (인덱스별)
+    JSON 파일에서 맵 불러오기 (인덱스별, None이면 자동 저장된 이름 없는 작업)
     모든 오브젝트 불러오기 (발사장치, 목표지점, 거울, 렌즈, 포탈, 블랙홀)
     """
-    global emitters, targets, mirrors, lenses, portals_a, portals_b, blackholes
+    global emitters, targets, mirrors, lenses, portals_a, portals_b, blackholes, _loading
     try:
-        filename = f"level_{map_index}.json"
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        filename = autosave.level_path(map_index)
+        # 비정상 종료로 남은 자동 저장 저널이 있으면 먼저 파일에 합침
+        recovered = autosave.recover(map_index)
+        if recovered:
+            print(f"[자동 저장] 저장되지 않았던 편집 {recovered}개 복구: {filename}")
+        # 컴파일된 씬 (v2는 에디터 그리드로 칸 좌표 변환, v1은 픽셀 좌표 그대로, 캐시 사용)
+        scene = load_scene(filename, (GRID_SIZE, GRID_OFFSET_X, GRID_OFFSET_Y), snap=False)
+        # 되돌리기용: 바뀌기 전 오브젝트/메타데이터
+        old_lists = [tuple(lst) for lst in OBJECT_LISTS]
+        old_extras = dict(level_extras)
+        level_extras["limits"] = scene["limits"]
+        level_extras["meta"] = scene["meta"]
+        level_extras["grid_cells"] = scene["grid_cells"]
+        level_extras["map_index"] = map_index
         
         # 모든 오브젝트 초기화
-        emitters.clear()
-        targets.clear()
-        mirrors.clear()
-        lenses.clear()
-        portals_a.clear()
-        portals_b.clear()
-        blackholes.clear()
-
-        for e in data.get("emitters", []):
-            emitters.append(Emitter(e["x"], e["y"], e.get("color","white"), e.get("angle",0)))
-        for t in data.get("targets", []):
-            targets.append(Target(t["x"], t["y"], t.get("color","white")))
-        for m in data.get("mirrors", []):
-            mirrors.append(Mirror(m["x"], m["y"], m.get("angle",0)))
-        for l in data.get("lenses", []):
-            lenses.append(Lens(l["x"], l["y"], l.get("angle",0)))
-        for p in data.get("portals_a", []):
-            portals_a.append(Portal(p["x"], p["y"], 'A'))
-        for p in data.get("portals_b", []):
-            portals_b.append(Portal(p["x"], p["y"], 'B'))
-        for b in data.get("blackholes", []):
-            blackholes.append(Blackhole(b["x"], b["y"]))
+        for lst in OBJECT_LISTS:
+            lst.clear()
+
+        for x, y, color, angle in scene["emitters"]:
+            emitters.append(Emitter(x, y, color, angle))
+        for x, y, color in scene["targets"]:
+            targets.append(Target(x, y, color))
+        for x, y, angle in scene["mirrors"]:
+            mirrors.append(Mirror(x, y, angle))
+        for x, y, angle in scene["lenses"]:
+            lenses.append(Lens(x, y, angle))
+        for x, y in scene["portals_a"]:
+            portals_a.append(Portal(x, y, 'A'))
+        for x, y in scene["portals_b"]:
+            portals_b.append(Portal(x, y, 'B'))
+        for x, y in scene["blackholes"]:
+            blackholes.append(Blackhole(x, y))
+        for key, index, kind, params in scene["behaviours"]:
+            NAMED_LISTS[key][index].behaviour = (kind, params)
+
+        # 불러오기도 되돌릴 수 있도록 리스트 교체 + 메타데이터 변경으로 기록
+        ops = [splice(lst, 0, old, lst) for lst, old in zip(OBJECT_LISTS, old_lists) if old or lst]
+        ops += [("item", level_extras, key, old_extras[key], level_extras[key]) for key in old_extras]
+        _loading = True
+        try:
+            history.record(("batch", ops))
+        finally:
+            _loading = False
         
         print(f"맵 불러오기 완료: {filename}")
         print(f"오브젝트: 발사장치 {len(emitters)}개, 목표지점 {len(targets)}개, "
@@ -140,135 +474,22 @@ def load_map(map_index):
     except Exception as e:
         print(f"[로드 실패] {e}")
 
-def simulate_light(surface):
-    """
-    빛의 경로를 시뮬레이션하고 화면에 그림
-    - 렌즈: 45도 꺾기
-    - 거울: 반사
-    - 블랙홀: 흡수
-    """
-    MAX_STEPS = 20000  # 빛 최대 이동 스텝 (그리드 증가에 맞춰 늘림)
-    MAX_BOUNCES = 64
-    NUDGE = 2.0
+# --- 빛 경로 (계산은 beam.py) ---
+def scene_snapshot():
+    """빛 계산에 필요한 값만 배열로 복사한 장면 (워커로 넘겨도 편집과 섞이지 않음)"""
+    return SceneStore.from_lists(NAMED_LISTS, (WIDTH, HEIGHT))
 
-    # 모든 목표지점 초기화
-    for t in targets:
-        t.hit = False
+def apply_hits(hits):
+    """목표지점의 hit 상태 갱신"""
+    for tid, t in enumerate(targets):
+        t.hit = tid in hits
 
-    # 흰색 발사장치만 처리
-    all_emitters = list(emitters)
-    
-    for emitter in all_emitters:
-        # 큐 요소: (x, y, angle, color, inside_lenses:set, bounces)
-        ray_queue = [ (emitter.x, emitter.y, emitter.angle, emitter.color, set(), 0) ]
-
-        while ray_queue:
-            x, y, angle, color_name, inside_lenses, bounces = ray_queue.pop(0)
-            steps = 0
-
-            while steps < MAX_STEPS:
-                steps += 1
-                x += math.cos(math.radians(angle))
-                y += math.sin(math.radians(angle))
-
-                if not (0 <= x < WIDTH and 0 <= y < HEIGHT):
-                    break
-
-                # 1) 거울 반사
-                reflected = False
-                for m in mirrors:
-                    if near(x, y, m.x, m.y):
-                        angle = angle_wrap(2 * m.angle - angle)
-                        x, y = advance(x, y, angle, NUDGE)
-                        bounces += 1
-                        reflected = True
-                        break
-                if reflected:
-                    if bounces > MAX_BOUNCES: break
-                    pygame.draw.circle(surface, COLORS[color_name], (int(x), int(y)), 2)
-                    # 반사 후에도 계속 진행 (렌즈 등 체크)
-                
-                # 화면 밖 체크를 먼저
-                if not (0 <= x < WIDTH and 0 <= y < HEIGHT):
-                    break
-
-                # 2) 렌즈: 중심 통과 시 45도 꺾기
-                bent = False
-                for lz in lenses:
-                    lid = id(lz)
-                    # 중심과의 거리 체크 (매우 가까이 있을 때만)
-                    dist = math.sqrt((x - lz.x)**2 + (y - lz.y)**2)
-                    if dist < 3 and lid not in inside_lenses:  # 중심 3픽셀 이내
-                        # 중심 통과 시 45도 꺾기
-                        angle = angle_wrap(angle + 45)
-                        inside_lenses.add(lid)
-                        x, y = advance(x, y, angle, NUDGE)
-                        bounces += 1
-                        bent = True
-                        break
-                if bent:
-                    if bounces > MAX_BOUNCES: break
-                    pygame.draw.circle(surface, COLORS[color_name], (int(x), int(y)), 2)
-                
-                # 렌즈를 멀리 벗어났는지 체크
-                for lz in lenses:
-                    lid = id(lz)
-                    if lid in inside_lenses:
-                        dist = math.sqrt((x - lz.x)**2 + (y - lz.y)**2)
-                        if dist > RADIUS * 2:  # 렌즈에서 충분히 멀어지면 초기화
-                            inside_lenses.remove(lid)
-
-                # 3) 포탈: A에 들어가면 B로 텔레포트
-                teleported = False
-                for pa in portals_a:
-                    if near(x, y, pa.x, pa.y):
-                        # 포탈 B가 있으면 텔레포트
-                        if len(portals_b) > 0:
-                            pb = portals_b[0]  # 첫 번째 B 포탈로 이동
-                            x, y = pb.x, pb.y
-                            x, y = advance(x, y, angle, NUDGE * 2)  # 포탈에서 빠져나옴
-                            teleported = True
-                            break
-                if teleported:
-                    pygame.draw.circle(surface, COLORS[color_name], (int(x), int(y)), 2)
-                    continue
-
-                # 4) 블랙홀
-                absorbed = False
-                for bh in blackholes:
-                    if near(x, y, bh.x, bh.y):
-                        absorbed = True
-                        break
-                if absorbed:
-                    break
-
-                # 4) 블랙홀
-                absorbed = False
-                for bh in blackholes:
-                    if near(x, y, bh.x, bh.y):
-                        absorbed = True
-                        break
-                if absorbed:
-                    break
-
-                # 5) 타겟 체크 - 흰색 빛이 흰색 목표에 닿으면 hit 처리하고 광선 종료
-                # 흰색 목표 체크 (white 빛만)
-                for tg in targets:
-                    if near(x, y, tg.x, tg.y):
-                        if color_name == 'white':  # 흰색 빛만 흰색 목표에 닿음
-                            tg.hit = True
-                            pygame.draw.circle(surface, (255, 255, 0), (int(tg.x), int(tg.y)), RADIUS+6, 3)
-                            break
-                else:
-                    # 목표에 닿지 않았으면 계속 진행
-                    # 6) 그리기
-                    pygame.draw.circle(surface, COLORS[color_name], (int(x), int(y)), 2)
-                    
-                    if bounces > MAX_BOUNCES:
-                        break
-                    continue
-                # 목표에 닿았으면 광선 종료
-                break
+def simulate_light(surface):
+    """빛의 경로를 바로 계산해서 화면에 그림 (워커 없이 동기 실행)"""
+    _, hits = render_beam(scene_snapshot(), surface)
+    apply_hits(hits)
+
+beam_preview = BeamPreview()
 
 def check_game_complete():
     """
@@ -287,188 +508,274 @@ def check_game_complete():
     # 모든 목표가 빛을 받았을 때만 True
     return True
 
-def main():
-    global object_mode, game_started, input_mode, input_text
-    running = True
+# --- 프레임 그리기 ---
+INFO_LINES = [
+    "좌클릭: 그리드에 오브젝트 배치 / 지우개는 근접 오브젝트 삭제",
+    "마우스 휠: Emitter(상하좌우), 거울(대각선 4방향), 렌즈(자유 회전)",
+    "렌즈: 중심 통과 시 45° 꺾기 | 목표: 모든 W,R,G,B 목표에 빛 도달",
+    "Ctrl+Z: 되돌리기 | Ctrl+Y (Ctrl+Shift+Z): 다시 실행 | 거울/블랙홀 Shift+드래그: 선, Ctrl+드래그: 채우기",
+    "선택: 드래그로 범위 선택, 선택한 오브젝트 끌기/방향키로 이동, Ctrl+D 복제, Delete 삭제",
+]
+
+def draw_frame(surface):
+    """현재 에디터 상태를 주어진 Surface(화면 또는 오프스크린)에 그리기"""
+    surface.fill((30, 30, 30))
+    
+    # 그리드 그리기
+    draw_grid(surface)
+
+    # 입력 모드 오버레이
+    if input_mode in ['save', 'load']:
+        # 반투명 배경
+        overlay = pygame.Surface((WIDTH, HEIGHT))
+        overlay.set_alpha(180)
+        overlay.fill((0, 0, 0))
+        surface.blit(overlay, (0, 0))
+        
+        # 입력 박스
+        prompt = "맵 저장" if input_mode == 'save' else "맵 불러오기"
+        prompt_text = FONT_BIG.render(f"{prompt} - 맵 번호를 입력하세요 (0-999)", True, (255, 255, 255))
+        surface.blit(prompt_text, (WIDTH//2 - 250, HEIGHT//2 - 60))
+        
+        # 입력 필드
+        input_box = pygame.Rect(WIDTH//2 - 100, HEIGHT//2 - 20, 200, 50)
+        pygame.draw.rect(surface, (255, 255, 255), input_box, 2)
+        input_surface = FONT_BIG.render(input_text, True, (255, 255, 255))
+        surface.blit(input_surface, (input_box.x + 10, input_box.y + 10))
+        
+        # 안내 메시지
+        help_text = FONT.render("Enter: 확인 | ESC: 취소", True, (180, 180, 180))
+        surface.blit(help_text, (WIDTH//2 - 100, HEIGHT//2 + 50))
+        return
+
+    for b in buttons:
+        b.draw(surface, FONT_BIG)
+
+    # 상태 표시
+    mode_text = f"모드: {object_mode if object_mode else '없음'}  |  상태: {'실행중' if game_started else '대기'}"
+    surface.blit(FONT.render(mode_text, True, (230,230,230)), (20, 170))
+
+    # 안내 메시지
+    for i, line in enumerate(INFO_LINES):
+        surface.blit(FONT.render(line, True, (180,180,180)), (20, 196 + i*20))
+
+    for e in emitters:   e.draw(surface)
+    for t in targets:    t.draw(surface)
+    for m in mirrors:    m.draw(surface)
+    for l in lenses:     l.draw(surface)
+    for pa in portals_a: pa.draw(surface)
+    for pb in portals_b: pb.draw(surface)
+    for b in blackholes: b.draw(surface)
+    draw_selection(surface)
+
+    if game_started:
+        # 빛 경로는 워커 프로세스에서 계산, 화면에는 마지막으로 끝난 결과를 그림
+        beam_preview.update(history.version, scene_snapshot)
+        if beam_preview.poll(wait=headless):
+            apply_hits(beam_preview.hits)
+        beam_preview.draw(surface)
+        
+        # 게임 완료 체크
+        if check_game_complete():
+            # 완료 메시지 표시
+            complete_text = FONT_BIG.render("★ 퍼즐 완료! ★", True, (255, 255, 0))
+            complete_rect = complete_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+            # 배경
+            bg_rect = complete_rect.inflate(40, 20)
+            pygame.draw.rect(surface, (0, 100, 0), bg_rect, border_radius=10)
+            pygame.draw.rect(surface, (255, 255, 0), bg_rect, 3, border_radius=10)
+            surface.blit(complete_text, complete_rect)
+
+# --- 이벤트 처리 ---
+def handle_event(event):
+    """이벤트 하나 처리 (False를 반환하면 에디터 종료)"""
+    global object_mode, game_started, input_mode, input_text, last_selected, drag
+    if event.type == pygame.QUIT:
+        return False
+
+    # 텍스트 입력 모드
+    elif input_mode in ['save', 'load']:
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_RETURN:  # Enter 키
+                if input_text.isdigit():
+                    map_num = int(input_text)
+                    if input_mode == 'save':
+                        save_map(map_num)
+                    elif input_mode == 'load':
+                        load_map(map_num)
+                input_mode = None
+                input_text = ""
+            elif event.key == pygame.K_ESCAPE:  # ESC 키
+                input_mode = None
+                input_text = ""
+            elif event.key == pygame.K_BACKSPACE:
+                input_text = input_text[:-1]
+            elif event.unicode.isdigit() and len(input_text) < 3:
+                input_text += event.unicode
+        return True  # 입력 모드에서는 다른 이벤트 무시
+
+    # 되돌리기 / 다시 실행 단축키
+    elif event.type == pygame.KEYDOWN and event.mod & pygame.KMOD_CTRL and event.key in (pygame.K_z, pygame.K_y):
+        if event.key == pygame.K_y or event.mod & pygame.KMOD_SHIFT:
+            redo()
+        else:
+            undo()
+
+    elif event.type == pygame.KEYDOWN and object_mode == 'select' and selection:
+        handle_selection_key(event)
+
+    elif event.type == pygame.MOUSEMOTION and drag is not None:
+        drag["end"] = event.pos
+
+    elif event.type == pygame.MOUSEBUTTONUP and event.button == 1 and drag is not None:
+        finish_drag(event.pos)
+
+    elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+        mx, my = event.pos
+
+        # 버튼 처리
+        if btn_start.is_clicked((mx, my)):
+            game_started = True;   return True
+        if btn_stop.is_clicked((mx, my)):
+            game_started = False;  return True
+        if btn_clear.is_clicked((mx, my)):
+            clear_objects()
+            game_started = False; object_mode = None; return True
+        if btn_save.is_clicked((mx, my)):
+            input_mode = 'save'; input_text = ""; return True
+        if btn_load.is_clicked((mx, my)):
+            input_mode = 'load'; input_text = ""; return True
+        if btn_undo.is_clicked((mx, my)):      undo(); return True
+        if btn_redo.is_clicked((mx, my)):      redo(); return True
+
+        if btn_emitter.is_clicked((mx, my)):   object_mode = 'emitter';   return True
+        if btn_target.is_clicked((mx, my)):    object_mode = 'target';    return True
+        if btn_mirror.is_clicked((mx, my)):    object_mode = 'mirror';    return True
+        if btn_lens.is_clicked((mx, my)):      object_mode = 'lens';      return True
+        if btn_blackhole.is_clicked((mx, my)): object_mode = 'blackhole'; return True
+        if btn_eraser.is_clicked((mx, my)):    object_mode = 'eraser';    return True
+        if btn_select.is_clicked((mx, my)):    object_mode = 'select';    return True
+
+        # 포탈 버튼
+        if btn_portal_a.is_clicked((mx, my)):  object_mode = 'portal_a';  return True
+        if btn_portal_b.is_clicked((mx, my)):  object_mode = 'portal_b';  return True
+
+        # 배치/삭제 (그리드에 스냅)
+        gx, gy = snap_to_grid(mx, my)
+        mods = pygame.key.get_mods()
+
+        if object_mode == 'select':
+            # 선택한 오브젝트 위에서 누르면 이동, 아니면 범위 선택
+            selected = {id(obj) for _, obj in selection}
+            grabbed = any(id(obj) in selected for _, obj in spatial_index.query_near(mx, my))
+            drag = {"kind": 'move' if grabbed else 'box', "mode": object_mode, "start": (mx, my), "end": (mx, my)}
+        elif object_mode in FILL_MODES and mods & (pygame.KMOD_SHIFT | pygame.KMOD_CTRL):
+            kind = 'line' if mods & pygame.KMOD_SHIFT else 'fill'
+            drag = {"kind": kind, "mode": object_mode, "start": (gx, gy), "end": (gx, gy)}
+        elif object_mode == 'emitter':
+            # 발사 장치는 1개만 허용
+            if len(emitters) >= 1:
+                print("발사 장치는 1개만 배치할 수 있습니다. 기존 발사 장치를 먼저 삭제하세요.")
+            else:
+                obj = Emitter(gx, gy, 'white', 0); add_object(emitters, obj); last_selected = obj
+        elif object_mode == 'target':
+            # 목표 지점은 1개만 허용
+            if len(targets) >= 1:
+                print("목표 지점은 1개만 배치할 수 있습니다. 기존 목표 지점을 먼저 삭제하세요.")
+            else:
+                obj = Target(gx, gy, 'white'); add_object(targets, obj); last_selected = obj
+        elif object_mode == 'mirror':
+            obj = Mirror(gx, gy, 45); add_object(mirrors, obj); last_selected = obj
+        elif object_mode == 'lens':
+            obj = Lens(gx, gy, 0); add_object(lenses, obj); last_selected = obj
+        elif object_mode == 'blackhole':
+            obj = Blackhole(gx, gy); add_object(blackholes, obj); last_selected = obj
+        elif object_mode == 'portal_a':
+            # 포탈 A는 1개만 허용
+            if len(portals_a) >= 1:
+                print("포탈 A는 1개만 배치할 수 있습니다. 기존 포탈 A를 먼저 삭제하세요.")
+            else:
+                obj = Portal(gx, gy, 'A'); add_object(portals_a, obj); last_selected = obj
+        elif object_mode == 'portal_b':
+            # 포탈 B는 1개만 허용
+            if len(portals_b) >= 1:
+                print("포탈 B는 1개만 배치할 수 있습니다. 기존 포탈 B를 먼저 삭제하세요.")
+            else:
+                obj = Portal(gx, gy, 'B'); add_object(portals_b, obj); last_selected = obj
+        elif object_mode == 'eraser':
+            # 리스트마다 가장 가까운 오브젝트 하나씩 삭제 (공간 인덱스로 근처만 확인)
+            nearest = {}
+            for name, obj in spatial_index.query_near(mx, my):
+                dist = (obj.x - mx) ** 2 + (obj.y - my) ** 2
+                if name not in nearest or dist < nearest[name][0]:
+                    nearest[name] = (dist, obj)
+            erase_many([(name, obj) for name, (_, obj) in nearest.items()])
+
+    elif event.type == pygame.MOUSEWHEEL and last_selected is not None:
+        # 거울과 Emitter는 rotate() 메서드 사용 (고정 방향), 렌즈는 자유 회전
+        old_angle = getattr(last_selected, 'angle', None)
+        if isinstance(last_selected, (Mirror, Emitter)):
+            last_selected.rotate()
+            record_rotation(last_selected, old_angle)
+        elif isinstance(last_selected, Lens):
+            last_selected.angle = angle_wrap(last_selected.angle + event.y * 5)
+            record_rotation(last_selected, old_angle)
 
-    info = [
-        "좌클릭: 그리드에 오브젝트 배치 / 지우개는 근접 오브젝트 삭제",
-        "마우스 휠: Emitter(상하좌우), 거울(대각선 4방향), 렌즈(자유 회전)",
-        "렌즈: 중심 통과 시 45° 꺾기 | 목표: 모든 W,R,G,B 목표에 빛 도달",
-    ]
+    return True
+
+def parse_args(argv=None):
+    """명령행 인자 파싱 (헤드리스 실행 옵션)"""
+    parser = argparse.ArgumentParser(description="Light Puzzle - Map Editor")
+    parser.add_argument("--headless", action="store_true",
+                        help="창 없이 오프스크린으로 실행 (환경 변수 BYEOLMURI_HEADLESS=1과 동일)")
+    parser.add_argument("--load", type=int, default=None, help="시작 시 불러올 맵 번호")
+    parser.add_argument("--frames", type=int, default=None,
+                        help="지정한 프레임 수만큼 실행 후 종료 (헤드리스 기본값 1)")
+    parser.add_argument("--snapshot", default=None, help="마지막 프레임을 저장할 이미지 경로")
+    parser.add_argument("--start", action="store_true", help="빛 시뮬레이션을 켠 상태로 시작")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    args.headless = args.headless or is_headless([])
+    if args.headless and args.frames is None:
+        args.frames = 1
+    return args
+
+def main(argv=None):
+    global game_started
+    args = parse_args(argv)
+
+    # 화면/폰트 생성 (임포트 시점이 아니라 실행 시점에 초기화)
+    init_display(args.headless)
+    if args.load is not None:
+        load_map(args.load)
+    else:
+        restore_autosave()
+    game_started = args.start
 
-    last_selected = None  # 각도 조절 대상
+    running = True
+    frame_count = 0
 
     while running:
         # 이벤트
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+            if not handle_event(event):
                 running = False
 
-            # 텍스트 입력 모드
-            elif input_mode in ['save', 'load']:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:  # Enter 키
-                        if input_text.isdigit():
-                            map_num = int(input_text)
-                            if input_mode == 'save':
-                                save_map(map_num)
-                            elif input_mode == 'load':
-                                load_map(map_num)
-                        input_mode = None
-                        input_text = ""
-                    elif event.key == pygame.K_ESCAPE:  # ESC 키
-                        input_mode = None
-                        input_text = ""
-                    elif event.key == pygame.K_BACKSPACE:
-                        input_text = input_text[:-1]
-                    elif event.unicode.isdigit() and len(input_text) < 3:
-                        input_text += event.unicode
-                continue  # 입력 모드에서는 다른 이벤트 무시
-
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mx, my = event.pos
-
-                # 버튼 처리
-                if btn_start.is_clicked((mx, my)):
-                    game_started = True;   continue
-                if btn_stop.is_clicked((mx, my)):
-                    game_started = False;  continue
-                if btn_clear.is_clicked((mx, my)):
-                    emitters.clear(); targets.clear(); mirrors.clear()
-                    lenses.clear(); portals_a.clear(); portals_b.clear(); blackholes.clear()
-                    game_started = False; object_mode = None; continue
-                if btn_save.is_clicked((mx, my)):
-                    input_mode = 'save'; input_text = ""; continue
-                if btn_load.is_clicked((mx, my)):
-                    input_mode = 'load'; input_text = ""; continue
-
-                if btn_emitter.is_clicked((mx, my)):   object_mode = 'emitter';   continue
-                if btn_target.is_clicked((mx, my)):    object_mode = 'target';    continue
-                if btn_mirror.is_clicked((mx, my)):    object_mode = 'mirror';    continue
-                if btn_lens.is_clicked((mx, my)):      object_mode = 'lens';      continue
-                if btn_blackhole.is_clicked((mx, my)): object_mode = 'blackhole'; continue
-                if btn_eraser.is_clicked((mx, my)):    object_mode = 'eraser';    continue
-                
-                # 포탈 버튼
-                if btn_portal_a.is_clicked((mx, my)):  object_mode = 'portal_a';  continue
-                if btn_portal_b.is_clicked((mx, my)):  object_mode = 'portal_b';  continue
-
-                # 배치/삭제 (그리드에 스냅)
-                gx, gy = snap_to_grid(mx, my)
-                
-                if object_mode == 'emitter':
-                    # 발사 장치는 1개만 허용
-                    if len(emitters) >= 1:
-                        print("발사 장치는 1개만 배치할 수 있습니다. 기존 발사 장치를 먼저 삭제하세요.")
-                    else:
-                        obj = Emitter(gx, gy, 'white', 0); emitters.append(obj); last_selected = obj
-                elif object_mode == 'target':
-                    # 목표 지점은 1개만 허용
-                    if len(targets) >= 1:
-                        print("목표 지점은 1개만 배치할 수 있습니다. 기존 목표 지점을 먼저 삭제하세요.")
-                    else:
-                        obj = Target(gx, gy, 'white'); targets.append(obj); last_selected = obj
-                elif object_mode == 'mirror':
-                    obj = Mirror(gx, gy, 45); mirrors.append(obj); last_selected = obj
-                elif object_mode == 'lens':
-                    obj = Lens(gx, gy, 0); lenses.append(obj); last_selected = obj
-                elif object_mode == 'blackhole':
-                    obj = Blackhole(gx, gy); blackholes.append(obj); last_selected = obj
-                elif object_mode == 'portal_a':
-                    # 포탈 A는 1개만 허용
-                    if len(portals_a) >= 1:
-                        print("포탈 A는 1개만 배치할 수 있습니다. 기존 포탈 A를 먼저 삭제하세요.")
-                    else:
-                        obj = Portal(gx, gy, 'A'); portals_a.append(obj); last_selected = obj
-                elif object_mode == 'portal_b':
-                    # 포탈 B는 1개만 허용
-                    if len(portals_b) >= 1:
-                        print("포탈 B는 1개만 배치할 수 있습니다. 기존 포탈 B를 먼저 삭제하세요.")
-                    else:
-                        obj = Portal(gx, gy, 'B'); portals_b.append(obj); last_selected = obj
-                elif object_mode == 'eraser':
-                    for lst in [emitters, targets, mirrors, lenses, portals_a, portals_b, blackholes]:
-                        for obj in lst[:]:
-                            if hasattr(obj, 'x') and hasattr(obj, 'y') and near(mx, my, obj.x, obj.y):
-                                lst.remove(obj); break
-
-            elif event.type == pygame.MOUSEWHEEL and last_selected is not None:
-                # 거울과 Emitter는 rotate() 메서드 사용 (고정 방향), 렌즈는 자유 회전
-                if isinstance(last_selected, (Mirror, Emitter)):
-                    last_selected.rotate()
-                elif isinstance(last_selected, Lens):
-                    last_selected.angle = angle_wrap(last_selected.angle + event.y * 5)
-
-        # 그리기
-        screen.fill((30, 30, 30))
-        
-        # 그리드 그리기
-        draw_grid(screen)
-
-        # 입력 모드 오버레이
-        if input_mode in ['save', 'load']:
-            # 반투명 배경
-            overlay = pygame.Surface((WIDTH, HEIGHT))
-            overlay.set_alpha(180)
-            overlay.fill((0, 0, 0))
-            screen.blit(overlay, (0, 0))
-            
-            # 입력 박스
-            prompt = "맵 저장" if input_mode == 'save' else "맵 불러오기"
-            prompt_text = FONT_BIG.render(f"{prompt} - 맵 번호를 입력하세요 (0-999)", True, (255, 255, 255))
-            screen.blit(prompt_text, (WIDTH//2 - 250, HEIGHT//2 - 60))
-            
-            # 입력 필드
-            input_box = pygame.Rect(WIDTH//2 - 100, HEIGHT//2 - 20, 200, 50)
-            pygame.draw.rect(screen, (255, 255, 255), input_box, 2)
-            input_surface = FONT_BIG.render(input_text, True, (255, 255, 255))
-            screen.blit(input_surface, (input_box.x + 10, input_box.y + 10))
-            
-            # 안내 메시지
-            help_text = FONT.render("Enter: 확인 | ESC: 취소", True, (180, 180, 180))
-            screen.blit(help_text, (WIDTH//2 - 100, HEIGHT//2 + 50))
-            
-            pygame.display.flip()
-            clock.tick(FPS)
-            continue
-
-        for b in buttons:
-            b.draw(screen, FONT_BIG)
+        update()
+        draw_frame(screen)
+        present(headless)
 
-        # 상태 표시
-        mode_text = f"모드: {object_mode if object_mode else '없음'}  |  상태: {'실행중' if game_started else '대기'}"
-        screen.blit(FONT.render(mode_text, True, (230,230,230)), (20, 170))
+        # 헤드리스 실행: 지정 프레임 수만큼만 진행
+        frame_count += 1
+        if args.frames is not None and frame_count >= args.frames:
+            running = False
+        if not headless:
+            clock.tick(FPS)
 
-        # 안내 메시지
-        for i, line in enumerate(info):
-            screen.blit(FONT.render(line, True, (180,180,180)), (20, 200 + i*22))
-
-        for e in emitters:   e.draw(screen)
-        for t in targets:    t.draw(screen)
-        for m in mirrors:    m.draw(screen)
-        for l in lenses:     l.draw(screen)
-        for pa in portals_a: pa.draw(screen)
-        for pb in portals_b: pb.draw(screen)
-        for b in blackholes: b.draw(screen)
-
-        if game_started:
-            simulate_light(screen)
-            
-            # 게임 완료 체크
-            if check_game_complete():
-                # 완료 메시지 표시
-                complete_text = FONT_BIG.render("★ 퍼즐 완료! ★", True, (255, 255, 0))
-                complete_rect = complete_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-                # 배경
-                bg_rect = complete_rect.inflate(40, 20)
-                pygame.draw.rect(screen, (0, 100, 0), bg_rect, border_radius=10)
-                pygame.draw.rect(screen, (255, 255, 0), bg_rect, 3, border_radius=10)
-                screen.blit(complete_text, complete_rect)
-
-        pygame.display.flip()
-        clock.tick(FPS)
+    if args.snapshot:
+        save_frame(screen, args.snapshot)
 
+    beam_preview.shutdown()
+    autosave.close()
     pygame.quit()
 
 if __name__ == "__main__":